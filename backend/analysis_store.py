@@ -0,0 +1,321 @@
+import json
+import base64
+import binascii
+import sqlite3
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from analytics import record_analyses
+
+# analysis_skills.status values
+SKILL_MISSING = 0
+SKILL_COVERED = 1
+
+RECOMMENDATION_FIELDS = ("title", "platform", "url", "description")
+
+# Leading characters of a syllabus kept in analyses.syllabus_text
+STORED_TEXT_CHARS = 5000
+
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+_CHUNK = 500
+
+INSERT_ANALYSIS = """
+    INSERT INTO analyses (
+        id, university, field, skill_coverage_percentage, weighted_coverage_percentage, catalog_revision,
+        syllabus_text, created_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, coalesce(?, CURRENT_TIMESTAMP))
+"""
+
+INSERT_SYLLABUS_SIGNATURE = """
+    INSERT OR IGNORE INTO syllabus_signatures (analysis_id, signature) VALUES (?, ?)
+"""
+
+UPDATE_COMPARISON = """
+    UPDATE analyses SET skill_coverage_percentage = ?, weighted_coverage_percentage = ?, catalog_revision = ?
+    WHERE id = ?
+"""
+
+INSERT_ANALYSIS_SKILL = """
+    INSERT INTO analysis_skills (analysis_id, status, position, skill_id) VALUES (?, ?, ?, ?)
+"""
+
+INSERT_ANALYSIS_RECOMMENDATION = """
+    INSERT INTO analysis_recommendations (analysis_id, position, recommendation_id) VALUES (?, ?, ?)
+"""
+
+SELECT_RECOMMENDATION_ID = """
+    SELECT id FROM recommendations WHERE title = ? AND platform = ? AND url = ? AND description = ?
+"""
+
+SELECT_ANALYSIS_SUMMARIES = """
+    SELECT id, university, field, skill_coverage_percentage, created_at
+    FROM analyses
+"""
+
+SELECT_ANALYSES_MISSING_SKILL = """
+    SELECT a.id, a.university, a.field, a.skill_coverage_percentage, a.created_at
+    FROM analysis_skills x
+    JOIN analyses a ON a.id = x.analysis_id
+    WHERE x.skill_id IN (SELECT id FROM skills WHERE name = ? COLLATE NOCASE)
+      AND x.status = 0
+    ORDER BY a.created_at DESC
+    LIMIT ?
+"""
+
+
+SELECT_COVERED_SKILLS_OF_FIELD = """
+    SELECT a.id, a.university, s.name
+    FROM analyses a
+    LEFT JOIN analysis_skills x ON x.analysis_id = a.id AND x.status = 1
+    LEFT JOIN skills s ON s.id = x.skill_id
+    WHERE a.field = ?
+"""
+
+
+def _chunks(values: Sequence[Any]) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def skill_ids(conn: sqlite3.Connection, names: Iterable[str]) -> Dict[str, int]:
+    """IDs of skill names, adding the names the skills table does not have yet"""
+    names = list(dict.fromkeys(names))
+    conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+
+    ids = {}
+    for chunk in _chunks(names):
+        placeholders = ", ".join("?" * len(chunk))
+        ids.update(
+            (name, skill_id)
+            for skill_id, name in conn.execute(f"SELECT id, name FROM skills WHERE name IN ({placeholders})", chunk)
+        )
+    return ids
+
+
+def recommendation_id(conn: sqlite3.Connection, recommendation: Dict[str, str]) -> int:
+    """ID of a stored recommendation with the same content, inserting it when there is none"""
+    values = tuple(recommendation.get(name) or "" for name in RECOMMENDATION_FIELDS)
+    row = conn.execute(SELECT_RECOMMENDATION_ID, values).fetchone()
+    if row:
+        return row[0]
+    return conn.execute(
+        "INSERT INTO recommendations (title, platform, url, description) VALUES (?, ?, ?, ?)", values
+    ).lastrowid
+
+
+def _comparison_rows(
+    conn: sqlite3.Connection, analyses: List[Any], skill_ids: Dict[str, int], statuses: Tuple[int, ...]
+) -> Tuple[List[tuple], List[tuple]]:
+    """analysis_skills rows with the given statuses and analysis_recommendations rows of analyses"""
+    recommendation_ids: Dict[Tuple[str, ...], int] = {}
+    skill_rows = []
+    recommendation_rows = []
+    for analysis in analyses:
+        for status in statuses:
+            skills = analysis.covered_skills if status == SKILL_COVERED else analysis.missing_skills
+            skill_rows.extend(
+                (analysis.analysis_id, status, position, skill_ids[skill]) for position, skill in enumerate(skills)
+            )
+        for position, recommendation in enumerate(analysis.recommendations):
+            key = tuple(recommendation.get(name) or "" for name in RECOMMENDATION_FIELDS)
+            if key not in recommendation_ids:
+                recommendation_ids[key] = recommendation_id(conn, recommendation)
+            recommendation_rows.append((analysis.analysis_id, position, recommendation_ids[key]))
+    return skill_rows, recommendation_rows
+
+
+def insert_analyses(
+    conn: sqlite3.Connection,
+    analyses: List[Tuple[Any, str]],
+    keep_created_at: bool = False,
+    signatures: Optional[Sequence[Optional[bytes]]] = None
+):
+    """Insert (analysis, syllabus_text) pairs inside the caller's transaction.
+
+    Skills and recommendations are stored once and referenced by ID, so an
+    analysis row only carries its scalar columns. The statistics summary
+    tables are updated in the same transaction. created_at is the insertion
+    time unless keep_created_at is set (e.g. when importing). signatures are
+    the syllabus signatures of the analyses, in order, computed from their
+    full text before it is truncated to STORED_TEXT_CHARS.
+    """
+    records = [analysis for analysis, _ in analyses]
+    ids = skill_ids(conn, (skill for analysis in records for skill in analysis.covered_skills + analysis.missing_skills))
+    skill_rows, recommendation_rows = _comparison_rows(conn, records, ids, (SKILL_COVERED, SKILL_MISSING))
+
+    conn.executemany(INSERT_ANALYSIS, [
+        (
+            analysis.analysis_id,
+            analysis.university,
+            analysis.field,
+            analysis.skill_coverage_percentage,
+            analysis.weighted_coverage_percentage,
+            analysis.catalog_revision,
+            syllabus_text[:STORED_TEXT_CHARS],
+            analysis.created_at if keep_created_at else None
+        )
+        for analysis, syllabus_text in analyses
+    ])
+    conn.executemany(INSERT_ANALYSIS_SKILL, skill_rows)
+    conn.executemany(INSERT_ANALYSIS_RECOMMENDATION, recommendation_rows)
+    if signatures:
+        insert_signatures(conn, [
+            (analysis.analysis_id, signature) for analysis, signature in zip(records, signatures) if signature
+        ])
+
+    days = [str(analysis.created_at)[:10] for analysis in records] if keep_created_at else None
+    record_analyses(conn, records, ids, days)
+
+
+def insert_signatures(conn: sqlite3.Connection, signatures: List[Tuple[str, bytes]]):
+    """Store (analysis_id, syllabus signature) pairs, keeping signatures already stored"""
+    conn.executemany(INSERT_SYLLABUS_SIGNATURE, signatures)
+
+
+def replace_comparisons(conn: sqlite3.Connection, updates: List[Tuple[Dict[str, Any], Any]]):
+    """Store recomputed industry comparisons of (stored analysis, recomputed analysis) pairs.
+
+    Only the missing skills, coverage, recommendations and catalog revision
+    change; covered skills are kept as extracted. Runs inside the caller's
+    transaction and moves the analyses' statistics from the old comparison
+    to the new one.
+    """
+    old = [SimpleNamespace(**stored) for stored, _ in updates]
+    new = [recomputed for _, recomputed in updates]
+    ids = skill_ids(conn, (skill for analysis in old + new for skill in analysis.missing_skills))
+    skill_rows, recommendation_rows = _comparison_rows(conn, new, ids, (SKILL_MISSING,))
+
+    analysis_ids = [(analysis.analysis_id,) for analysis in old]
+    conn.executemany("DELETE FROM analysis_skills WHERE analysis_id = ? AND status = 0", analysis_ids)
+    conn.executemany("DELETE FROM analysis_recommendations WHERE analysis_id = ?", analysis_ids)
+    conn.executemany(INSERT_ANALYSIS_SKILL, skill_rows)
+    conn.executemany(INSERT_ANALYSIS_RECOMMENDATION, recommendation_rows)
+    conn.executemany(UPDATE_COMPARISON, [
+        (
+            analysis.skill_coverage_percentage, analysis.weighted_coverage_percentage, analysis.catalog_revision,
+            analysis.analysis_id
+        )
+        for analysis in new
+    ])
+
+    days = [str(analysis.created_at)[:10] for analysis in old]
+    record_analyses(conn, old, ids, days, sign=-1)
+    record_analyses(conn, new, ids, days)
+
+
+def load_analyses(conn: sqlite3.Connection, analysis_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored analyses by ID, with their skill lists and recommendations in their original order"""
+    analyses: Dict[str, Dict[str, Any]] = {}
+    for chunk in _chunks(list(dict.fromkeys(analysis_ids))):
+        placeholders = ", ".join("?" * len(chunk))
+
+        for row in conn.execute(f"""
+            SELECT id, university, field, skill_coverage_percentage, weighted_coverage_percentage, catalog_revision,
+                   created_at
+            FROM analyses WHERE id IN ({placeholders})
+        """, chunk):
+            analyses[row[0]] = {
+                "analysis_id": row[0],
+                "university": row[1],
+                "field": row[2],
+                "covered_skills": [],
+                "missing_skills": [],
+                "skill_coverage_percentage": row[3],
+                "recommendations": [],
+                "weighted_coverage_percentage": row[4],
+                "catalog_revision": row[5],
+                "created_at": row[6]
+            }
+
+        for analysis_id, status, name in conn.execute(f"""
+            SELECT x.analysis_id, x.status, s.name
+            FROM analysis_skills x JOIN skills s ON s.id = x.skill_id
+            WHERE x.analysis_id IN ({placeholders})
+            ORDER BY x.analysis_id, x.status, x.position
+        """, chunk):
+            key = "covered_skills" if status == SKILL_COVERED else "missing_skills"
+            analyses[analysis_id][key].append(name)
+
+        for analysis_id, *values in conn.execute(f"""
+            SELECT x.analysis_id, r.title, r.platform, r.url, r.description
+            FROM analysis_recommendations x JOIN recommendations r ON r.id = x.recommendation_id
+            WHERE x.analysis_id IN ({placeholders})
+            ORDER BY x.analysis_id, x.position
+        """, chunk):
+            analyses[analysis_id]["recommendations"].append(
+                {name: value for name, value in zip(RECOMMENDATION_FIELDS, values) if value}
+            )
+
+    return analyses
+
+
+def load_analysis(conn: sqlite3.Connection, analysis_id: str) -> Optional[Dict[str, Any]]:
+    """A stored analysis by ID, or None"""
+    return load_analyses(conn, [analysis_id]).get(analysis_id)
+
+
+def covered_skills_by_analysis(conn: sqlite3.Connection, field: str) -> Dict[str, Tuple[str, List[str]]]:
+    """(university, covered skills) of every stored analysis of a field, by analysis ID"""
+    analyses: Dict[str, Tuple[str, List[str]]] = {}
+    for analysis_id, university, name in conn.execute(SELECT_COVERED_SKILLS_OF_FIELD, (field,)):
+        skills = analyses.setdefault(analysis_id, (university, []))[1]
+        if name is not None:
+            skills.append(name)
+    return analyses
+
+
+def analyses_missing_skill(conn: sqlite3.Connection, skill: str, limit: int) -> List[tuple]:
+    """Summary rows of the most recent analyses that lack a skill, matched case-insensitively"""
+    return conn.execute(SELECT_ANALYSES_MISSING_SKILL, (skill, limit)).fetchall()
+
+
+def encode_cursor(row: tuple) -> str:
+    """Opaque cursor pointing just after a summary row, from its (created_at, id)"""
+    return base64.urlsafe_b64encode(json.dumps([row[4], row[0]]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) of a cursor; raises ValueError when it is malformed"""
+    try:
+        created_at, analysis_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(created_at, str) or not isinstance(analysis_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, analysis_id
+
+
+def list_analyses(
+    conn: sqlite3.Connection,
+    limit: int,
+    after: Optional[Tuple[str, str]] = None,
+    university: Optional[str] = None,
+    field: Optional[str] = None,
+    min_coverage: Optional[float] = None,
+    max_coverage: Optional[float] = None
+) -> List[tuple]:
+    """Summary rows, newest first, of the page following the (created_at, id) key after.
+
+    Keyset pagination: every page is an index range scan starting at the
+    previous page's last key, so deep pages cost the same as the first one.
+    """
+    conditions = []
+    params: List[Any] = []
+    if after is not None:
+        conditions.append("(created_at, id) < (?, ?)")
+        params.extend(after)
+    for condition, value in (
+        ("university = ?", university),
+        ("field = ?", field),
+        ("skill_coverage_percentage >= ?", min_coverage),
+        ("skill_coverage_percentage <= ?", max_coverage)
+    ):
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return conn.execute(
+        f"{SELECT_ANALYSIS_SUMMARIES} {where} ORDER BY created_at DESC, id DESC LIMIT ?", (*params, limit)
+    ).fetchall()
@@ -0,0 +1,120 @@
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+# Stands for "every field", "every university" or "all time" in the summary tables
+ALL = "*"
+
+UPSERT_COVERAGE = """
+    INSERT INTO stats_coverage (field, university, day, analyses, coverage_sum)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (field, university, day) DO UPDATE SET
+        analyses = analyses + excluded.analyses,
+        coverage_sum = coverage_sum + excluded.coverage_sum
+"""
+
+UPSERT_MISSING_SKILL = """
+    INSERT INTO stats_missing_skills (field, university, skill_id, analyses)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (field, university, skill_id) DO UPDATE SET analyses = analyses + excluded.analyses
+"""
+
+DELETE_EMPTY_MISSING_SKILL = """
+    DELETE FROM stats_missing_skills WHERE field = ? AND university = ? AND skill_id = ? AND analyses <= 0
+"""
+
+SELECT_TOP_MISSING_SKILLS = """
+    SELECT s.name, m.analyses
+    FROM stats_missing_skills m JOIN skills s ON s.id = m.skill_id
+    WHERE m.field = ? AND m.university = ?
+    ORDER BY m.analyses DESC, s.name
+    LIMIT ?
+"""
+
+SELECT_COVERAGE = """
+    SELECT day, analyses, coverage_sum FROM stats_coverage
+    WHERE field = ? AND university = ? AND day >= ?
+    ORDER BY day
+"""
+
+SELECT_FIELD_COVERAGE = """
+    SELECT field, analyses, coverage_sum FROM stats_coverage
+    WHERE university = '*' AND day = '*' AND field != '*'
+    ORDER BY analyses DESC, field
+"""
+
+
+def _scopes(field: str, university: str) -> List[Tuple[str, str]]:
+    """Summary rows an analysis counts towards: its own field and university, and the rollups"""
+    return [(field, university), (field, ALL), (ALL, university), (ALL, ALL)]
+
+
+def record_analyses(
+    conn: sqlite3.Connection,
+    analyses: List[Any],
+    skill_ids: Dict[str, int],
+    days: Optional[List[str]] = None,
+    sign: int = 1
+):
+    """Add analyses to the summary tables, inside the caller's transaction.
+
+    days gives the YYYY-MM-DD each analysis was created on (default: today).
+    With sign=-1 the analyses are subtracted instead, e.g. before recording
+    a recomputed version of them.
+    """
+    if days is None:
+        days = [conn.execute("SELECT date('now')").fetchone()[0]] * len(analyses)
+
+    coverage_rows = []
+    missing_rows = []
+    for analysis, created_on in zip(analyses, days):
+        for field, university in _scopes(analysis.field, analysis.university):
+            for day in (created_on, ALL):
+                coverage_rows.append((field, university, day, sign, sign * analysis.skill_coverage_percentage))
+            missing_rows.extend(
+                (field, university, skill_id, sign)
+                for skill_id in {skill_ids[skill] for skill in analysis.missing_skills}
+            )
+
+    conn.executemany(UPSERT_COVERAGE, coverage_rows)
+    conn.executemany(UPSERT_MISSING_SKILL, missing_rows)
+    if sign < 0:
+        conn.executemany(DELETE_EMPTY_MISSING_SKILL, [row[:3] for row in missing_rows])
+
+
+def _analysis_count(conn: sqlite3.Connection, field: str, university: str) -> int:
+    row = conn.execute(
+        "SELECT analyses FROM stats_coverage WHERE field = ? AND university = ? AND day = '*'", (field, university)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def missing_skills(
+    conn: sqlite3.Connection, field: Optional[str] = None, university: Optional[str] = None, limit: int = 20
+) -> Dict[str, Any]:
+    """Most commonly missing skills among the analyses of a field and/or university"""
+    field, university = field or ALL, university or ALL
+    total = _analysis_count(conn, field, university)
+    skills = [
+        {"skill": name, "analyses": count, "share": round(count / total, 4) if total else 0.0}
+        for name, count in conn.execute(SELECT_TOP_MISSING_SKILLS, (field, university, limit))
+    ]
+    return {"total_analyses": total, "skills": skills}
+
+
+def coverage_trend(
+    conn: sqlite3.Connection, since: str, field: Optional[str] = None, university: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Analysis count and average coverage per day from since (YYYY-MM-DD) on"""
+    return [
+        {"day": day, "analyses": count, "average_coverage": round(coverage_sum / count, 2)}
+        for day, count, coverage_sum in conn.execute(SELECT_COVERAGE, (field or ALL, university or ALL, since))
+        if day != ALL
+    ]
+
+
+def field_coverage(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Analysis count and average coverage of every field analyzed so far"""
+    return [
+        {"field": field, "analyses": count, "average_coverage": round(coverage_sum / count, 2)}
+        for field, count, coverage_sum in conn.execute(SELECT_FIELD_COVERAGE)
+    ]
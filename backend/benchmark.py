@@ -0,0 +1,378 @@
+"""Benchmark the skill extraction pipeline and the /analyze endpoint.
+
+Run from the backend directory:
+
+    python benchmark.py [--documents 24] [--requests 200] [--concurrency 8]
+                        [--output results.json] [--compare previous.json]
+                        [--url http://localhost:8000] [--skip-e2e]
+
+A seeded synthetic corpus (syllabi of varying length across every field,
+some rendered to PDFs of varying page count) is run through each
+extract_skills_* function, rank_and_filter_skills and PDF extraction, then
+through POST /analyze with FastAPI's TestClient, or against a running
+server when --url is given. Every benchmark reports p50/p95/p99 and mean
+latency plus throughput; --output saves the table as JSON, and --compare
+prints the change against a saved run. The same seed always produces the
+same corpus, so runs on one machine are comparable.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Isolate the benchmark from the real database and result cache; must run before importing main
+_benchmark_dir = tempfile.mkdtemp(prefix="skill_gap_benchmark_")
+os.environ["DATABASE_PATH"] = os.path.join(_benchmark_dir, "benchmark.db")
+os.environ.pop("RESULT_CACHE_PATH", None)
+os.environ.setdefault("ANALYSIS_EXECUTION_MODE", "inline")
+
+import main
+from nlp_models import get_nlp
+from skill_registry import get_registry
+
+SEED = int(os.getenv("BENCHMARK_SEED", "1"))
+WORDS_PER_DOCUMENT = (150, 1500, 6000)
+PDF_PAGE_COUNTS = (1, 8, 32)
+WORDS_PER_PAGE = 350
+
+FILLER = (
+    "the course introduces students to fundamental concepts and their practical application in "
+    "weekly lectures tutorials and laboratory sessions with assessment through assignments quizzes "
+    "a midterm examination and a final project graded on design quality documentation and teamwork"
+).split()
+CONTEXT_PHRASES = (
+    "Students will learn {skill}.",
+    "Hands-on experience with {skill} is developed in the lab.",
+    "Topics include {skill} and its applications.",
+    "Prerequisites: familiarity with {skill}.",
+    "Introduction to {skill}."
+)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile of already sorted values, interpolating between ranks"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples: List[float], wall_seconds: float, errors: int = 0) -> Dict[str, Any]:
+    """Latency percentiles in milliseconds and throughput in operations per second"""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "ops_per_second": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0
+    }
+
+
+def generate_syllabus(rng: random.Random, field: str, words: int) -> str:
+    """Syllabus-like text mixing filler prose with skills of the field and a few of other fields"""
+    registry = get_registry()
+    own_skills = list(registry.skills_for_field(field))
+    other_skills = [skill for skills in registry.skill_database.values() for skill in skills]
+
+    sentences = [f"{field} syllabus. Course outline and learning outcomes."]
+    count = 8
+    while count < words:
+        sentence = rng.sample(FILLER, rng.randint(6, 14))
+        roll = rng.random()
+        if roll < 0.35:
+            sentence.insert(rng.randrange(len(sentence)), rng.choice(own_skills))
+        elif roll < 0.45:
+            sentence.insert(rng.randrange(len(sentence)), rng.choice(other_skills))
+        text = " ".join(sentence).capitalize() + "."
+        if rng.random() < 0.15:
+            text += " " + rng.choice(CONTEXT_PHRASES).format(skill=rng.choice(own_skills))
+        sentences.append(text)
+        count += len(text.split())
+    return " ".join(sentences)
+
+
+def render_pdf(text: str, pages: int) -> bytes:
+    """PDF of the given page count with the text spread across its pages"""
+    import fitz
+
+    words = text.split()
+    per_page = max(1, len(words) // pages)
+    doc = fitz.open()
+    for number in range(pages):
+        chunk = words[number * per_page:(number + 1) * per_page if number < pages - 1 else None]
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 545, 792), " ".join(chunk), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def build_corpus(documents: int, seed: int = SEED) -> Dict[str, list]:
+    """Deterministic text and PDF corpus covering every field, length and page count"""
+    rng = random.Random(seed)
+    fields = list(get_registry().skill_database)
+
+    texts = []
+    for i in range(documents):
+        field = fields[i % len(fields)]
+        words = WORDS_PER_DOCUMENT[(i // len(fields)) % len(WORDS_PER_DOCUMENT)]
+        texts.append({"field": field, "words": words, "text": generate_syllabus(rng, field, words)})
+
+    pdfs = []
+    for i, pages in enumerate(PDF_PAGE_COUNTS):
+        field = fields[i % len(fields)]
+        text = generate_syllabus(rng, field, pages * WORDS_PER_PAGE)
+        pdfs.append({"field": field, "pages": pages, "pdf": render_pdf(text, pages)})
+
+    return {"texts": texts, "pdfs": pdfs}
+
+
+def time_calls(fn: Callable, inputs: List[tuple], repeat: int) -> Dict[str, Any]:
+    """Call fn on every input repeat times, timing each call"""
+    fn(*inputs[0])
+    samples = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for args in inputs:
+            call_started = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - call_started)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_microbenchmarks(corpus: Dict[str, list], repeat: int) -> Dict[str, Dict[str, Any]]:
+    registry = get_registry()
+    prepared = []
+    for document in corpus["texts"]:
+        relevant = list(registry.skills_for_field(document["field"]))
+        clean = main.clean_text_for_skill_extraction(document["text"])
+        scan = registry.matcher(relevant).scan(clean)
+        extracted = list(
+            set(main.extract_skills_keyword_matching(clean, relevant, scan))
+            | set(main.extract_skills_pattern_matching(clean, scan))
+            | set(main.extract_skills_context_based(clean, relevant))
+        )
+        prepared.append((document, relevant, clean, scan, extracted))
+
+    benchmarks = {
+        "clean_text_for_skill_extraction": (
+            main.clean_text_for_skill_extraction, [(doc["text"],) for doc, *_ in prepared]
+        ),
+        "extract_skills_keyword_matching": (
+            main.extract_skills_keyword_matching, [(clean, relevant) for _, relevant, clean, _, _ in prepared]
+        ),
+        "extract_skills_pattern_matching": (
+            main.extract_skills_pattern_matching, [(clean,) for _, _, clean, _, _ in prepared]
+        ),
+        "extract_skills_context_based": (
+            main.extract_skills_context_based, [(clean, relevant) for _, relevant, clean, _, _ in prepared]
+        ),
+        "rank_and_filter_skills": (
+            main.rank_and_filter_skills,
+            [(extracted, relevant, clean, scan) for _, relevant, clean, scan, extracted in prepared]
+        ),
+        "extract_skills_basic": (main.extract_skills_basic, [(doc["text"],) for doc, *_ in prepared]),
+        "extract_skills_with_nlp": (
+            main.extract_skills_with_nlp, [(doc["text"], doc["field"]) for doc, *_ in prepared]
+        ),
+        "extract_skills_batch": (
+            main.extract_skills_batch, [([(doc["text"], doc["field"]) for doc, *_ in prepared],)]
+        )
+    }
+    if get_nlp():
+        benchmarks["extract_skills_with_spacy"] = (
+            main.extract_skills_with_spacy, [(clean, relevant) for _, relevant, clean, _, _ in prepared]
+        )
+    else:
+        print("spaCy model not installed: extract_skills_with_spacy is skipped and the others run without it")
+
+    for length in WORDS_PER_DOCUMENT:
+        inputs = [(doc["text"], doc["field"]) for doc, *_ in prepared if doc["words"] == length]
+        if inputs:
+            benchmarks[f"extract_skills_with_nlp[{length} words]"] = (main.extract_skills_with_nlp, inputs)
+
+    for document in corpus["pdfs"]:
+        benchmarks[f"extract_text_from_pdf[{document['pages']} pages]"] = (
+            main.extract_text_from_pdf, [(document["pdf"],)]
+        )
+
+    results = {}
+    for name, (fn, inputs) in benchmarks.items():
+        print(f"  {name}...", flush=True)
+        results[name] = time_calls(fn, inputs, repeat)
+    return results
+
+
+def build_requests(corpus: Dict[str, list], count: int) -> List[Dict[str, Any]]:
+    """Mix of text and PDF analyses; each text gets a unique marker so no request is a cache hit"""
+    requests = []
+    for i in range(count):
+        if corpus["pdfs"] and i % 10 == 9:
+            document = corpus["pdfs"][(i // 10) % len(corpus["pdfs"])]
+            requests.append({
+                "kind": "pdf",
+                "data": {"university": "Benchmark University", "field": document["field"]},
+                "files": {"file": ("syllabus.pdf", document["pdf"], "application/pdf")}
+            })
+        else:
+            document = corpus["texts"][i % len(corpus["texts"])]
+            requests.append({
+                "kind": "text",
+                "data": {
+                    "university": "Benchmark University",
+                    "field": document["field"],
+                    "text_content": f"{document['text']} Section {i}."
+                }
+            })
+    return requests
+
+
+def run_load(client, requests: List[Dict[str, Any]], concurrency: int) -> Dict[str, Dict[str, Any]]:
+    """POST every request with a fixed number of concurrent clients"""
+    def send(request):
+        started = time.perf_counter()
+        response = client.post("/analyze", data=request["data"], files=request.get("files"))
+        return request["kind"], time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(send, requests))
+    wall_seconds = time.perf_counter() - started
+
+    results = {}
+    for kind in (None, "text", "pdf"):
+        selected = [outcome for outcome in outcomes if kind is None or outcome[0] == kind]
+        if not selected:
+            continue
+        samples = [seconds for _, seconds, status in selected if status == 200]
+        errors = len(selected) - len(samples)
+        name = f"POST /analyze[{kind or 'all'}, concurrency {concurrency}]"
+        results[name] = summarize(samples, wall_seconds, errors)
+    return results
+
+
+def run_end_to_end(corpus: Dict[str, list], count: int, concurrency: int, url: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    requests = build_requests(corpus, count)
+    if url:
+        import httpx
+
+        with httpx.Client(base_url=url, timeout=300) as client:
+            return run_load(client, requests, concurrency)
+
+    from fastapi.testclient import TestClient
+
+    with TestClient(main.app) as client:
+        # Let the background warm-up finish so it is not part of the measurements
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.1)
+        run_load(client, requests[:concurrency], concurrency)
+        return run_load(client, requests, concurrency)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: Dict[str, Dict[str, Any]], previous: Optional[Dict[str, Dict[str, Any]]] = None):
+    header = f"{'benchmark':<52} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'mean ms':>10} {'ops/s':>10}"
+    if previous is not None:
+        header += f" {'p50 Δ':>8} {'p95 Δ':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for name, row in results.items():
+        line = (
+            f"{name:<52} {row['n']:>6} {row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f} "
+            f"{row['p99_ms']:>10.3f} {row['mean_ms']:>10.3f} {row['ops_per_second']:>10.2f}"
+        )
+        if previous is not None:
+            before = previous.get(name)
+            for key in ("p50_ms", "p95_ms"):
+                if before and before[key]:
+                    line += f" {(row[key] - before[key]) / before[key]:>+8.1%}"
+                else:
+                    line += f" {'new':>8}"
+        if row.get("errors"):
+            line += f"  ({row['errors']} errors)"
+        print(line)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction and the /analyze endpoint")
+    parser.add_argument("--documents", type=int, default=24, help="synthetic syllabi in the text corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus per microbenchmark")
+    parser.add_argument("--requests", type=int, default=200, help="POST /analyze requests in the load test")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients in the load test")
+    parser.add_argument("--url", help="load test a running server instead of the in-process TestClient")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    print(f"Building corpus: {args.documents} syllabi, PDFs of {', '.join(map(str, PDF_PAGE_COUNTS))} pages")
+    corpus = build_corpus(args.documents, args.seed)
+
+    results = {}
+    if not args.skip_micro:
+        print("Microbenchmarks:")
+        results.update(run_microbenchmarks(corpus, args.repeat))
+    if not args.skip_e2e:
+        target = args.url or f"TestClient ({os.environ['ANALYSIS_EXECUTION_MODE']} execution mode)"
+        print(f"Load test: {args.requests} requests against {target}")
+        results.update(run_end_to_end(corpus, args.requests, args.concurrency, args.url))
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        previous = baseline["results"]
+        print(f"\nCompared with {args.compare} (revision {baseline['meta'].get('revision')})")
+    print()
+    print_table(results, previous)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "execution_mode": os.environ["ANALYSIS_EXECUTION_MODE"],
+                "spacy_model": main.nlp_model_name(),
+                "seed": args.seed,
+                "documents": args.documents,
+                "repeat": args.repeat,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "url": args.url
+            },
+            "results": results
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
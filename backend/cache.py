@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from db import ConnectionPool
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 hex digest of bytes or text"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache for JSON-serializable values.
+
+    The memory tier is an LRU bounded by entry count and total serialized size,
+    with a TTL applied on read. When persist_path is set, entries are also
+    written to a SQLite table and memory misses fall through to it, so results
+    survive restarts and are shared between workers on the same host. Expired
+    rows are deleted on the first write and then once every purge_every
+    writes, not on each one.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+        persist_path: Optional[Path] = None,
+        purge_every: int = 256
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = max(purge_every, 1)
+        self._writes_until_purge = 1
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._pool = ConnectionPool(self.persist_path) if self.persist_path else None
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "evictions": 0,
+            "expirations": 0
+        }
+
+        if self.persist_path:
+            self._init_persistent_tier()
+
+    def _init_persistent_tier(self):
+        self._pool.connection().execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        # The table lives in its own file, outside migrations.py; added here for files created without it
+        self._pool.connection().execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_namespace_created_at ON cache_entries (namespace, created_at)"
+        )
+
+    def _purge_due(self, writes: int) -> bool:
+        """Count persistent writes; True when expired rows should be deleted along with these"""
+        if self.ttl_seconds <= 0:
+            return False
+        with self._lock:
+            self._writes_until_purge -= writes
+            if self._writes_until_purge > 0:
+                return False
+            self._writes_until_purge = self.purge_every
+            return True
+
+    def _purge_expired(self, conn, now: float):
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+            (self.namespace, now - self.ttl_seconds)
+        )
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _store_in_memory(self, key: str, value: Any, size: int, created_at: float):
+        """Insert into the LRU tier and evict least recently used entries over budget"""
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (value, size, created_at)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._counters["evictions"] += 1
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, created_at = entry
+                if self._expired(created_at):
+                    del self._entries[key]
+                    self._bytes -= size
+                    self._counters["expirations"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+
+        if self.persist_path:
+            row = self._pool.connection().execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row and not self._expired(row[1]):
+                value = json.loads(row[0])
+                self._store_in_memory(key, value, len(row[0]), row[1])
+                with self._lock:
+                    self._counters["hits"] += 1
+                    self._counters["persistent_hits"] += 1
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Any):
+        """Cache a value in memory and, if enabled, in the persistent tier"""
+        serialized = json.dumps(value)
+        created_at = time.time()
+        self._store_in_memory(key, value, len(serialized), created_at)
+
+        if self.persist_path:
+            with self._pool.transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, serialized, created_at)
+                )
+                if self._purge_due(1):
+                    self._purge_expired(conn, created_at)
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Look up several keys, returning None for each miss"""
+        return [self.get(key) for key in keys]
+
+    def set_many(self, items: Dict[str, Any]):
+        """Cache several values, writing the persistent tier in one transaction"""
+        created_at = time.time()
+        rows = []
+        for key, value in items.items():
+            serialized = json.dumps(value)
+            self._store_in_memory(key, value, len(serialized), created_at)
+            rows.append((self.namespace, key, serialized, created_at))
+
+        if self.persist_path and rows:
+            with self._pool.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                if self._purge_due(len(rows)):
+                    self._purge_expired(conn, created_at)
+
+    def clear(self):
+        """Drop every entry of this namespace from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+        if self.persist_path:
+            with self._pool.transaction() as conn:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory usage"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["persistent"] = self.persist_path is not None
+        return stats
+
+
+def create_cache_from_env(namespace: str) -> ResultCache:
+    """Build a cache from the RESULT_CACHE_* environment variables"""
+    persist_path = os.getenv("RESULT_CACHE_PATH")
+
+    return ResultCache(
+        namespace=namespace,
+        max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "512")),
+        max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", str(24 * 3600))),
+        persist_path=Path(persist_path) if persist_path else None,
+        purge_every=int(os.getenv("RESULT_CACHE_PURGE_EVERY", "256"))
+    )
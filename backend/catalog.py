@@ -0,0 +1,274 @@
+import os
+import time
+import sqlite3
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Industry skills of this field apply to every field
+GENERAL_FIELD = "General"
+
+# Weight and category of industry skills that come without them (the registry's fallback lists)
+DEFAULT_IMPORTANCE = 1
+UNCATEGORIZED = "Uncategorized"
+
+INDUSTRY_SKILLS_CHECK_INTERVAL = float(os.getenv("INDUSTRY_SKILLS_CHECK_INTERVAL", "5"))
+
+SELECT_FIELD_INDUSTRY_SKILLS = """
+    SELECT skill_name, importance_level, category FROM industry_skills
+    WHERE field = ? OR field = 'General'
+    ORDER BY importance_level DESC
+"""
+
+SELECT_ANALYZED_FIELDS = """
+    SELECT field FROM stats_coverage
+    WHERE university = '*' AND day = '*' AND field != '*'
+"""
+
+SELECT_STALE_ANALYSES = """
+    SELECT id FROM analyses
+    WHERE field = ? AND catalog_revision < ?
+    LIMIT ?
+"""
+
+COUNT_STALE_ANALYSES = "SELECT count(*) FROM analyses WHERE field = ? AND catalog_revision < ?"
+
+INDUSTRY_SKILL_COLUMNS = ("field", "skill_name", "category", "importance_level", "source")
+
+# Per-connection staging table; within one load a later row for the same skill replaces an earlier one
+CREATE_STAGED_SKILLS = """
+    CREATE TEMP TABLE IF NOT EXISTS staged_industry_skills (
+        field TEXT NOT NULL,
+        skill_name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        importance_level INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        PRIMARY KEY (field, skill_name)
+    ) WITHOUT ROWID
+"""
+
+INSERT_STAGED_SKILL = """
+    INSERT OR REPLACE INTO temp.staged_industry_skills (field, skill_name, category, importance_level, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+COUNT_NEW_SKILLS = """
+    SELECT count(*) FROM temp.staged_industry_skills s
+    WHERE NOT EXISTS (SELECT 1 FROM industry_skills i WHERE i.field = s.field AND i.skill_name = s.skill_name)
+"""
+
+COUNT_CHANGED_SKILLS = """
+    SELECT count(*) FROM temp.staged_industry_skills s
+    JOIN industry_skills i ON i.field = s.field AND i.skill_name = s.skill_name
+    WHERE (i.category, i.importance_level, i.source) != (s.category, s.importance_level, s.source)
+"""
+
+# Only rows that differ are written, so unchanged fields keep their catalog revision
+UPSERT_STAGED_SKILLS = """
+    INSERT INTO industry_skills (field, skill_name, category, importance_level, source)
+    SELECT field, skill_name, category, importance_level, source FROM temp.staged_industry_skills WHERE true
+    ON CONFLICT (field, skill_name) DO UPDATE SET
+        category = excluded.category,
+        importance_level = excluded.importance_level,
+        source = excluded.source
+    WHERE (category, importance_level, source) != (excluded.category, excluded.importance_level, excluded.source)
+"""
+
+DELETE_UNSTAGED_SKILLS = """
+    DELETE FROM industry_skills
+    WHERE NOT EXISTS (
+        SELECT 1 FROM temp.staged_industry_skills s
+        WHERE s.field = industry_skills.field AND s.skill_name = industry_skills.skill_name
+    )
+"""
+
+
+def current_revision(conn: sqlite3.Connection) -> int:
+    """Catalog revision: increases with every change to industry_skills, 0 before the first one"""
+    return conn.execute("SELECT coalesce(max(revision), 0) FROM catalog_versions").fetchone()[0]
+
+
+def field_revisions(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Revision at which each field's industry skills last changed"""
+    return dict(conn.execute("SELECT field, revision FROM catalog_versions"))
+
+
+def _threshold(revisions: Dict[str, int], field: str) -> int:
+    """Revision an analysis of field must have been compared at to be current: its own or General's last change"""
+    return max(revisions.get(field, 0), revisions.get(GENERAL_FIELD, 0))
+
+
+def _thresholds(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Per analyzed field, the revision an analysis must have been compared at to be current"""
+    revisions = field_revisions(conn)
+    return {field: _threshold(revisions, field) for (field,) in conn.execute(SELECT_ANALYZED_FIELDS)}
+
+
+def stale_analyses(conn: sqlite3.Connection, limit: int) -> List[str]:
+    """IDs of up to limit analyses compared against an older catalog than their field's current one"""
+    ids: List[str] = []
+    for field, threshold in _thresholds(conn).items():
+        ids.extend(row[0] for row in conn.execute(SELECT_STALE_ANALYSES, (field, threshold, limit - len(ids))))
+        if len(ids) >= limit:
+            break
+    return ids
+
+
+def stale_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Number of stale analyses per field, omitting fields that are up to date"""
+    counts = {}
+    for field, threshold in _thresholds(conn).items():
+        count = conn.execute(COUNT_STALE_ANALYSES, (field, threshold)).fetchone()[0]
+        if count:
+            counts[field] = count
+    return counts
+
+
+class IndustrySkills:
+    """Immutable snapshot of the industry skills a field is compared against.
+
+    skills keeps the catalog order, most important first, without
+    case-insensitive duplicates; keys holds their lowercase names and
+    categories their categories in the same order, skill_set the names as a
+    frozenset, and weights maps them to their importance level. revision is
+    the catalog revision the snapshot is current with, to be stored on
+    analyses compared against it.
+    """
+
+    __slots__ = ("field", "skills", "keys", "categories", "skill_set", "weights", "revision")
+
+    def __init__(self, field: str, rows: Iterable[Tuple[str, int, Optional[str]]], revision: int = 0):
+        skills = []
+        categories = []
+        weights = {}
+        for skill, importance, category in rows:
+            key = skill.lower()
+            if key not in weights:
+                weights[key] = importance
+                skills.append(skill)
+                categories.append(category or UNCATEGORIZED)
+
+        set_attr = super().__setattr__
+        set_attr("field", field)
+        set_attr("skills", tuple(skills))
+        set_attr("keys", tuple(skill.lower() for skill in skills))
+        set_attr("categories", tuple(categories))
+        set_attr("skill_set", frozenset(weights))
+        set_attr("weights", MappingProxyType(weights))
+        set_attr("revision", revision)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("IndustrySkills is immutable")
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+class IndustrySkillsCache:
+    """Per-field IndustrySkills snapshots of the industry_skills table, shared by the threads of a process.
+
+    The catalog revision is read at most once per check_interval seconds; when
+    it moved, only the snapshots of fields whose skills (or the General ones)
+    changed are dropped and loaded again on their next use.
+    """
+
+    def __init__(self, check_interval: float = INDUSTRY_SKILLS_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._snapshots: Dict[str, IndustrySkills] = {}
+        self._revision: Optional[int] = None
+        self._field_revisions: Dict[str, int] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def check(self, conn: sqlite3.Connection, force: bool = False) -> int:
+        """Catalog revision, re-read from the database when check_interval has passed or force is set"""
+        now = time.monotonic()
+        if not force and self._revision is not None and now - self._checked_at < self.check_interval:
+            return self._revision
+
+        with self._lock:
+            revision = current_revision(conn)
+            if revision != self._revision:
+                revisions = field_revisions(conn)
+                for field, snapshot in list(self._snapshots.items()):
+                    if snapshot.revision != _threshold(revisions, field):
+                        del self._snapshots[field]
+                self._field_revisions = revisions
+                self._revision = revision
+            self._checked_at = now
+            return revision
+
+    def get(self, conn: sqlite3.Connection, field: str, force_check: bool = False) -> IndustrySkills:
+        """Industry skills of a field, from the snapshot unless the catalog changed since it was taken"""
+        self.check(conn, force_check)
+        snapshot = self._snapshots.get(field)
+        if snapshot is not None:
+            return snapshot
+
+        revision = _threshold(self._field_revisions, field)
+        snapshot = IndustrySkills(field, conn.execute(SELECT_FIELD_INDUSTRY_SKILLS, (field,)), revision)
+        with self._lock:
+            # A check that ran during the load may have seen a newer catalog; keep the snapshot only if not
+            if revision == _threshold(self._field_revisions, field):
+                snapshot = self._snapshots.setdefault(field, snapshot)
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._revision = None
+
+
+def industry_skill_row(record: Dict[str, Any]) -> tuple:
+    """(field, skill_name, category, importance_level, source) of a catalog record; raises ValueError when invalid"""
+    missing = [column for column in INDUSTRY_SKILL_COLUMNS if record.get(column) in (None, "")]
+    if missing:
+        raise ValueError(f"lacks {', '.join(missing)}")
+    try:
+        importance_level = int(record["importance_level"])
+    except (TypeError, ValueError):
+        raise ValueError(f"importance_level {record['importance_level']!r} is not an integer")
+    return (
+        str(record["field"]).strip(), str(record["skill_name"]).strip(), str(record["category"]),
+        importance_level, str(record["source"])
+    )
+
+
+def stage_industry_skills(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]], first: int = 1) -> int:
+    """Validate catalog records and add them to the connection's staging table; returns how many.
+
+    first is the number of the first record, used in error messages.
+    """
+    rows = []
+    for number, record in enumerate(records, first):
+        try:
+            rows.append(industry_skill_row(record))
+        except ValueError as e:
+            raise ValueError(f"Record {number} {e}")
+    conn.execute(CREATE_STAGED_SKILLS)
+    conn.executemany(INSERT_STAGED_SKILL, rows)
+    return len(rows)
+
+
+def apply_staged_industry_skills(conn: sqlite3.Connection, prune: bool = False) -> Dict[str, int]:
+    """Write the staged catalog rows that differ from industry_skills, inside the caller's transaction.
+
+    With prune, industry skills absent from the staging table are deleted, so
+    the table ends up equal to the staged catalog. Returns the size of the diff
+    and empties the staging table.
+    """
+    conn.execute(CREATE_STAGED_SKILLS)
+    staged = conn.execute("SELECT count(*) FROM temp.staged_industry_skills").fetchone()[0]
+    counts = {
+        "inserted": conn.execute(COUNT_NEW_SKILLS).fetchone()[0],
+        "updated": conn.execute(COUNT_CHANGED_SKILLS).fetchone()[0],
+        "deleted": 0
+    }
+    counts["unchanged"] = staged - counts["inserted"] - counts["updated"]
+
+    if counts["inserted"] or counts["updated"]:
+        conn.execute(UPSERT_STAGED_SKILLS)
+    if prune:
+        counts["deleted"] = conn.execute(DELETE_UNSTAGED_SKILLS).rowcount
+    conn.execute("DELETE FROM temp.staged_industry_skills")
+    return counts
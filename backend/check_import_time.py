@@ -0,0 +1,79 @@
+"""Check that importing the API stays fast and does not load NLP models.
+
+Run from the backend directory:  python check_import_time.py [budget_seconds]
+(tests/test_startup.py runs the same check under pytest)
+
+Imports main in fresh interpreters, reports the best wall time and the
+slowest top-level imports, and exits non-zero when the time exceeds the
+budget or a module that must load lazily was imported.
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "1.5"))
+RUNS = 3
+
+# Loaded on first use or by the background warm-up, never at import
+LAZY_MODULES = ("spacy", "nltk", "pandas", "sklearn", "textdistance", "pdfplumber")
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(elapsed, ",".join(name for name in {lazy!r} if name in sys.modules))
+"""
+
+
+def run_probe(backend_dir: str, database_dir: str) -> tuple:
+    env = dict(os.environ, DATABASE_PATH=os.path.join(database_dir, "import_check.db"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed, _, loaded = result.stdout.splitlines()[-1].partition(" ")
+    return float(elapsed), [name for name in loaded.split(",") if name], result.stderr
+
+
+def slowest_imports(importtime_log: str, limit: int = 10) -> list:
+    """Top-level imports of main sorted by cumulative microseconds"""
+    entries = []
+    for line in importtime_log.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match and len(match.group(2)) <= 3:
+            entries.append((int(match.group(1)), match.group(3)))
+    return sorted(entries, reverse=True)[:limit]
+
+
+def measure_import(runs: int = RUNS) -> tuple:
+    """Best (seconds, lazy modules loaded, -X importtime log) of importing main in runs fresh interpreters"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as database_dir:
+        results = [run_probe(backend_dir, database_dir) for _ in range(runs)]
+    return min(results, key=lambda run: run[0])
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_TIME_BUDGET
+    elapsed, loaded, importtime_log = measure_import()
+
+    print(f"import main: {elapsed:.3f}s (best of {RUNS}, budget {budget:.3f}s)")
+    for microseconds, module in slowest_imports(importtime_log):
+        print(f"  {microseconds / 1e6:7.3f}s  {module}")
+
+    failed = False
+    if elapsed > budget:
+        print(f"FAIL: import took {elapsed:.3f}s, over the {budget:.3f}s budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: imported at startup instead of lazily: {', '.join(loaded)}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+DATABASE_PATH = Path(os.getenv("DATABASE_PATH", Path(__file__).parent / "database" / "skill_predictor.db"))
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": "MEMORY",
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")
+}
+
+
+class ConnectionPool:
+    """Per-thread SQLite connections configured for concurrent readers and writers.
+
+    Each thread keeps one long-lived connection, so prepared statements are
+    reused through sqlite3's statement cache instead of being recompiled on
+    every request. Connections run in autocommit mode with WAL journaling:
+    reads never wait for writers, and writes go through transaction(), which
+    takes the write lock up front with BEGIN IMMEDIATE.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        pragmas: Optional[Dict[str, str]] = None,
+        cached_statements: int = 256
+    ):
+        self.path = Path(path)
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        busy_timeout = int(self.pragmas.get("busy_timeout", "5000")) / 1000
+        conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of writes atomically on the calling thread's connection"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def close_all(self):
+        """Close every connection opened by this pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+pool = ConnectionPool(DATABASE_PATH)
+
+
+def get_connection() -> sqlite3.Connection:
+    """Shortcut for the application database connection of the calling thread"""
+    return pool.connection()
+
+
+def transaction():
+    """Shortcut for a write transaction on the application database"""
+    return pool.transaction()
@@ -0,0 +1,314 @@
+import os
+import uuid
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from db import ConnectionPool, pool as default_pool
+
+JOB_STAGES = ("queued", "extracting", "nlp", "comparing", "persisting", "done")
+
+JOB_COLUMNS = (
+    "id", "status", "stage", "university", "field", "text_content", "input_path", "input_hash",
+    "analysis_id", "error", "attempts", "created_at", "started_at", "updated_at", "finished_at"
+)
+
+SELECT_JOB = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?"
+
+SELECT_NEXT_JOB = """
+    SELECT id FROM jobs
+    WHERE status = 'queued'
+    ORDER BY created_at
+    LIMIT 1
+"""
+
+
+class JobQueue:
+    """Durable FIFO of analysis jobs stored in the jobs table.
+
+    Jobs move from queued to running to succeeded or failed. Claiming takes the
+    database write lock, so several workers (or server processes) sharing the
+    database never pick up the same job. A running job holds a lease that its
+    worker renews through heartbeat(); once updated_at is more than
+    lease_seconds old, e.g. because the worker process died, claim() requeues
+    the job.
+    """
+
+    def __init__(self, pool: ConnectionPool = default_pool, max_attempts: int = 3, lease_seconds: float = 300):
+        self.pool = pool
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+
+    def enqueue(
+        self,
+        university: str,
+        field: str,
+        text_content: Optional[str] = None,
+        input_path: Optional[str] = None,
+        input_hash: Optional[str] = None
+    ) -> str:
+        """Queue an analysis of inline text or a spooled PDF and return the job ID"""
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self.pool.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO jobs (id, status, stage, university, field, text_content, input_path, input_hash,
+                                  attempts, created_at, updated_at)
+                VALUES (?, 'queued', 'queued', ?, ?, ?, ?, ?, 0, ?, ?)
+                """,
+                (job_id, university, field, text_content, input_path, input_hash, now, now)
+            )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running and return it, or None if the queue is empty.
+
+        Running jobs whose lease expired are requeued first.
+        """
+        now = datetime.now()
+        expired_before = (now - timedelta(seconds=self.lease_seconds)).isoformat()
+        now = now.isoformat()
+        with self.pool.transaction() as conn:
+            abandoned, _ = self._requeue(conn, now, expired_before)
+            row = conn.execute(SELECT_NEXT_JOB).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1, started_at = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (now, now, row[0])
+            )
+            job = self._fetch(conn, row[0])
+        self._remove_inputs(abandoned)
+        return job
+
+    def heartbeat(self, job_id: str):
+        """Renew the lease of a running job"""
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = 'running'",
+                (datetime.now().isoformat(), job_id)
+            )
+
+    def set_stage(self, job_id: str, stage: str):
+        """Record the stage a running job has reached"""
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, updated_at = ? WHERE id = ?",
+                (stage, datetime.now().isoformat(), job_id)
+            )
+
+    def complete(self, job_id: str, analysis_id: str, conn: Optional[sqlite3.Connection] = None):
+        """Mark a job as succeeded, inside the caller's transaction when conn is given"""
+        if conn is None:
+            with self.pool.transaction() as conn:
+                return self.complete(job_id, analysis_id, conn)
+
+        now = datetime.now().isoformat()
+        conn.execute(
+            """
+            UPDATE jobs
+            SET status = 'succeeded', stage = 'done', analysis_id = ?, error = NULL,
+                updated_at = ?, finished_at = ?
+            WHERE id = ?
+            """,
+            (analysis_id, now, now, job_id)
+        )
+
+    def fail(self, job_id: str, error: str):
+        """Mark a job as failed with an error message"""
+        now = datetime.now().isoformat()
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                (error, now, now, job_id)
+            )
+
+    def requeue_running(self) -> int:
+        """Put jobs interrupted by a restart back in the queue; give up after max_attempts"""
+        now = datetime.now().isoformat()
+        with self.pool.transaction() as conn:
+            abandoned, requeued = self._requeue(conn, now)
+        self._remove_inputs(abandoned)
+        return requeued
+
+    def _requeue(
+        self, conn: sqlite3.Connection, now: str, updated_before: Optional[str] = None
+    ) -> Tuple[List[str], int]:
+        """Requeue running jobs, or only those last updated before updated_before.
+
+        Jobs out of attempts are failed instead. Returns the spooled inputs of
+        the failed jobs, to remove once committed, and the number requeued.
+        """
+        interrupted = "status = 'running'" + (" AND updated_at < ?" if updated_before else "")
+        bounds = (updated_before,) if updated_before else ()
+        abandoned = conn.execute(
+            f"SELECT input_path FROM jobs WHERE {interrupted} AND attempts >= ? AND input_path IS NOT NULL",
+            bounds + (self.max_attempts,)
+        ).fetchall()
+        conn.execute(
+            f"""
+            UPDATE jobs
+            SET status = 'failed', error = 'Analysis was interrupted too many times', updated_at = ?, finished_at = ?
+            WHERE {interrupted} AND attempts >= ?
+            """,
+            (now, now) + bounds + (self.max_attempts,)
+        )
+        requeued = conn.execute(
+            f"UPDATE jobs SET status = 'queued', stage = 'queued', updated_at = ? WHERE {interrupted}",
+            (now,) + bounds
+        ).rowcount
+        return [input_path for (input_path,) in abandoned], requeued
+
+    @staticmethod
+    def _remove_inputs(paths: List[str]):
+        for input_path in paths:
+            if os.path.exists(input_path):
+                os.unlink(input_path)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a job by ID"""
+        return self._fetch(self.pool.connection(), job_id)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        rows = self.pool.connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, job_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(SELECT_JOB, (job_id,)).fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+
+def job_progress(job: Dict[str, Any]) -> float:
+    """Fraction of the pipeline a job has completed, based on its stage"""
+    if job["status"] in ("succeeded", "failed"):
+        return 1.0
+    return round(JOB_STAGES.index(job["stage"]) / (len(JOB_STAGES) - 1), 2)
+
+
+def requeue_interrupted_jobs(queue: JobQueue) -> int:
+    """Requeue jobs left running by a previous server process"""
+    requeued = queue.requeue_running()
+    if requeued:
+        print(f"Requeued {requeued} interrupted analysis job(s)")
+    return requeued
+
+
+class JobRunner:
+    """Local asyncio workers that drain a JobQueue.
+
+    handler(job, set_stage) runs one job and is responsible for marking it
+    complete, ideally in the same transaction that stores its result; any
+    exception it raises marks the job failed. Workers sleep until a job is
+    enqueued in this process or poll_interval passes, so jobs queued by other
+    server processes are picked up too. While a job runs its lease is renewed
+    every heartbeat_interval seconds. A database error while claiming or
+    recording a job is logged and retried with backoff instead of stopping the
+    worker; a job that could not be marked failed is requeued once its lease
+    expires.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Dict[str, Any], Callable[[str], Awaitable]], Awaitable],
+        run_db: Callable[..., Awaitable],
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 60.0,
+        max_backoff: float = 30.0
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.run_db = run_db
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_backoff = max_backoff
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, requeue: bool = True):
+        """Start the worker tasks on the running loop, first requeueing interrupted jobs.
+
+        Pass requeue=False when sibling server processes may be running jobs,
+        so only the process that starts first recovers them.
+        """
+        if self._tasks:
+            return
+        if requeue:
+            requeue_interrupted_jobs(self.queue)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the worker tasks; jobs they were running are requeued on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job was enqueued"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self):
+        backoff = self.poll_interval
+        while True:
+            try:
+                job = await self.run_db(self.queue.claim)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._run(job)
+                backoff = self.poll_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Job worker error, retrying in {backoff:.1f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.run_db(self.queue.heartbeat, job_id)
+            except Exception as e:
+                print(f"Renewing the lease of job {job_id} failed: {e}")
+
+    async def _run(self, job: Dict[str, Any]):
+        async def set_stage(stage: str):
+            await self.run_db(self.queue.set_stage, job["id"], stage)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            await self.handler(job, set_stage)
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            await self.run_db(self.queue.fail, job["id"], str(e.detail))
+        except Exception as e:
+            await self.run_db(self.queue.fail, job["id"], f"Analysis failed: {str(e)}")
+        finally:
+            heartbeat.cancel()
+
+        if job["input_path"]:
+            final = await self.run_db(self.queue.get, job["id"])
+            if final and final["status"] in ("succeeded", "failed") and os.path.exists(job["input_path"]):
+                os.unlink(job["input_path"])
@@ -1,32 +1,51 @@
 import os
 import json
+import math
 import uuid
-import sqlite3
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, List, Optional, Dict, Any, Tuple
 
-import fitz  
-import pdfplumber
 import re
-import string
-from collections import Counter
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+import numpy as np
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from dotenv import load_dotenv
-import pandas as pd
-import requests
-import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import spacy
-from textdistance import jaro_winkler
-from fuzzywuzzy import fuzz, process
 
+# Load .env before the local modules below read their configuration at import
 load_dotenv()
 
+from cache import content_hash, create_cache_from_env
+from db import DATABASE_PATH, get_connection, pool as db_pool, transaction
+import analytics
+from analysis_store import (
+    analyses_missing_skill, covered_skills_by_analysis, decode_cursor, encode_cursor, insert_analyses, insert_signatures,
+    list_analyses, load_analyses, load_analysis, replace_comparisons
+)
+from catalog import (
+    DEFAULT_IMPORTANCE, IndustrySkills, IndustrySkillsCache, field_revisions, stale_analyses, stale_counts
+)
+from jobs import JobQueue, JobRunner, job_progress, requeue_interrupted_jobs
+from metrics import (
+    ANALYSES, CACHE_LOOKUPS, REGISTRY as METRICS, REQUEST_SECONDS, SPACY_CANDIDATES, TEXT_CHARS,
+    server_timing_header, stage_timer, start_request_timings
+)
+from migrations import run_migrations
+from nlp_models import SPACY_CHUNK_CHARS, get_nlp, nlp_model_name, nlp_settled, nlp_status
+from pdf_extraction import extract_text_from_pdf_bytes, extract_text_parallel, spool_upload
+from scoring import covered_matrix, score_matrix, score_skills
+from skill_matcher import TextScan
+from skill_matrix import SkillMatrix, compare_rows, most_covered_skills
+from syllabus_index import SyllabusIndex, syllabus_signatures
+from skill_registry import SkillRegistry, get_registry, load_registry_from_env, reload_registry
+import transfer
+from workers import create_pool_from_env
+
 app = FastAPI(
     title="Skill Gap Predictor API",
     description="API for analyzing university syllabi and identifying skill gaps",
@@ -41,22 +60,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except Exception as e:
-    print(f"NLTK download warning: {e}")
+SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+NLP_WARM_UP = os.getenv("NLP_WARM_UP", "true").lower() in ("1", "true", "yes")
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "16"))
+SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+SPACY_MAX_CHARS = int(os.getenv("SPACY_MAX_CHARS", "300000"))
+
+ANALYSIS_BATCH_MAX_ITEMS = int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", "200"))
+ANALYSES_MAX_PAGE_SIZE = int(os.getenv("ANALYSES_MAX_PAGE_SIZE", "100"))
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_SPOOL_DIR = Path(os.getenv("JOB_SPOOL_DIR", DATABASE_PATH.parent / "jobs"))
+
+COMPARE_MAX_ANALYSES = int(os.getenv("COMPARE_MAX_ANALYSES", "2000"))
+COMPARE_MATRIX_MAX_ROWS = int(os.getenv("COMPARE_MATRIX_MAX_ROWS", "200"))
+
+SYLLABUS_LSH_BANDS = int(os.getenv("SYLLABUS_LSH_BANDS", "32"))
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("spaCy model 'en_core_web_sm' not found. Using basic text processing.")
-    nlp = None
+CATALOG_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", "300"))
+CATALOG_RECOMPUTE_BATCH = int(os.getenv("CATALOG_RECOMPUTE_BATCH", "200"))
 
-DATABASE_PATH = Path(__file__).parent / "database" / "skill_predictor.db"
-DATABASE_PATH.parent.mkdir(exist_ok=True)
+
+analysis_pool = create_pool_from_env()
+text_cache = create_cache_from_env("pdf_text")
+skills_cache = create_cache_from_env("covered_skills")
+industry_skills_cache = IndustrySkillsCache()
+skill_matrix = SkillMatrix()
+syllabus_index = SyllabusIndex(SYLLABUS_LSH_BANDS)
+job_queue = JobQueue(db_pool, max_attempts=JOB_MAX_ATTEMPTS, lease_seconds=JOB_LEASE_SECONDS)
+nlp_loading: Optional[asyncio.Task] = None
+startup_complete = False
+shared_state_preloaded = False
+catalog_watcher: Optional[asyncio.Task] = None
+recompute_lock = asyncio.Lock()
+
+
+class NearDuplicate(BaseModel):
+    """Most similar stored syllabus of the same field, and how the covered skills differ from its analysis"""
+    analysis_id: str
+    similarity: float
+    added_skills: List[str]
+    removed_skills: List[str]
 
 
 class SkillAnalysis(BaseModel):
@@ -68,6 +117,10 @@ class SkillAnalysis(BaseModel):
     missing_skills: List[str]
     skill_coverage_percentage: float
     recommendations: List[Dict[str, str]]
+    weighted_coverage_percentage: Optional[float] = None
+    category_coverage: Optional[Dict[str, float]] = None
+    catalog_revision: int = 0
+    near_duplicate: Optional[NearDuplicate] = None
     created_at: str
 
 
@@ -78,161 +131,101 @@ class AnalysisRequest(BaseModel):
     text_content: Optional[str] = None
 
 
+class JobStatus(BaseModel):
+    """Model for the state of a queued analysis"""
+    job_id: str
+    status: str
+    stage: str
+    progress: float
+    analysis_id: Optional[str] = None
+    result: Optional[SkillAnalysis] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class BatchItem(BaseModel):
+    """One syllabus of a batch request: inline text or the name of an uploaded PDF"""
+    university: str
+    field: str
+    text_content: Optional[str] = None
+    file: Optional[str] = None
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch item, in request order"""
+    index: int
+    status: str
+    analysis: Optional[SkillAnalysis] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CatalogSkill(BaseModel):
+    """One industry skill of a catalog to score stored analyses against"""
+    skill_name: str
+    importance_level: int = DEFAULT_IMPORTANCE
+    category: Optional[str] = None
+
+
+class CatalogScoreRequest(BaseModel):
+    """Field whose stored analyses to score, and optionally the complete skill list to score them against"""
+    field: str
+    skills: Optional[List[CatalogSkill]] = None
+    lowest: int = 10
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Model for batch analysis results"""
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+
+
 def init_database():
-    """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS analyses (
-            id TEXT PRIMARY KEY,
-            university TEXT NOT NULL,
-            field TEXT NOT NULL,
-            covered_skills TEXT NOT NULL,
-            missing_skills TEXT NOT NULL,
-            skill_coverage_percentage REAL NOT NULL,
-            recommendations TEXT NOT NULL,
-            syllabus_text TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS industry_skills (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            field TEXT NOT NULL,
-            skill_name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            importance_level INTEGER NOT NULL,
-            source TEXT NOT NULL
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
+    """Initialize SQLite database by applying pending schema migrations"""
+    run_migrations()
 
 
 def extract_text_from_pdf(file_content: bytes) -> str:
     """Extract text from PDF using PyMuPDF and pdfplumber"""
-    try:
-        doc = fitz.open(stream=file_content, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        
-        if text.strip():
-            return text
-            
-    except Exception as e:
-        print(f"PyMuPDF failed: {e}")
-    
-    try:
-        import io
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text
-        
-    except Exception as e:
-        print(f"pdfplumber failed: {e}")
-        raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+    return extract_text_from_pdf_bytes(file_content)
 
 
-def extract_skills_with_nlp(syllabus_text: str, field: str) -> List[str]:
+def skills_cache_key(syllabus_text: str, field: str) -> str:
+    """Cache key for extracted skills: text hash, field and everything that affects extraction"""
+    return f"{content_hash(syllabus_text)}:{field}:{get_registry().version}:{nlp_model_name()}"
+
+
+def extract_skills_with_nlp(syllabus_text: str, field: str, spacy_candidates: Optional[set] = None) -> List[str]:
     """Extract skills from syllabus text using NLP techniques (free alternative to LLM)"""
     try:
-        skill_database = {
-            "Computer Science": [
-                "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "Go", "Rust", "Swift", "Kotlin",
-                "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express", "Django", "Flask", "Spring",
-                "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis", "Elasticsearch",
-                "Git", "GitHub", "GitLab", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "DevOps", "CI/CD",
-                "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch", "Scikit-learn",
-                "Data Structures", "Algorithms", "Object Oriented Programming", "Functional Programming",
-                "API Development", "RESTful APIs", "GraphQL", "Microservices", "System Design", "Software Architecture",
-                "Testing", "Unit Testing", "Integration Testing", "Agile", "Scrum", "Linux", "Unix", "Shell Scripting",
-                "Web Development", "Frontend Development", "Backend Development", "Full Stack Development",
-                "Database Design", "Data Modeling", "Cybersecurity", "Network Security", "Encryption"
-            ],
-            "Engineering": [
-                "MATLAB", "Simulink", "AutoCAD", "SolidWorks", "CATIA", "Inventor", "Fusion 360",
-                "CAD", "CAM", "CAE", "FEA", "CFD", "Finite Element Analysis", "Computational Fluid Dynamics",
-                "Project Management", "Lean Manufacturing", "Six Sigma", "Quality Control", "Quality Assurance",
-                "Statistics", "Linear Algebra", "Calculus", "Differential Equations", "Physics", "Thermodynamics",
-                "Materials Science", "Mechanical Design", "Electrical Engineering", "Control Systems",
-                "PLC Programming", "SCADA", "HMI", "Industrial Automation", "Robotics", "Mechatronics",
-                "3D Modeling", "3D Printing", "Additive Manufacturing", "Manufacturing Processes",
-                "Technical Drawing", "Blueprint Reading", "GD&T", "Tolerance Analysis", "Stress Analysis"
-            ],
-            "Information Technology": [
-                "Network Administration", "System Administration", "Cloud Computing", "Virtualization",
-                "Windows Server", "Linux Administration", "Active Directory", "LDAP", "DNS", "DHCP",
-                "TCP/IP", "Networking", "Routing", "Switching", "Firewalls", "VPN", "VLAN",
-                "Cybersecurity", "Information Security", "Risk Assessment", "Compliance", "ITIL", "ITSM",
-                "Help Desk", "Technical Support", "Troubleshooting", "Hardware", "Software Installation",
-                "Backup and Recovery", "Disaster Recovery", "Business Continuity", "Monitoring", "Performance Tuning",
-                "Database Administration", "SQL Server", "Oracle", "MySQL", "PostgreSQL", "MongoDB",
-                "PowerShell", "Bash", "Python", "Scripting", "Automation", "Configuration Management"
-            ],
-            "Electronics": [
-                "Circuit Design", "PCB Design", "Analog Electronics", "Digital Electronics", "Power Electronics",
-                "Microcontrollers", "Microprocessors", "Embedded Systems", "FPGA", "VHDL", "Verilog",
-                "Signal Processing", "Digital Signal Processing", "Image Processing", "Communication Systems",
-                "RF Design", "Antenna Design", "Wireless Communication", "Bluetooth", "WiFi", "5G",
-                "Arduino", "Raspberry Pi", "PIC", "ARM", "AVR", "STM32", "ESP32",
-                "VLSI Design", "ASIC Design", "Semiconductor Physics", "Electronic Measurements",
-                "Oscilloscope", "Multimeter", "Function Generator", "Logic Analyzer", "Spectrum Analyzer",
-                "Soldering", "PCB Layout", "Schematic Design", "SPICE Simulation", "MATLAB", "LabVIEW"
-            ],
-            "Artificial Intelligence and Data Science": [
-                "Python", "R", "SQL", "Scala", "Julia", "Java", "C++",
-                "Machine Learning", "Deep Learning", "Neural Networks", "Artificial Intelligence",
-                "Statistics", "Probability", "Linear Algebra", "Calculus", "Statistical Analysis",
-                "Data Science", "Data Analysis", "Data Mining", "Data Visualization", "Exploratory Data Analysis",
-                "Pandas", "NumPy", "SciPy", "Matplotlib", "Seaborn", "Plotly", "Bokeh",
-                "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "XGBoost", "LightGBM", "CatBoost",
-                "Natural Language Processing", "Computer Vision", "Time Series Analysis", "Forecasting",
-                "Big Data", "Apache Spark", "Hadoop", "MapReduce", "Hive", "Pig", "Apache Kafka",
-                "Tableau", "Power BI", "Jupyter Notebook", "Google Colab", "Apache Airflow",
-                "Feature Engineering", "Model Selection", "Cross Validation", "Hyperparameter Tuning",
-                "A/B Testing", "Experimental Design", "Causal Inference", "Bayesian Statistics"
-            ],
-            "Artificial Intelligence and Machine Learning": [
-                "Python", "R", "MATLAB", "C++", "Java", "Scala",
-                "Machine Learning", "Deep Learning", "Neural Networks", "Artificial Intelligence",
-                "Supervised Learning", "Unsupervised Learning", "Reinforcement Learning", "Transfer Learning",
-                "Convolutional Neural Networks", "Recurrent Neural Networks", "LSTM", "GRU", "Transformers",
-                "Computer Vision", "Natural Language Processing", "Speech Recognition", "Robotics",
-                "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "OpenCV", "NLTK", "spaCy", "Hugging Face",
-                "Linear Algebra", "Calculus", "Statistics", "Probability", "Optimization", "Information Theory",
-                "Feature Engineering", "Dimensionality Reduction", "PCA", "t-SNE", "UMAP",
-                "Model Evaluation", "Cross Validation", "Bias-Variance Tradeoff", "Regularization",
-                "Ensemble Methods", "Random Forest", "Gradient Boosting", "XGBoost", "AdaBoost",
-                "Neural Architecture Search", "AutoML", "MLOps", "Model Deployment", "Edge AI",
-                "Ethics in AI", "Fairness", "Interpretability", "Explainable AI", "Adversarial Examples"
-            ]
-        }
-
-        relevant_skills = skill_database.get(field, skill_database["Computer Science"])
-
-        text_clean = clean_text_for_skill_extraction(syllabus_text)
+        registry = get_registry()
+        relevant_skills = registry.skills_for_field(field)
+        TEXT_CHARS.inc(len(syllabus_text))
+
+        with stage_timer("cleaning"):
+            text_clean = clean_text_for_skill_extraction(syllabus_text)
 
         extracted_skills = set()
  
-        extracted_skills.update(extract_skills_keyword_matching(text_clean, relevant_skills))
+        with stage_timer("keyword"):
+            scan = registry.matcher(relevant_skills).scan(text_clean)
+            extracted_skills.update(extract_skills_keyword_matching(text_clean, relevant_skills, scan))
 
-        if nlp:
-            extracted_skills.update(extract_skills_with_spacy(text_clean, relevant_skills))
+        if get_nlp():
+            with stage_timer("spacy"):
+                extracted_skills.update(extract_skills_with_spacy(text_clean, relevant_skills, spacy_candidates))
   
-        extracted_skills.update(extract_skills_pattern_matching(text_clean))
+        with stage_timer("pattern"):
+            extracted_skills.update(extract_skills_pattern_matching(text_clean, scan))
   
-        extracted_skills.update(extract_skills_context_based(text_clean, relevant_skills))
+        with stage_timer("context"):
+            extracted_skills.update(extract_skills_context_based(text_clean, relevant_skills))
   
-        final_skills = rank_and_filter_skills(list(extracted_skills), relevant_skills, text_clean)
+        with stage_timer("ranking"):
+            final_skills = rank_and_filter_skills(list(extracted_skills), relevant_skills, text_clean, scan)
         
         return final_skills[:25]  
         
@@ -241,163 +234,127 @@ def extract_skills_with_nlp(syllabus_text: str, field: str) -> List[str]:
         return extract_skills_basic(syllabus_text)
 
 
+def extract_skills_batch(items: List[Tuple[str, str]]) -> List[List[str]]:
+    """Extract skills for (syllabus_text, field) pairs, parsing all texts in one nlp.pipe run"""
+    try:
+        with stage_timer("spacy"):
+            candidates = extract_spacy_candidates([clean_text_for_skill_extraction(text) for text, _ in items])
+    except Exception as e:
+        print(f"spaCy batch processing failed: {e}")
+        candidates = [None] * len(items)
+
+    return [
+        extract_skills_with_nlp(text, field, spacy_candidates)
+        for (text, field), spacy_candidates in zip(items, candidates)
+    ]
+
+
 def clean_text_for_skill_extraction(text: str) -> str:
     """Clean and preprocess text for better skill extraction"""
     text = text.lower()
 
     text = re.sub(r'[^\w\s\+\#\.\-]', ' ', text)
     
-    replacements = {
-        'javascript': 'JavaScript',
-        'typescript': 'TypeScript',
-        'c++': 'C++',
-        'c#': 'C#',
-        'node.js': 'Node.js',
-        'vue.js': 'Vue.js',
-        'asp.net': 'ASP.NET',
-        'sql server': 'SQL Server',
-        'mysql': 'MySQL',
-        'postgresql': 'PostgreSQL',
-        'mongodb': 'MongoDB'
-    }
-    
-    for old, new in replacements.items():
+    for old, new in get_registry().text_replacements.items():
         text = text.replace(old, new)
     
     return text
 
 
-def extract_skills_keyword_matching(text: str, relevant_skills: List[str]) -> List[str]:
-    """Extract skills using fuzzy keyword matching"""
-    found_skills = []
-    text_words = set(text.lower().split())
-    
-    for skill in relevant_skills:
-        skill_lower = skill.lower()
-        
-        if skill_lower in text.lower():
-            found_skills.append(skill)
-            continue
+def extract_skills_keyword_matching(
+    text: str, relevant_skills: List[str], scan: Optional[TextScan] = None
+) -> List[str]:
+    """Extract skills using exact, phrase and fuzzy keyword matching"""
+    return get_registry().matcher(relevant_skills).match(text, scan)
 
-        skill_words = skill_lower.split()
+
+def split_text_for_spacy(text: str, chunk_chars: int = SPACY_CHUNK_CHARS, max_chars: int = SPACY_MAX_CHARS) -> List[str]:
+    """Split text into chunks of at most chunk_chars, preferring paragraph and sentence breaks"""
+    text = text[:max_chars]
+    chunks = []
+    start = 0
+    
+    while start < len(text):
+        end = start + chunk_chars
+        if end < len(text):
+            for separator in ("\n\n", "\n", ". ", " "):
+                split_at = text.rfind(separator, start + chunk_chars // 2, end)
+                if split_at != -1:
+                    end = split_at + len(separator)
+                    break
         
-        if len(skill_words) == 1:
-            
-            matches = process.extractOne(skill_lower, text_words, scorer=fuzz.ratio)
-            if matches and matches[1] > 85:  
-                found_skills.append(skill)
-        else:
-           
-            if all(word in text_words for word in skill_words):
-                found_skills.append(skill)
+        chunk = text[start:end]
+        if chunk.strip():
+            chunks.append(chunk)
+        start = end
     
-    return found_skills
+    return chunks
 
 
-def extract_skills_with_spacy(text: str, relevant_skills: List[str]) -> List[str]:
-    """Extract skills using spaCy NLP processing"""
+def extract_spacy_candidates(texts: List[str]) -> List[set]:
+    """Collect entity and noun phrase candidates for each text in one batched nlp.pipe run"""
+    candidates = [set() for _ in texts]
+    nlp = get_nlp()
     if not nlp:
-        return []
+        return candidates
     
-    doc = nlp(text)
-    found_skills = []
+    chunks = ((chunk, i) for i, text in enumerate(texts) for chunk in split_text_for_spacy(text))
     
-    entities = [ent.text.strip() for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE']]
+    for doc, i in nlp.pipe(chunks, as_tuples=True, batch_size=SPACY_BATCH_SIZE, n_process=SPACY_N_PROCESS):
+        candidates[i].update(ent.text.strip() for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE'])
+        candidates[i].update(chunk.text.strip() for chunk in doc.noun_chunks)
+    
+    SPACY_CANDIDATES.inc(sum(len(text_candidates) for text_candidates in candidates))
+    return candidates
 
-    noun_phrases = [chunk.text.strip() for chunk in doc.noun_chunks]
 
-    candidates = set(entities + noun_phrases)
+def extract_skills_with_spacy(text: str, relevant_skills: List[str], candidates: Optional[set] = None) -> List[str]:
+    """Extract skills using spaCy NLP processing"""
+    if not get_nlp():
+        return []
     
-    for candidate in candidates:
-        matches = process.extractOne(candidate.lower(), [skill.lower() for skill in relevant_skills])
-        if matches and matches[1] > 80:
-            
-            for skill in relevant_skills:
-                if skill.lower() == matches[0]:
-                    found_skills.append(skill)
-                    break
+    if candidates is None:
+        candidates = extract_spacy_candidates([text])[0]
     
-    return found_skills
+    matcher = get_registry().matcher(relevant_skills)
+    return matcher.best_matches(list(candidates), threshold=80)
 
 
-def extract_skills_pattern_matching(text: str) -> List[str]:
+def extract_skills_pattern_matching(text: str, scan: Optional[TextScan] = None) -> List[str]:
     """Extract skills using pattern matching for technical terms"""
-    found_skills = []
-    
-    patterns = {
-        'Programming Languages': [
-            r'\b(python|java|javascript|typescript|c\+\+|c#|go|rust|swift|kotlin|php|ruby|scala|r\b)\b',
-            r'\b(html|css|sql|nosql|xml|json|yaml)\b'
-        ],
-        'Frameworks and Libraries': [
-            r'\b(react|angular|vue\.?js|node\.?js|express|django|flask|spring|laravel)\b',
-            r'\b(tensorflow|pytorch|keras|scikit-learn|pandas|numpy|opencv)\b'
-        ],
-        'Tools and Platforms': [
-            r'\b(git|github|gitlab|docker|kubernetes|aws|azure|gcp|jenkins)\b',
-            r'\b(matlab|autocad|solidworks|tableau|power\s?bi)\b'
-        ],
-        'Databases': [
-            r'\b(mysql|postgresql|mongodb|redis|elasticsearch|oracle|sql\s?server)\b'
-        ],
-        'Concepts': [
-            r'\b(machine\s?learning|deep\s?learning|neural\s?networks|api|microservices)\b',
-            r'\b(devops|agile|scrum|ci/cd|version\s?control)\b'
-        ]
-    }
-    
-    for category, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            matches = re.findall(pattern, text.lower())
-            for match in matches:
-                
-                skill = match.replace('_', ' ').title()
-                if skill not in found_skills:
-                    found_skills.append(skill)
-    
-    return found_skills
+    matcher = get_registry().matcher()
+    return matcher.match_patterns(scan or matcher.scan(text))
 
 
 def extract_skills_context_based(text: str, relevant_skills: List[str]) -> List[str]:
     """Extract skills based on context indicators"""
-    found_skills = []
-    
-    context_patterns = [
-        r'(?:learn|study|course|subject|module|lab|practical|theory|programming|development|design|analysis|using|with|in)\s+([A-Za-z\+\#\.]+)',
-        r'([A-Za-z\+\#\.]+)\s+(?:programming|language|framework|library|tool|software|platform|database|system)',
-        r'(?:introduction to|fundamentals of|advanced|basic)\s+([A-Za-z\+\#\.]+)',
-        r'([A-Za-z\+\#\.]+)\s+(?:concepts|principles|methodology|techniques|algorithms)'
-    ]
+    registry = get_registry()
+    matcher = registry.matcher(relevant_skills)
     
-    for pattern in context_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            
-            skill_candidate = match.strip().title()
-            
-            closest_match = process.extractOne(skill_candidate.lower(), [skill.lower() for skill in relevant_skills])
-            if closest_match and closest_match[1] > 75:
-                
-                for skill in relevant_skills:
-                    if skill.lower() == closest_match[0] and skill not in found_skills:
-                        found_skills.append(skill)
-                        break
+    skill_candidates = []
+    for pattern in registry.context_patterns:
+        skill_candidates.extend(match.strip() for match in pattern.findall(text))
     
-    return found_skills
+    return list(dict.fromkeys(matcher.best_matches(skill_candidates, threshold=75)))
 
 
-def rank_and_filter_skills(extracted_skills: List[str], relevant_skills: List[str], text: str) -> List[str]:
+def rank_and_filter_skills(
+    extracted_skills: List[str], relevant_skills: List[str], text: str, scan: Optional[TextScan] = None
+) -> List[str]:
     """Rank and filter extracted skills based on relevance and frequency"""
     if not extracted_skills:
         return []
     
+    if scan is None:
+        scan = get_registry().matcher(relevant_skills).scan(text)
+    
     skill_scores = {}
     
     for skill in extracted_skills:
         score = 0
         skill_lower = skill.lower()
         
-        score += text.lower().count(skill_lower) * 2
+        score += scan.count(skill_lower) * 2
         
         if skill in relevant_skills:
             score += 5
@@ -417,96 +374,47 @@ def rank_and_filter_skills(extracted_skills: List[str], relevant_skills: List[st
 
 def extract_skills_basic(text: str) -> List[str]:
     """Basic keyword-based skill extraction as fallback"""
-    common_skills = [
-        "Python", "Java", "C++", "JavaScript", "SQL", "HTML", "CSS", "React", "Angular",
-        "Machine Learning", "Data Science", "Statistics", "Linear Algebra", "Calculus",
-        "Data Structures", "Algorithms", "Database Management", "Web Development",
-        "Software Engineering", "Object Oriented Programming", "Git", "Linux",
-        "Cloud Computing", "Docker", "Kubernetes", "AWS", "MongoDB", "PostgreSQL"
-    ]
-    
     found_skills = []
     text_lower = text.lower()
     
-    for skill in common_skills:
+    for skill in get_registry().common_skills:
         if skill.lower() in text_lower:
             found_skills.append(skill)
     
     return found_skills[:15]  
 
 
-def get_industry_skills(field: str) -> List[str]:
-    """Get industry-required skills for a given field"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT skill_name FROM industry_skills 
-        WHERE field = ? OR field = 'General'
-        ORDER BY importance_level DESC
-    """, (field,))
-    
-    results = cursor.fetchall()
-    conn.close()
-    
-    if results:
-        return [row[0] for row in results]
-    
-    default_skills = {
-        "Computer Science": [
-            "Python", "Java", "C++", "JavaScript", "SQL", "Data Structures", "Algorithms",
-            "Machine Learning", "Web Development", "Database Management", "Git", "Linux",
-            "Cloud Computing", "Docker", "API Development", "System Design", "DevOps",
-            "React", "Node.js", "MongoDB", "PostgreSQL", "AWS", "Kubernetes"
-        ],
-        "Engineering": [
-            "MATLAB", "AutoCAD", "SolidWorks", "Project Management", "Statistics",
-            "Linear Algebra", "Calculus", "Physics", "Python", "R", "Data Analysis",
-            "Quality Control", "Lean Manufacturing", "Six Sigma", "CAD", "FEA"
-        ],
-        "Information Technology": [
-            "Network Administration", "Cybersecurity", "Cloud Computing", "System Administration",
-            "Help Desk Support", "Database Administration", "Windows Server", "Linux Administration",
-            "Virtualization", "Backup and Recovery", "IT Support", "Network Security"
-        ],
-        "Electronics": [
-            "Circuit Design", "VLSI Design", "Embedded Systems", "Microcontrollers", "PCB Design",
-            "Signal Processing", "FPGA Programming", "Arduino", "Raspberry Pi", "Electronics Design",
-            "Digital Signal Processing", "Analog Electronics", "Power Electronics"
-        ],
-        "Artificial Intelligence and Data Science": [
-            "Python", "Machine Learning", "Deep Learning", "Data Science", "Statistics", "R",
-            "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "SQL", "Data Visualization",
-            "Natural Language Processing", "Computer Vision", "Big Data", "Apache Spark", "Hadoop",
-            "Tableau", "Power BI", "Statistical Analysis", "Neural Networks"
-        ],
-        "Artificial Intelligence and Machine Learning": [
-            "Python", "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch",
-            "Scikit-learn", "Computer Vision", "Natural Language Processing", "Reinforcement Learning",
-            "Statistics", "Linear Algebra", "Calculus", "Data Preprocessing", "Model Evaluation",
-            "Feature Engineering", "Hyperparameter Tuning", "MLOps", "AI Ethics", "Keras", "OpenCV"
-        ]
-    }
-    
-    return default_skills.get(field, default_skills["Computer Science"])
+def get_industry_skills(field: str, force_check: bool = False) -> IndustrySkills:
+    """Industry-required skills of a field, from the in-process catalog snapshot"""
+    snapshot = industry_skills_cache.get(get_connection(), field, force_check)
+    if snapshot:
+        return snapshot
+    return default_industry_skills(get_registry(), field, snapshot.revision)
 
 
-def compare_skills(covered_skills: List[str], industry_skills: List[str]) -> Dict[str, Any]:
-    """Compare covered skills with industry requirements"""
-    covered_set = set(skill.lower() for skill in covered_skills)
-    industry_set = set(skill.lower() for skill in industry_skills)
-    
-    
-    missing_lower = industry_set - covered_set
-    missing_skills = [skill for skill in industry_skills if skill.lower() in missing_lower]
+@lru_cache(maxsize=64)
+def default_industry_skills(registry: SkillRegistry, field: str, revision: int) -> IndustrySkills:
+    """Registry fallback for fields that have no skills in the industry_skills table"""
+    skills = registry.default_industry_skills_for_field(field)
+    return IndustrySkills(field, ((skill, DEFAULT_IMPORTANCE, None) for skill in skills), revision)
+
+
+def get_industry_skills_by_field(fields: List[str], force_check: bool = False) -> Dict[str, IndustrySkills]:
+    """Industry skills for several fields, looked up once per distinct field"""
+    return {field: get_industry_skills(field, force_check) for field in dict.fromkeys(fields)}
+
+
+def compare_skills(covered_skills: List[str], industry: IndustrySkills) -> Dict[str, Any]:
+    """Compare covered skills with industry requirements, plainly and weighted by importance"""
+    covered_set = frozenset(skill.lower() for skill in covered_skills)
     
-    if industry_skills:
-        coverage_percentage = len(covered_set.intersection(industry_set)) / len(industry_set) * 100
+    if industry.skill_set:
+        coverage_percentage = len(industry.skill_set & covered_set) / len(industry.skill_set) * 100
     else:
         coverage_percentage = 0
     
     return {
-        "missing_skills": missing_skills,
+        **score_skills(covered_set, industry),
         "coverage_percentage": round(coverage_percentage, 2)
     }
 
@@ -515,42 +423,11 @@ def generate_recommendations(missing_skills: List[str]) -> List[Dict[str, str]]:
     """Generate learning recommendations for missing skills"""
     recommendations = []
     
-    learning_platforms = {
-        "Python": {
-            "title": "Python Programming Complete Course",
-            "platform": "Coursera",
-            "url": "https://coursera.org/learn/python",
-            "description": "Learn Python from basics to advanced concepts"
-        },
-        "Machine Learning": {
-            "title": "Machine Learning Specialization",
-            "platform": "Coursera",
-            "url": "https://coursera.org/specializations/machine-learning",
-            "description": "Comprehensive ML course by Andrew Ng"
-        },
-        "JavaScript": {
-            "title": "The Complete JavaScript Course",
-            "platform": "Udemy",
-            "url": "https://udemy.com/course/the-complete-javascript-course",
-            "description": "Master JavaScript with projects and real-world applications"
-        },
-        "React": {
-            "title": "React - The Complete Guide",
-            "platform": "Udemy",
-            "url": "https://udemy.com/course/react-the-complete-guide",
-            "description": "Learn React.js from scratch with hooks and modern patterns"
-        },
-        "SQL": {
-            "title": "SQL for Data Science",
-            "platform": "Coursera",
-            "url": "https://coursera.org/learn/sql-for-data-science",
-            "description": "Master SQL for data analysis and database management"
-        }
-    }
+    learning_platforms = get_registry().learning_platforms
     
     for skill in missing_skills[:10]: 
         if skill in learning_platforms:
-            recommendations.append(learning_platforms[skill])
+            recommendations.append(dict(learning_platforms[skill]))
         else:
             recommendations.append({
                 "title": f"Learn {skill}",
@@ -564,19 +441,47 @@ def generate_recommendations(missing_skills: List[str]) -> List[Dict[str, str]]:
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and worker pools on startup; NLP models load in the background"""
+    global startup_complete, catalog_watcher
+    if not shared_state_preloaded:
+        init_database()
+        populate_sample_skills()
+        load_registry_from_env()
+    analysis_pool.start()
+    job_runner.start(requeue=not shared_state_preloaded)
+    if NLP_WARM_UP:
+        start_nlp_loading()
+    if CATALOG_CHECK_INTERVAL > 0:
+        catalog_watcher = asyncio.create_task(watch_catalog())
+    startup_complete = True
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop worker pools on shutdown"""
+    if catalog_watcher:
+        catalog_watcher.cancel()
+    await job_runner.stop()
+    analysis_pool.shutdown()
+    db_pool.close_all()
+
+
+def preload_shared_state():
+    """Prepare, in a pre-fork master, everything its server workers share copy-on-write:
+    the schema, interrupted jobs, the skill registry with its matchers and the spaCy model"""
+    global shared_state_preloaded
     init_database()
     populate_sample_skills()
+    requeue_interrupted_jobs(job_queue)
+    load_registry_from_env().build_matchers()
+    get_nlp()
+    db_pool.close_all()
+    shared_state_preloaded = True
 
 
 def populate_sample_skills():
     """Populate database with sample industry skills"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    
-    cursor.execute("SELECT COUNT(*) FROM industry_skills")
-    count = cursor.fetchone()[0]
+    count = get_connection().execute("SELECT COUNT(*) FROM industry_skills").fetchone()[0]
     
     if count == 0:
         sample_skills = [
@@ -612,14 +517,103 @@ def populate_sample_skills():
             ("Data Science", "Tableau", "Visualization", 8, "Industry Survey"),
         ]
         
-        cursor.executemany(
-            "INSERT INTO industry_skills (field, skill_name, category, importance_level, source) VALUES (?, ?, ?, ?, ?)",
-            sample_skills
-        )
-        
-        conn.commit()
+        with transaction() as conn:
+            conn.executemany(
+                "INSERT INTO industry_skills (field, skill_name, category, importance_level, source) VALUES (?, ?, ?, ?, ?)",
+                sample_skills
+            )
+
+
+def save_analysis(analysis: SkillAnalysis, syllabus_text: str, signature: Optional[bytes] = None):
+    """Persist a completed analysis"""
+    save_analyses([(analysis, syllabus_text)], [signature])
+
+
+def save_analyses(analyses: List[Tuple[SkillAnalysis, str]], signatures: Optional[List[Optional[bytes]]] = None):
+    """Persist completed analyses with one prepared insert in a single transaction"""
+    with transaction() as conn:
+        insert_analyses(conn, analyses, signatures=signatures)
+
+
+def save_job_result(job_id: str, analysis: SkillAnalysis, syllabus_text: str, signature: Optional[bytes] = None):
+    """Persist a queued analysis and mark its job complete atomically"""
+    with transaction() as conn:
+        insert_analyses(conn, [(analysis, syllabus_text)], signatures=[signature])
+        job_queue.complete(job_id, analysis.analysis_id, conn)
+
+
+def refresh_syllabus_index():
+    """Index the syllabi stored since the last call, storing the signatures the index had to compute"""
+    computed = syllabus_index.refresh(get_connection())
+    if computed:
+        with transaction() as conn:
+            insert_signatures(conn, computed)
+
+
+def find_near_duplicate(field: str, signature: bytes) -> Optional[Dict[str, Any]]:
+    """Most similar stored syllabus of a field above NEAR_DUPLICATE_THRESHOLD, with its covered skills"""
+    refresh_syllabus_index()
+    matches = syllabus_index.query(
+        np.frombuffer(signature, dtype=np.uint32), field, limit=1, min_similarity=NEAR_DUPLICATE_THRESHOLD
+    )
+    if not matches:
+        return None
+    stored = load_analysis(get_connection(), matches[0]["analysis_id"])
+    return {**matches[0], "covered_skills": stored["covered_skills"]} if stored else None
+
+
+def similar_syllabi(
+    analysis_id: str, field: Optional[str], limit: int, min_similarity: float
+) -> Optional[List[Dict[str, Any]]]:
+    """Stored syllabi most similar to an analysis' syllabus, or None when the analysis does not exist"""
+    refresh_syllabus_index()
+    signature = syllabus_index.signature(analysis_id)
+    if signature is None:
+        # Stored but not indexed: its syllabus has no words to compare
+        exists = get_connection().execute("SELECT 1 FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        return [] if exists else None
+    return syllabus_index.query(signature, field, limit, min_similarity, exclude=analysis_id)
+
+
+def fetch_analysis(analysis_id: str) -> Optional[SkillAnalysis]:
+    """Load a stored analysis by ID.
+
+    Category coverage is not stored; it is derived from the current catalog
+    when the analysis is up to date with it, as is the weighted coverage of
+    analyses stored before migration 10 or imported without one.
+    """
+    stored = load_analysis(get_connection(), analysis_id)
+    if not stored:
+        return None
     
-    conn.close()
+    industry = get_industry_skills(stored["field"])
+    if stored["catalog_revision"] == industry.revision:
+        scores = score_skills(stored["covered_skills"], industry)
+        stored["category_coverage"] = scores["category_coverage"]
+        if stored["weighted_coverage_percentage"] is None:
+            stored["weighted_coverage_percentage"] = scores["weighted_coverage_percentage"]
+    return SkillAnalysis(**stored)
+
+
+def fetch_analyses_missing_skill(skill: str, limit: int) -> List[tuple]:
+    """Load summary rows of the most recent analyses that lack a skill"""
+    return analyses_missing_skill(get_connection(), skill, limit)
+
+
+def with_connection(fn: Callable, *args) -> Any:
+    """Call fn(conn, *args) with the calling thread's connection, e.g. from run_db"""
+    return fn(get_connection(), *args)
+
+
+def analysis_summary(row: tuple) -> Dict[str, Any]:
+    """Listing entry for a (id, university, field, coverage, created_at) row"""
+    return {
+        "analysis_id": row[0],
+        "university": row[1],
+        "field": row[2],
+        "coverage_percentage": row[3],
+        "created_at": row[4]
+    }
 
 
 @app.get("/")
@@ -630,8 +624,284 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    """Liveness probe: answered on the event loop alone, so it stays fast while the worker pools are saturated"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "workers": analysis_pool.stats()
+    }
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record request latency per route and optionally report stage timings in Server-Timing"""
+    timings = start_request_timings()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            elapsed, method=request.method, route=route.path if route else "unmatched", status=str(status)
+        )
+    
+    if SERVER_TIMING and timings:
+        response.headers["Server-Timing"] = server_timing_header(timings + [("total", elapsed)])
+    return response
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Counters and latency histograms of this process in Prometheus text format, labelled with its pid"""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until startup finished and the NLP model is warmed up"""
+    nlp_ready = not NLP_WARM_UP or (nlp_loading is not None and nlp_loading.done())
+    ready = startup_complete and nlp_ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "nlp": nlp_status()}
+    )
+
+
+def check_pdf_upload(file: UploadFile):
+    """Reject uploads that are not PDFs"""
+    if file.content_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+
+async def read_pdf_upload(file: UploadFile) -> str:
+    """Text of an uploaded PDF, from the text cache or extracted across the CPU workers"""
+    check_pdf_upload(file)
+
+    pdf_path, pdf_key = await spool_upload(file)
+    try:
+        return await extract_pdf_text(pdf_path, pdf_key)
+    finally:
+        os.unlink(pdf_path)
+
+
+async def extract_pdf_text(pdf_path: str, pdf_key: str) -> str:
+    """Text of a spooled PDF, looked up in the text cache by content hash first"""
+    syllabus_text = await analysis_pool.run_db(text_cache.get, pdf_key)
+    CACHE_LOOKUPS.inc(cache="pdf_text", result="miss" if syllabus_text is None else "hit")
+    if syllabus_text is None:
+        with stage_timer("pdf_extraction"):
+            syllabus_text = await extract_text_parallel(pdf_path, analysis_pool.run_cpu, analysis_pool.cpu_workers)
+        await analysis_pool.run_db(text_cache.set, pdf_key, syllabus_text)
+    return syllabus_text
+
+
+async def load_nlp_and_refork():
+    """Load the spaCy model off the event loop, then restart the process workers so they inherit it"""
+    if nlp_settled():
+        # Already loaded before the process workers were forked
+        return
+    await asyncio.to_thread(get_nlp)
+    await analysis_pool.restart_cpu_workers()
+
+
+def start_nlp_loading() -> asyncio.Task:
+    """Load the spaCy model in a background thread, once; process workers are then
+    reforked so they share the loaded model instead of each loading their own"""
+    global nlp_loading
+    if nlp_loading is None:
+        nlp_loading = asyncio.create_task(load_nlp_and_refork())
+    return nlp_loading
+
+
+async def ensure_nlp_loaded():
+    """Wait until the spaCy model is loaded (or known to be missing) without blocking the event loop"""
+    await asyncio.shield(start_nlp_loading())
+
+
+async def extract_covered_skills(syllabus_text: str, field: str) -> List[str]:
+    """Skills covered by a syllabus, from the skills cache or extracted on a CPU worker"""
+    await ensure_nlp_loaded()
+    skills_key = skills_cache_key(syllabus_text, field)
+    covered_skills = await analysis_pool.run_db(skills_cache.get, skills_key)
+    CACHE_LOOKUPS.inc(cache="covered_skills", result="miss" if covered_skills is None else "hit")
+    if covered_skills is None:
+        covered_skills = await analysis_pool.run_cpu(extract_skills_with_nlp, syllabus_text, field)
+        await analysis_pool.run_db(skills_cache.set, skills_key, covered_skills)
+    return covered_skills
+
+
+async def covered_skills_of_syllabus(
+    syllabus_text: str, field: str
+) -> Tuple[List[str], Optional[NearDuplicate], Optional[bytes]]:
+    """Covered skills of a syllabus, with its near-duplicate among the stored syllabi and its signature.
+
+    Skills are always extracted from the syllabus itself: a MinHash similarity
+    of 1.0 does not mean identical texts, so a near-duplicate's skills are only
+    compared with, never copied. Identical texts are served by the skills cache.
+    """
+    async def lookup() -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+        signature = (await analysis_pool.run_cpu(syllabus_signatures, [syllabus_text]))[0]
+        if not signature:
+            return None, None
+        with stage_timer("near_duplicate_lookup"):
+            return signature, await analysis_pool.run_db(find_near_duplicate, field, signature)
+    
+    covered_skills, (signature, match) = await asyncio.gather(extract_covered_skills(syllabus_text, field), lookup())
+    if not match:
+        return covered_skills, None, signature
+    
+    previous = {skill.lower() for skill in match["covered_skills"]}
+    current = {skill.lower() for skill in covered_skills}
+    near_duplicate = NearDuplicate(
+        analysis_id=match["analysis_id"],
+        similarity=match["similarity"],
+        added_skills=[skill for skill in covered_skills if skill.lower() not in previous],
+        removed_skills=[skill for skill in match["covered_skills"] if skill.lower() not in current]
+    )
+    return covered_skills, near_duplicate, signature
+
+
+def build_analysis(
+    analysis_id: str,
+    university: str,
+    field: str,
+    covered_skills: List[str],
+    industry_skills: IndustrySkills
+) -> SkillAnalysis:
+    """Compare covered skills with industry skills and assemble the analysis result"""
+    with stage_timer("comparison"):
+        comparison = compare_skills(covered_skills, industry_skills)
+        
+        recommendations = generate_recommendations(comparison["missing_skills"])
+    
+    return SkillAnalysis(
+        analysis_id=analysis_id,
+        university=university,
+        field=field,
+        covered_skills=covered_skills,
+        missing_skills=comparison["missing_skills"],
+        skill_coverage_percentage=comparison["coverage_percentage"],
+        recommendations=recommendations,
+        weighted_coverage_percentage=comparison["weighted_coverage_percentage"],
+        category_coverage=comparison["category_coverage"],
+        catalog_revision=industry_skills.revision,
+        created_at=datetime.now().isoformat()
+    )
+
+
+async def enqueue_analysis(
+    file: Optional[UploadFile], university: str, field: str, text_content: Optional[str]
+) -> JSONResponse:
+    """Queue an analysis and answer 202 with the job to poll"""
+    if file:
+        check_pdf_upload(file)
+        JOB_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+        pdf_path, pdf_key = await spool_upload(file, directory=str(JOB_SPOOL_DIR))
+        try:
+            job_id = await analysis_pool.run_db(
+                job_queue.enqueue, university, field, None, pdf_path, pdf_key
+            )
+        except BaseException:
+            os.unlink(pdf_path)
+            raise
+    elif text_content:
+        if not text_content.strip():
+            raise HTTPException(status_code=400, detail="No text content found in the provided input")
+        job_id = await analysis_pool.run_db(job_queue.enqueue, university, field, text_content)
+    else:
+        raise HTTPException(status_code=400, detail="Either file or text_content must be provided")
+    
+    job_runner.notify()
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+    )
+
+
+async def run_analysis_job(job: Dict[str, Any], set_stage) -> None:
+    """Run a queued analysis through the same stages as /analyze, reporting each one"""
+    if job["input_path"]:
+        await set_stage("extracting")
+        syllabus_text = await extract_pdf_text(job["input_path"], job["input_hash"])
+    else:
+        syllabus_text = job["text_content"] or ""
+    
+    if not syllabus_text.strip():
+        raise HTTPException(status_code=400, detail="No text content found in the provided input")
+    
+    await set_stage("nlp")
+    covered_skills, near_duplicate, signature = await covered_skills_of_syllabus(syllabus_text, job["field"])
+    
+    await set_stage("comparing")
+    with stage_timer("industry_lookup"):
+        industry_skills = await analysis_pool.run_db(get_industry_skills, job["field"])
+    analysis = build_analysis(str(uuid.uuid4()), job["university"], job["field"], covered_skills, industry_skills)
+    analysis.near_duplicate = near_duplicate
+    
+    await set_stage("persisting")
+    with stage_timer("db_insert"):
+        await analysis_pool.run_db(save_job_result, job["id"], analysis, syllabus_text, signature)
+    ANALYSES.inc(mode="job")
+
+
+job_runner = JobRunner(
+    job_queue, run_analysis_job, analysis_pool.run_db, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL,
+    heartbeat_interval=JOB_LEASE_SECONDS / 3
+)
+
+
+def recompute_stale_batch(limit: int) -> int:
+    """Compare up to limit stale analyses again with the current industry skills, in one transaction.
+
+    The stored covered skills are reused as they are, so no text is extracted
+    again. Selecting under the write lock keeps several server processes from
+    recomputing the same analyses.
+    """
+    with transaction() as conn:
+        analysis_ids = stale_analyses(conn, limit)
+        if not analysis_ids:
+            return 0
+        
+        stored = load_analyses(conn, analysis_ids)
+        # Under the write lock the snapshots must match the catalog exactly, so skip the check interval
+        industry_by_field = get_industry_skills_by_field(
+            [analysis["field"] for analysis in stored.values()], force_check=True
+        )
+        updates = [
+            (analysis, build_analysis(
+                analysis["analysis_id"], analysis["university"], analysis["field"], analysis["covered_skills"],
+                industry_by_field[analysis["field"]]
+            ))
+            for analysis in stored.values()
+        ]
+        replace_comparisons(conn, updates)
+    return len(updates)
+
+
+async def recompute_stale_analyses() -> int:
+    """Recompute stale analyses batch by batch until none is left"""
+    recomputed = 0
+    async with recompute_lock:
+        while True:
+            count = await analysis_pool.run_db(recompute_stale_batch, CATALOG_RECOMPUTE_BATCH)
+            if not count:
+                return recomputed
+            recomputed += count
+
+
+async def watch_catalog():
+    """Periodically bring analyses up to date with changes to the industry_skills table"""
+    while True:
+        try:
+            recomputed = await recompute_stale_analyses()
+            if recomputed:
+                print(f"Recomputed {recomputed} analyses against the updated industry skill catalog")
+        except Exception as e:
+            print(f"Recomputing stale analyses failed: {e}")
+        await asyncio.sleep(CATALOG_CHECK_INTERVAL)
 
 
 @app.post("/analyze", response_model=SkillAnalysis)
@@ -639,74 +909,190 @@ async def analyze_syllabus(
     file: UploadFile = File(None),
     university: str = Form(...),
     field: str = Form(...),
-    text_content: str = Form(None)
+    text_content: str = Form(None),
+    async_mode: bool = Query(False, alias="async")
 ):
     """
     Analyze uploaded syllabus or text content for skill gaps
+
+    When a stored syllabus of the same field is a near-duplicate, the result
+    names it in near_duplicate with the covered skills added and removed
+    since.
+    With ?async=true the analysis is queued instead and the response is a job
+    ID to poll at /jobs/{job_id}.
     """
-    try:
-        analysis_id = str(uuid.uuid4())
-        
-        if file:
-            if file.content_type != "application/pdf":
-                raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    if async_mode:
+        return await enqueue_analysis(file, university, field, text_content)
+    
+    async with analysis_pool.admit():
+        try:
+            analysis_id = str(uuid.uuid4())
             
-            file_content = await file.read()
-            syllabus_text = extract_text_from_pdf(file_content)
-        elif text_content:
-            syllabus_text = text_content
-        else:
-            raise HTTPException(status_code=400, detail="Either file or text_content must be provided")
-        
-        if not syllabus_text.strip():
-            raise HTTPException(status_code=400, detail="No text content found in the provided input")
-        
-        covered_skills = extract_skills_with_nlp(syllabus_text, field)
-        
-        industry_skills = get_industry_skills(field)
+            if file:
+                syllabus_text = await read_pdf_upload(file)
+            elif text_content:
+                syllabus_text = text_content
+            else:
+                raise HTTPException(status_code=400, detail="Either file or text_content must be provided")
+            
+            if not syllabus_text.strip():
+                raise HTTPException(status_code=400, detail="No text content found in the provided input")
+            
+            covered_skills, near_duplicate, signature = await covered_skills_of_syllabus(syllabus_text, field)
+            
+            with stage_timer("industry_lookup"):
+                industry_skills = await analysis_pool.run_db(get_industry_skills, field)
+            
+            analysis = build_analysis(analysis_id, university, field, covered_skills, industry_skills)
+            analysis.near_duplicate = near_duplicate
+            
+            with stage_timer("db_insert"):
+                await analysis_pool.run_db(save_analysis, analysis, syllabus_text, signature)
+            ANALYSES.inc(mode="sync")
+            
+            return analysis
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+async def load_batch_item(raw_item: Any, uploads: Dict[str, UploadFile]) -> Tuple[BatchItem, str]:
+    """Validate one batch item and return it with its syllabus text"""
+    if not isinstance(raw_item, dict):
+        raise HTTPException(status_code=422, detail="Each item must be an object")
+    try:
+        item = BatchItem(**raw_item)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if item.file:
+        if item.file not in uploads:
+            raise HTTPException(status_code=400, detail=f"No uploaded file named '{item.file}'")
+        syllabus_text = await read_pdf_upload(uploads[item.file])
+    elif item.text_content:
+        syllabus_text = item.text_content
+    else:
+        raise HTTPException(status_code=400, detail="Either file or text_content must be provided")
+
+    if not syllabus_text.strip():
+        raise HTTPException(status_code=400, detail="No text content found in the provided input")
+
+    return item, syllabus_text
+
+
+def batch_error(index: int, error: BaseException) -> BatchItemResult:
+    """Per-item error entry with the status code /analyze would have answered"""
+    if isinstance(error, HTTPException):
+        return BatchItemResult(index=index, status="error", status_code=error.status_code, error=str(error.detail))
+    return BatchItemResult(index=index, status="error", status_code=500, error=f"Analysis failed: {str(error)}")
+
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(
+    items: str = Form(...),
+    files: List[UploadFile] = File(None)
+):
+    """
+    Analyze many syllabi in one request.
+
+    items is a JSON list of {university, field, text_content} or
+    {university, field, file} objects, where file is the name of one of the
+    uploaded PDFs. Texts are parsed together with nlp.pipe, spread across the
+    CPU workers, and all analyses are stored with one insert; a failing item
+    is reported in its result without failing the others.
+    """
+    try:
+        raw_items = json.loads(items)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="items must be a JSON list")
+    
+    if not isinstance(raw_items, list) or not raw_items:
+        raise HTTPException(status_code=400, detail="items must be a non-empty JSON list")
+    
+    if len(raw_items) > ANALYSIS_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"A batch may contain at most {ANALYSIS_BATCH_MAX_ITEMS} items")
+    
+    uploads = {}
+    for upload in files or []:
+        if upload.filename in uploads:
+            raise HTTPException(status_code=400, detail=f"Duplicate file name '{upload.filename}'")
+        uploads[upload.filename] = upload
+    
+    async with analysis_pool.admit():
+        results: List[Optional[BatchItemResult]] = [None] * len(raw_items)
         
-        comparison = compare_skills(covered_skills, industry_skills)
+        loaded = await asyncio.gather(
+            *(load_batch_item(raw_item, uploads) for raw_item in raw_items), return_exceptions=True
+        )
+        pending = {}
+        for index, outcome in enumerate(loaded):
+            if isinstance(outcome, BaseException):
+                results[index] = batch_error(index, outcome)
+            else:
+                pending[index] = outcome
         
-        recommendations = generate_recommendations(comparison["missing_skills"])
+        await ensure_nlp_loaded()
+        skills_keys = {index: skills_cache_key(text, item.field) for index, (item, text) in pending.items()}
+        cached = await analysis_pool.run_db(skills_cache.get_many, list(skills_keys.values()))
+        covered_by_key = {key: skills for key, skills in zip(skills_keys.values(), cached) if skills is not None}
+        for skills in cached:
+            CACHE_LOOKUPS.inc(cache="covered_skills", result="miss" if skills is None else "hit")
         
-        analysis = SkillAnalysis(
-            analysis_id=analysis_id,
-            university=university,
-            field=field,
-            covered_skills=covered_skills,
-            missing_skills=comparison["missing_skills"],
-            skill_coverage_percentage=comparison["coverage_percentage"],
-            recommendations=recommendations,
-            created_at=datetime.now().isoformat()
-        )
+        to_extract = {}
+        for index, key in skills_keys.items():
+            if key not in covered_by_key:
+                item, text = pending[index]
+                to_extract.setdefault(key, (text, item.field))
         
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        if to_extract:
+            keys = list(to_extract)
+            chunk_size = math.ceil(len(keys) / analysis_pool.cpu_workers)
+            chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+            extracted = await asyncio.gather(
+                *(analysis_pool.run_cpu(extract_skills_batch, [to_extract[key] for key in chunk]) for chunk in chunks),
+                return_exceptions=True
+            )
+            
+            new_entries = {}
+            for chunk, outcome in zip(chunks, extracted):
+                for position, key in enumerate(chunk):
+                    if isinstance(outcome, BaseException):
+                        covered_by_key[key] = outcome
+                    else:
+                        covered_by_key[key] = new_entries[key] = outcome[position]
+            await analysis_pool.run_db(skills_cache.set_many, new_entries)
         
-        cursor.execute("""
-            INSERT INTO analyses 
-            (id, university, field, covered_skills, missing_skills, skill_coverage_percentage, recommendations, syllabus_text)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            analysis_id,
-            university,
-            field,
-            json.dumps(covered_skills),
-            json.dumps(comparison["missing_skills"]),
-            comparison["coverage_percentage"],
-            json.dumps(recommendations),
-            syllabus_text[:5000]  
-        ))
+        with stage_timer("industry_lookup"):
+            industry_by_field = await analysis_pool.run_db(
+                get_industry_skills_by_field, [item.field for item, _ in pending.values()]
+            )
         
-        conn.commit()
-        conn.close()
+        to_save = []
+        for index, (item, text) in pending.items():
+            covered_skills = covered_by_key[skills_keys[index]]
+            if isinstance(covered_skills, BaseException):
+                results[index] = batch_error(index, covered_skills)
+                continue
+            
+            analysis = build_analysis(
+                str(uuid.uuid4()), item.university, item.field, covered_skills, industry_by_field[item.field]
+            )
+            to_save.append((analysis, text))
+            results[index] = BatchItemResult(index=index, status="ok", analysis=analysis)
         
-        return analysis
+        if to_save:
+            try:
+                signatures = await analysis_pool.run_cpu(syllabus_signatures, [text for _, text in to_save])
+                with stage_timer("db_insert"):
+                    await analysis_pool.run_db(save_analyses, to_save, signatures)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Saving batch failed: {str(e)}")
+            ANALYSES.inc(len(to_save), mode="batch")
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        succeeded = sum(1 for result in results if result.status == "ok")
+        return BatchAnalysisResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
 
 
 @app.get("/skills/{analysis_id}", response_model=SkillAnalysis)
@@ -715,32 +1101,12 @@ async def get_analysis(analysis_id: str):
     Retrieve a previous skill gap analysis by ID
     """
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, university, field, covered_skills, missing_skills, 
-                   skill_coverage_percentage, recommendations, created_at
-            FROM analyses 
-            WHERE id = ?
-        """, (analysis_id,))
+        analysis = await analysis_pool.run_db(fetch_analysis, analysis_id)
         
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        return SkillAnalysis(
-            analysis_id=result[0],
-            university=result[1],
-            field=result[2],
-            covered_skills=json.loads(result[3]),
-            missing_skills=json.loads(result[4]),
-            skill_coverage_percentage=result[5],
-            recommendations=json.loads(result[6]),
-            created_at=result[7]
-        )
+        return analysis
         
     except HTTPException:
         raise
@@ -748,6 +1114,232 @@ async def get_analysis(analysis_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to retrieve analysis: {str(e)}")
 
 
+@app.get("/similar/{analysis_id}")
+async def get_similar_syllabi(
+    analysis_id: str,
+    field: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(0.5, ge=0.0, le=1.0)
+):
+    """
+    Find the stored syllabi most similar to an analysis' syllabus.
+    
+    similarity estimates the Jaccard similarity of the two texts' word
+    4-grams. The lookup is a MinHash LSH index: with the default 32 bands,
+    syllabi less than about 40% similar may be missed.
+    """
+    similar = await analysis_pool.run_db(similar_syllabi, analysis_id, field, limit, min_similarity)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return {"analysis_id": analysis_id, "similar": similar}
+
+
+@app.get("/jobs")
+async def get_job_counts():
+    """Number of queued analyses per status"""
+    return {"jobs": await analysis_pool.run_db(job_queue.counts)}
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Report the stage of a queued analysis, with its result once it succeeded
+    """
+    job = await analysis_pool.run_db(job_queue.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    result = None
+    if job["status"] == "succeeded":
+        result = await analysis_pool.run_db(fetch_analysis, job["analysis_id"])
+    
+    return JobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        stage=job["stage"],
+        progress=job_progress(job),
+        analysis_id=job["analysis_id"],
+        result=result,
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"]
+    )
+
+
+@app.get("/stats/missing-skills")
+async def get_missing_skill_stats(
+    field: Optional[str] = None, university: Optional[str] = None, limit: int = Query(20, ge=1, le=500)
+):
+    """Most commonly missing skills, overall or for a field and/or university"""
+    stats = await analysis_pool.run_db(with_connection, analytics.missing_skills, field, university, limit)
+    return {"field": field, "university": university, **stats}
+
+
+@app.get("/stats/coverage-trend")
+async def get_coverage_trend(
+    university: Optional[str] = None, field: Optional[str] = None, days: int = Query(90, ge=1, le=3650)
+):
+    """Daily analysis count and average coverage over the last days, overall or for a university and/or field"""
+    since = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+    trend = await analysis_pool.run_db(with_connection, analytics.coverage_trend, since, field, university)
+    return {"field": field, "university": university, "since": since, "days": trend}
+
+
+@app.get("/stats/fields")
+async def get_field_stats():
+    """Analysis count and average coverage of every field analyzed so far"""
+    return {"fields": await analysis_pool.run_db(with_connection, analytics.field_coverage)}
+
+
+@app.get("/catalog")
+async def get_catalog_status():
+    """Industry skill catalog revision per field and the number of analyses awaiting recomputation"""
+    revisions = await analysis_pool.run_db(with_connection, field_revisions)
+    stale = await analysis_pool.run_db(with_connection, stale_counts)
+    return {"revision": max(revisions.values(), default=0), "fields": revisions, "stale_analyses": stale}
+
+
+@app.post("/catalog/recompute")
+async def recompute_catalog():
+    """Recompute every stale analysis now instead of waiting for the next periodic check"""
+    return {"recomputed": await recompute_stale_analyses()}
+
+
+def score_stored_analyses(request: CatalogScoreRequest) -> Dict[str, Any]:
+    """Weighted coverage of every stored analysis of a field against a catalog, in one sparse matrix product"""
+    if request.skills is None:
+        industry = get_industry_skills(request.field)
+    else:
+        industry = IndustrySkills(
+            request.field, ((skill.skill_name, skill.importance_level, skill.category) for skill in request.skills)
+        )
+    
+    analyses = covered_skills_by_analysis(get_connection(), request.field)
+    analysis_ids = list(analyses)
+    scores = score_matrix(covered_matrix([skills for _, skills in analyses.values()]), industry)
+    weighted = scores["weighted_coverage"]
+    
+    lowest = weighted.argsort(kind="stable")[:request.lowest]
+    return {
+        "field": request.field,
+        "analyses": len(analysis_ids),
+        "industry_skills": len(industry),
+        "average_weighted_coverage": round(float(weighted.mean()), 2) if analysis_ids else 0.0,
+        "category_coverage": {
+            category: round(float(coverage), 2)
+            for category, coverage in zip(scores["categories"], scores["category_coverage"].mean(axis=0))
+        } if analysis_ids else {},
+        "distribution": np.histogram(weighted, bins=10, range=(0, 100))[0].tolist(),
+        "lowest": [
+            {
+                "analysis_id": analysis_ids[row],
+                "university": analyses[analysis_ids[row]][0],
+                "weighted_coverage_percentage": float(weighted[row])
+            }
+            for row in lowest
+        ]
+    }
+
+
+@app.post("/catalog/score")
+async def score_catalog(request: CatalogScoreRequest):
+    """Score every stored analysis of a field against the current or a proposed catalog, weighted by importance"""
+    if request.skills is not None and not request.skills:
+        raise HTTPException(status_code=400, detail="skills must not be empty")
+    if request.lowest < 0:
+        raise HTTPException(status_code=400, detail="lowest must not be negative")
+    return await analysis_pool.run_db(score_stored_analyses, request)
+
+
+def compare_analyses(
+    field: Optional[str],
+    universities: List[str],
+    analysis_ids: List[str],
+    skills: List[str],
+    metric: str,
+    by: str,
+    limit: int,
+    pairs: int
+) -> Dict[str, Any]:
+    """Heatmap and similarities of the selected analyses, from the in-memory skill matrix"""
+    skill_matrix.refresh(get_connection())
+    rows = skill_matrix.select(field, universities, analysis_ids, limit)
+    if not skills:
+        skills = list(get_industry_skills(field).skills) if field else most_covered_skills(skill_matrix, rows, 25)
+    return {
+        "field": field,
+        **compare_rows(skill_matrix, rows, skills, metric, by, pairs, COMPARE_MATRIX_MAX_ROWS)
+    }
+
+
+@app.get("/compare")
+async def compare_curricula(
+    field: Optional[str] = None,
+    university: List[str] = Query([]),
+    analysis_id: List[str] = Query([]),
+    skill: List[str] = Query([]),
+    metric: str = Query("jaccard", pattern="^(jaccard|cosine)$"),
+    by: str = Query("analysis", pattern="^(analysis|university)$"),
+    limit: int = Query(COMPARE_MAX_ANALYSES, ge=1, le=COMPARE_MAX_ANALYSES),
+    pairs: int = Query(20, ge=0, le=1000)
+):
+    """
+    Compare the curricula of several analyses or universities.
+    
+    Select analyses by field, university (repeatable) or analysis_id
+    (repeatable); the newest limit of them are compared. Returns a coverage
+    heatmap over the requested skills (default: the field's industry skills),
+    the pairwise Jaccard or cosine similarity of their covered skills and the
+    most similar pairs. With by=university the analyses of each university
+    are pooled.
+    """
+    if not field and not analysis_id:
+        raise HTTPException(status_code=400, detail="Select analyses with field or analysis_id")
+    return await analysis_pool.run_db(
+        compare_analyses, field, university, analysis_id, skill, metric, by, limit, pairs
+    )
+
+
+@app.get("/export/{table}")
+async def export_table(table: str, format: str = Query("ndjson", pattern=f"^({'|'.join(transfer.FORMATS)})$")):
+    """Download the analyses or industry_skills table as NDJSON, CSV or Parquet, streamed in chunks"""
+    if table not in transfer.TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+    if format == "parquet" and not transfer.parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow on the server")
+
+    return StreamingResponse(
+        transfer.export_chunks(table, format),
+        media_type=transfer.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    )
+
+
+@app.post("/import/{table}")
+async def import_table(
+    table: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=f"^({'|'.join(transfer.INPUT_FORMATS)})$")
+):
+    """Load an NDJSON, JSON, CSV or Parquet file into a table.
+
+    Analyses with an existing ID are skipped; industry skills are updated by
+    field and skill name. Imported analyses are compared with the local
+    catalog again by the next recomputation.
+    """
+    if table not in transfer.TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+
+    # Starlette has already spooled the upload to a temporary file; read it in place
+    fmt = format or transfer.format_from_filename(file.filename)
+    try:
+        counts = await analysis_pool.run_db(transfer.import_stream, table, file.file, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
+    return {"table": table, **counts}
+
+
 @app.get("/fields")
 async def get_available_fields():
     """Get list of available fields for analysis"""
@@ -763,39 +1355,102 @@ async def get_available_fields():
     }
 
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters of the PDF text and extracted skills caches"""
+    return {
+        "pdf_text": text_cache.stats(),
+        "covered_skills": skills_cache.stats()
+    }
+
+
+@app.get("/registry")
+async def get_skill_registry():
+    """Get version information about the loaded skill registry"""
+    return get_registry().summary()
+
+
+@app.post("/registry/reload")
+async def reload_skill_registry(source: str = "database"):
+    """Reload the skill registry from the builtin data, the industry_skills table or SKILL_REGISTRY_FILE"""
+    try:
+        registry = await analysis_pool.run_db(reload_registry, source, os.getenv("SKILL_REGISTRY_FILE"))
+    except (ValueError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Failed to reload skill registry: {str(e)}")
+    
+    await analysis_pool.restart_cpu_workers()
+    return registry.summary()
+
+
+async def stream_analyses(limit: Optional[int], after: Optional[Tuple[str, str]], filters: Tuple):
+    """Yield matching analyses as NDJSON lines, reading one page at a time"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page_size = ANALYSES_MAX_PAGE_SIZE if remaining is None else min(remaining, ANALYSES_MAX_PAGE_SIZE)
+        rows = await analysis_pool.run_db(with_connection, list_analyses, page_size, after, *filters)
+        for row in rows:
+            yield json.dumps(analysis_summary(row)) + "\n"
+        if len(rows) < page_size:
+            return
+        after = (rows[-1][4], rows[-1][0])
+        if remaining is not None:
+            remaining -= len(rows)
+
+
 @app.get("/analyses")
-async def get_recent_analyses(limit: int = 10):
-    """Get recent analyses"""
+async def get_recent_analyses(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    university: Optional[str] = None,
+    field: Optional[str] = None,
+    min_coverage: Optional[float] = Query(None, ge=0, le=100),
+    max_coverage: Optional[float] = Query(None, ge=0, le=100),
+    output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$")
+):
+    """
+    Get analyses, newest first, one page at a time.
+    
+    Pass the next_cursor of a page as cursor to get the following page. With
+    format=ndjson every matching analysis (up to limit) is streamed, one JSON
+    object per line, instead of a single page.
+    """
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, university, field, skill_coverage_percentage, created_at
-            FROM analyses 
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        analyses = []
-        for row in results:
-            analyses.append({
-                "analysis_id": row[0],
-                "university": row[1],
-                "field": row[2],
-                "coverage_percentage": row[3],
-                "created_at": row[4]
-            })
-        
-        return {"analyses": analyses}
-        
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    filters = (university, field, min_coverage, max_coverage)
+    
+    if output_format == "ndjson":
+        return StreamingResponse(stream_analyses(limit, after, filters), media_type="application/x-ndjson")
+    
+    page_size = limit or min(10, ANALYSES_MAX_PAGE_SIZE)
+    if page_size > ANALYSES_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be at most {ANALYSES_MAX_PAGE_SIZE}; use format=ndjson to export more"
+        )
+    
+    try:
+        # One extra row tells whether another page follows
+        results = await analysis_pool.run_db(with_connection, list_analyses, page_size + 1, after, *filters)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve analyses: {str(e)}")
+    
+    page = results[:page_size]
+    return {
+        "analyses": [analysis_summary(row) for row in page],
+        "next_cursor": encode_cursor(page[-1]) if len(results) > page_size else None
+    }
+
+
+@app.get("/analyses/missing/{skill}")
+async def get_analyses_missing_skill(skill: str, limit: int = Query(50, ge=1, le=1000)):
+    """Get the most recent analyses whose field requires a skill the syllabus does not cover"""
+    results = await analysis_pool.run_db(fetch_analyses_missing_skill, skill, limit)
+    return {"skill": skill, "analyses": [analysis_summary(row) for row in results]}
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import serve
+    serve.main()
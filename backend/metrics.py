@@ -0,0 +1,239 @@
+import os
+import abc
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+# (metric name, label values, value) recorded inside a worker and replayed in the server process
+Event = Tuple[str, LabelValues, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+class Metric(abc.ABC):
+    """Base class: a named metric with fixed label names, registered on creation"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def _record(self, label_values: LabelValues, value: float):
+        """Apply one recorded value in this process"""
+
+    def _emit(self, label_values: LabelValues, value: float):
+        collector = getattr(_local, "collector", None)
+        if collector is not None:
+            collector.append((self.name, label_values, value))
+        else:
+            self._record(label_values, value)
+
+    @abc.abstractmethod
+    def render(self, const_labels: Dict[str, str]) -> List[str]:
+        """Sample lines of this metric, each carrying const_labels before its own labels"""
+
+
+class Counter(Metric):
+    """Monotonically increasing total"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        self._emit(self._label_values(labels), amount)
+
+    def _record(self, label_values: LabelValues, value: float):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def render(self, const_labels: Dict[str, str]) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        names = tuple(const_labels) + self.labelnames
+        const = tuple(const_labels.values())
+        return [f"{self.name}{_format_labels(names, const + key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets, with sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        self._emit(self._label_values(labels), value)
+
+    def _record(self, label_values: LabelValues, value: float):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self, const_labels: Dict[str, str]) -> List[str]:
+        with self._lock:
+            values = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+
+        lines = []
+        names = tuple(const_labels) + self.labelnames
+        bucket_names = names + ("le",)
+        const = tuple(const_labels.values())
+        for key, (counts, total, count) in values:
+            key = const + key
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, key + (repr(bound),))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_names, key + ('+Inf',))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(names, key)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of this process, rendered in the Prometheus text exposition format.
+
+    Values are not shared between processes: every sample carries a pid
+    label, so the series of the web workers under serve.py (each counting
+    only the requests it served) stay apart and can be summed by the
+    scraper, e.g. sum without (pid) (...).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        # Read at render time: server workers are forked after the registry is created
+        const_labels = {"pid": str(os.getpid())}
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render(const_labels))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+_local = threading.local()
+# Stage timings of the request being served, for the Server-Timing header
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+STAGE_SECONDS = Histogram(
+    "skill_gap_stage_seconds", "Time spent in each analysis stage", ["stage"]
+)
+REQUEST_SECONDS = Histogram(
+    "skill_gap_request_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+PDF_PAGES = Counter("skill_gap_pdf_pages_total", "PDF pages extracted")
+TEXT_CHARS = Counter("skill_gap_text_chars_total", "Characters of syllabus text analyzed")
+SPACY_CANDIDATES = Counter("skill_gap_spacy_candidates_total", "Entity and noun phrase candidates found by spaCy")
+CACHE_LOOKUPS = Counter("skill_gap_cache_lookups_total", "Result cache lookups", ["cache", "result"])
+ANALYSES = Counter("skill_gap_analyses_total", "Completed analyses by entry point", ["mode"])
+
+
+@contextmanager
+def collect():
+    """Buffer metrics recorded by the calling thread instead of applying them.
+
+    Used around work that runs in a worker process or thread: the returned
+    list of events is sent back with the result and applied with replay().
+    """
+    previous = getattr(_local, "collector", None)
+    events: List[Event] = []
+    _local.collector = events
+    try:
+        yield events
+    finally:
+        _local.collector = previous
+
+
+def replay(events: List[Event]):
+    """Apply events recorded by collect(), including their stage timings for Server-Timing"""
+    for name, label_values, value in events:
+        metric = REGISTRY.get(name)
+        if metric is None:
+            continue
+        metric._emit(label_values, value)
+        if metric is STAGE_SECONDS:
+            _add_request_timing(label_values[0], value)
+
+
+def _add_request_timing(stage: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block as one analysis stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if getattr(_local, "collector", None) is None:
+            _add_request_timing(stage, elapsed)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    """Start collecting stage timings for the current request"""
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: List[Tuple[str, float]]) -> str:
+    """Server-Timing header value with the total milliseconds spent per stage"""
+    totals: Dict[str, float] = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
@@ -0,0 +1,270 @@
+from typing import List, Tuple
+
+from db import ConnectionPool, pool as default_pool
+
+# (version, description, statements); applied in order, each in its own transaction.
+# Never edit a released migration: append a new one instead.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "Create analyses and industry_skills tables", [
+        """
+        CREATE TABLE IF NOT EXISTS analyses (
+            id TEXT PRIMARY KEY,
+            university TEXT NOT NULL,
+            field TEXT NOT NULL,
+            covered_skills TEXT NOT NULL,
+            missing_skills TEXT NOT NULL,
+            skill_coverage_percentage REAL NOT NULL,
+            recommendations TEXT NOT NULL,
+            syllabus_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS industry_skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            field TEXT NOT NULL,
+            skill_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            importance_level INTEGER NOT NULL,
+            source TEXT NOT NULL
+        )
+        """
+    ]),
+    (2, "Index analyses for recent and per-university listings", [
+        "CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_university_field_created_at ON analyses (university, field, created_at)"
+    ]),
+    (3, "Covering index for industry skill lookups by field", [
+        "CREATE INDEX IF NOT EXISTS idx_industry_skills_field_importance ON industry_skills (field, importance_level, skill_name)"
+    ]),
+    (4, "Create jobs table for queued analyses", [
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            university TEXT NOT NULL,
+            field TEXT NOT NULL,
+            text_content TEXT,
+            input_path TEXT,
+            input_hash TEXT,
+            analysis_id TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            updated_at TEXT NOT NULL,
+            finished_at TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs (status, created_at)"
+    ]),
+    (5, "Store analysis skills and recommendations by reference instead of JSON", [
+        """
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_skills_name_nocase ON skills (name COLLATE NOCASE)",
+        """
+        CREATE TABLE IF NOT EXISTS analysis_skills (
+            analysis_id TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (analysis_id, status, position)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill_status ON analysis_skills (skill_id, status, analysis_id)",
+        """
+        CREATE TABLE IF NOT EXISTS recommendations (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            url TEXT NOT NULL,
+            description TEXT NOT NULL,
+            UNIQUE (title, platform, url, description)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS analysis_recommendations (
+            analysis_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            recommendation_id INTEGER NOT NULL,
+            PRIMARY KEY (analysis_id, position)
+        ) WITHOUT ROWID
+        """,
+        # Backfill from the JSON columns, keeping the original list order
+        """
+        INSERT OR IGNORE INTO skills (name)
+        SELECT j.value FROM analyses a, json_each(a.covered_skills) j
+        UNION
+        SELECT j.value FROM analyses a, json_each(a.missing_skills) j
+        """,
+        """
+        INSERT INTO analysis_skills (analysis_id, status, position, skill_id)
+        SELECT a.id, 1, j.key, s.id FROM analyses a, json_each(a.covered_skills) j JOIN skills s ON s.name = j.value
+        UNION ALL
+        SELECT a.id, 0, j.key, s.id FROM analyses a, json_each(a.missing_skills) j JOIN skills s ON s.name = j.value
+        """,
+        """
+        INSERT OR IGNORE INTO recommendations (title, platform, url, description)
+        SELECT coalesce(json_extract(j.value, '$.title'), ''), coalesce(json_extract(j.value, '$.platform'), ''),
+               coalesce(json_extract(j.value, '$.url'), ''), coalesce(json_extract(j.value, '$.description'), '')
+        FROM analyses a, json_each(a.recommendations) j
+        """,
+        """
+        INSERT INTO analysis_recommendations (analysis_id, position, recommendation_id)
+        SELECT a.id, j.key, r.id
+        FROM analyses a, json_each(a.recommendations) j
+        JOIN recommendations r
+          ON r.title = coalesce(json_extract(j.value, '$.title'), '')
+         AND r.platform = coalesce(json_extract(j.value, '$.platform'), '')
+         AND r.url = coalesce(json_extract(j.value, '$.url'), '')
+         AND r.description = coalesce(json_extract(j.value, '$.description'), '')
+        """,
+        "ALTER TABLE analyses DROP COLUMN covered_skills",
+        "ALTER TABLE analyses DROP COLUMN missing_skills",
+        "ALTER TABLE analyses DROP COLUMN recommendations"
+    ]),
+    (6, "Summary tables for coverage and missing skill statistics", [
+        # '*' rows roll up every field, every university or (for day) all time
+        """
+        CREATE TABLE IF NOT EXISTS stats_coverage (
+            field TEXT NOT NULL,
+            university TEXT NOT NULL,
+            day TEXT NOT NULL,
+            analyses INTEGER NOT NULL,
+            coverage_sum REAL NOT NULL,
+            PRIMARY KEY (field, university, day)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stats_coverage_university_day ON stats_coverage (university, day, field)",
+        """
+        CREATE TABLE IF NOT EXISTS stats_missing_skills (
+            field TEXT NOT NULL,
+            university TEXT NOT NULL,
+            skill_id INTEGER NOT NULL,
+            analyses INTEGER NOT NULL,
+            PRIMARY KEY (field, university, skill_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stats_missing_skills_rank ON stats_missing_skills (field, university, analyses)",
+        """
+        WITH scopes (by_field, by_university, by_day) AS (
+            VALUES (1, 1, 1), (1, 0, 1), (0, 1, 1), (0, 0, 1), (1, 1, 0), (1, 0, 0), (0, 1, 0), (0, 0, 0)
+        )
+        INSERT INTO stats_coverage (field, university, day, analyses, coverage_sum)
+        SELECT iif(by_field, a.field, '*'), iif(by_university, a.university, '*'),
+               iif(by_day, date(a.created_at), '*'), count(*), sum(a.skill_coverage_percentage)
+        FROM analyses a, scopes
+        GROUP BY 1, 2, 3
+        """,
+        """
+        WITH scopes (by_field, by_university) AS (VALUES (1, 1), (1, 0), (0, 1), (0, 0)),
+        missing AS (SELECT DISTINCT analysis_id, skill_id FROM analysis_skills WHERE status = 0)
+        INSERT INTO stats_missing_skills (field, university, skill_id, analyses)
+        SELECT iif(by_field, a.field, '*'), iif(by_university, a.university, '*'), m.skill_id, count(*)
+        FROM missing m JOIN analyses a ON a.id = m.analysis_id, scopes
+        GROUP BY 1, 2, 3
+        """
+    ]),
+    (7, "Index analyses on (created_at, id) for keyset pagination", [
+        "DROP INDEX IF EXISTS idx_analyses_created_at",
+        "DROP INDEX IF EXISTS idx_analyses_university_field_created_at",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_created_at_id ON analyses (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_university_created_at_id ON analyses (university, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_field_created_at_id ON analyses (field, created_at, id)"
+    ]),
+    (8, "Version the industry skill catalog per field", [
+        """
+        CREATE TABLE IF NOT EXISTS catalog_versions (
+            field TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        # Every change to industry_skills, by any writer, moves its field to a new global revision
+        """
+        CREATE TRIGGER IF NOT EXISTS industry_skills_catalog_insert AFTER INSERT ON industry_skills BEGIN
+            INSERT INTO catalog_versions (field, revision)
+            VALUES (NEW.field, (SELECT coalesce(max(revision), 0) + 1 FROM catalog_versions))
+            ON CONFLICT (field) DO UPDATE SET revision = excluded.revision;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS industry_skills_catalog_update AFTER UPDATE ON industry_skills BEGIN
+            INSERT INTO catalog_versions (field, revision)
+            VALUES (OLD.field, (SELECT coalesce(max(revision), 0) + 1 FROM catalog_versions))
+            ON CONFLICT (field) DO UPDATE SET revision = excluded.revision;
+            INSERT INTO catalog_versions (field, revision)
+            VALUES (NEW.field, (SELECT coalesce(max(revision), 0) + 1 FROM catalog_versions))
+            ON CONFLICT (field) DO UPDATE SET revision = excluded.revision;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS industry_skills_catalog_delete AFTER DELETE ON industry_skills BEGIN
+            INSERT INTO catalog_versions (field, revision)
+            VALUES (OLD.field, (SELECT coalesce(max(revision), 0) + 1 FROM catalog_versions))
+            ON CONFLICT (field) DO UPDATE SET revision = excluded.revision;
+        END
+        """,
+        # Revision of the catalog an analysis was compared against; existing analyses count as current
+        "ALTER TABLE analyses ADD COLUMN catalog_revision INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_field_catalog_revision ON analyses (field, catalog_revision)"
+    ]),
+    (9, "Make (field, skill_name) the key of industry_skills", [
+        # Keep the most important entry of a skill listed twice for the same field
+        """
+        DELETE FROM industry_skills WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY field, skill_name ORDER BY importance_level DESC, id
+                ) AS rank
+                FROM industry_skills
+            ) WHERE rank = 1
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_industry_skills_field_skill_name ON industry_skills (field, skill_name)"
+    ]),
+    (10, "Store importance-weighted coverage of analyses", [
+        # Left NULL for existing analyses, whose stored comparisons stay as they are; it is derived when read
+        "ALTER TABLE analyses ADD COLUMN weighted_coverage_percentage REAL"
+    ]),
+    (11, "Store MinHash signatures of syllabi for similarity search", [
+        # Analyses stored before this migration get a signature from their stored text when first indexed
+        """
+        CREATE TABLE IF NOT EXISTS syllabus_signatures (
+            analysis_id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        ) WITHOUT ROWID
+        """
+    ])
+]
+
+
+def get_schema_version(pool: ConnectionPool = default_pool) -> int:
+    """Schema version recorded in the database file"""
+    return pool.connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(pool: ConnectionPool = default_pool) -> int:
+    """Apply every pending migration and return the resulting schema version.
+
+    Safe to call on every startup and from several processes at once: the
+    version is re-read under the write lock, so each migration runs once.
+    """
+    for version, description, statements in MIGRATIONS:
+        if get_schema_version(pool) >= version:
+            continue
+
+        with pool.transaction() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+        print(f"Applied schema migration {version}: {description}")
+
+    pool.connection().execute("PRAGMA optimize")
+    return get_schema_version(pool)
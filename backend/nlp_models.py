@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+from typing import Any, Dict, Optional
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Only entities and noun chunks are used, which need the tagger, parser and NER
+SPACY_EXCLUDE = ["lemmatizer", "textcat", "textcat_multilabel"]
+SPACY_CHUNK_CHARS = int(os.getenv("SPACY_CHUNK_CHARS", "20000"))
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {"status": "not_loaded", "nlp": None, "load_seconds": None}
+
+
+def _reset_after_fork():
+    """A fork taken mid-load must not inherit a held lock or a half-finished state"""
+    global _lock
+    _lock = threading.Lock()
+    if _state["status"] == "loading":
+        _state["status"] = "not_loaded"
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _load():
+    _state["status"] = "loading"
+    started = time.perf_counter()
+    try:
+        import spacy
+        nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+        nlp.max_length = max(nlp.max_length, SPACY_CHUNK_CHARS)
+    except (ImportError, OSError):
+        print(f"spaCy model '{SPACY_MODEL}' not found. Using basic text processing.")
+        nlp = None
+
+    _state["nlp"] = nlp
+    _state["load_seconds"] = round(time.perf_counter() - started, 3)
+    _state["status"] = "loaded" if nlp is not None else "unavailable"
+
+
+def get_nlp() -> Optional[Any]:
+    """spaCy pipeline, loaded on first use; None when the model is not installed"""
+    if _state["status"] not in ("loaded", "unavailable"):
+        with _lock:
+            if _state["status"] not in ("loaded", "unavailable"):
+                _load()
+    return _state["nlp"]
+
+
+def nlp_settled() -> bool:
+    """Whether loading has finished, successfully or not"""
+    return _state["status"] in ("loaded", "unavailable")
+
+
+def nlp_model_name() -> str:
+    """Name of the model in use, for cache keys; 'none' until it is loaded"""
+    return SPACY_MODEL if _state["status"] == "loaded" else "none"
+
+
+def nlp_status() -> Dict[str, Any]:
+    """Load state of the spaCy model"""
+    return {
+        "model": SPACY_MODEL,
+        "status": _state["status"],
+        "load_seconds": _state["load_seconds"]
+    }
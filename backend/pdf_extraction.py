@@ -0,0 +1,226 @@
+import os
+import math
+import time
+import asyncio
+import hashlib
+import tempfile
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import fitz
+from fastapi import HTTPException, UploadFile
+
+from metrics import PDF_PAGES
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(50 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "500"))
+PDF_TIME_BUDGET_SECONDS = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "60"))
+PDF_MIN_PAGES_PER_TASK = int(os.getenv("PDF_MIN_PAGES_PER_TASK", "8"))
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+async def spool_upload(
+    file: UploadFile, max_bytes: int = PDF_MAX_BYTES, directory: Optional[str] = None
+) -> Tuple[str, str]:
+    """Stream an upload to a temporary file, returning its path and SHA-256.
+
+    The upload is never held in memory as a whole; uploads larger than
+    max_bytes are rejected with 413. The file goes to the system temporary
+    directory unless another directory is given.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="syllabus-", dir=directory)
+
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                chunk = await file.read(SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"PDF exceeds the maximum upload size of {max_bytes} bytes"
+                    )
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    return path, digest.hexdigest()
+
+
+def count_pages(path: str) -> int:
+    """Number of pages of a PDF; 0 if PyMuPDF cannot open the file"""
+    try:
+        with fitz.open(path, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception as e:
+        print(f"PyMuPDF failed: {e}")
+        return 0
+
+
+def check_page_count(page_count: int, max_pages: int):
+    """Reject PDFs with more than max_pages pages with 413 rather than analyze only some of them"""
+    if page_count > max_pages:
+        raise HTTPException(
+            status_code=413,
+            detail=f"PDF has {page_count} pages; at most {max_pages} pages can be analyzed"
+        )
+
+
+def check_deadline(deadline: float):
+    """Reject a PDF with 422 once its extraction runs past the time budget, rather than analyze part of it"""
+    if time.time() > deadline:
+        raise HTTPException(
+            status_code=422,
+            detail="Extracting text from the PDF took longer than the time budget; it is too large or complex to analyze"
+        )
+
+
+def extract_page_range(path: str, start: int, stop: int, deadline: float) -> List[Tuple[int, str]]:
+    """Extract pages [start, stop) with PyMuPDF.
+
+    If PyMuPDF fails part way, the remaining pages of the range are extracted
+    with pdfplumber; 400 if that fails too.
+    """
+    pages = []
+    try:
+        with fitz.open(path, filetype="pdf") as doc:
+            for number in range(start, stop):
+                check_deadline(deadline)
+                pages.append((number, doc[number].get_text()))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"PyMuPDF failed at page {start + len(pages)}: {e}")
+        try:
+            fallback = extract_pages_with_pdfplumber(path, list(range(start + len(pages), stop)), deadline)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"pdfplumber failed: {e}")
+            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+        pages.extend(sorted(fallback.items()))
+    PDF_PAGES.inc(len(pages))
+    return pages
+
+
+def extract_pages_with_pdfplumber(path: str, page_numbers: List[int], deadline: float) -> Dict[int, str]:
+    """Extract the given pages with pdfplumber; pages without text map to an empty string"""
+    import pdfplumber
+
+    pages = {}
+    with pdfplumber.open(path) as pdf:
+        for number in page_numbers:
+            if number >= len(pdf.pages):
+                break
+            check_deadline(deadline)
+            page_text = pdf.pages[number].extract_text()
+            pages[number] = page_text + "\n" if page_text else ""
+    return pages
+
+
+def extract_all_with_pdfplumber(path: str, max_pages: int, deadline: float) -> str:
+    """Whole-document pdfplumber extraction used when PyMuPDF cannot open the file"""
+    import pdfplumber
+
+    try:
+        with pdfplumber.open(path) as pdf:
+            page_count = len(pdf.pages)
+    except Exception as e:
+        print(f"pdfplumber failed: {e}")
+        raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+    check_page_count(page_count, max_pages)
+    PDF_PAGES.inc(page_count)
+    return join_pages(extract_pages_with_pdfplumber(path, list(range(page_count)), deadline))
+
+
+def page_ranges(page_count: int, parallelism: int, min_pages_per_task: int = PDF_MIN_PAGES_PER_TASK) -> List[Tuple[int, int]]:
+    """Split pages into contiguous ranges, one per worker but never smaller than min_pages_per_task"""
+    if page_count <= 0:
+        return []
+    per_task = max(min_pages_per_task, math.ceil(page_count / max(parallelism, 1)))
+    return [(start, min(start + per_task, page_count)) for start in range(0, page_count, per_task)]
+
+
+def join_pages(pages: Dict[int, str]) -> str:
+    """Concatenate page texts in page order"""
+    return "".join(pages[number] for number in sorted(pages))
+
+
+def extract_text_from_pdf_file(
+    path: str,
+    max_pages: int = PDF_MAX_PAGES,
+    time_budget: float = PDF_TIME_BUDGET_SECONDS
+) -> str:
+    """Sequential page-wise extraction of a PDF on disk, with per-page pdfplumber fallback"""
+    deadline = time.time() + time_budget
+    page_count = count_pages(path)
+    if page_count == 0:
+        return extract_all_with_pdfplumber(path, max_pages, deadline)
+    check_page_count(page_count, max_pages)
+
+    pages = dict(extract_page_range(path, 0, page_count, deadline))
+    empty_pages = [number for number, text in sorted(pages.items()) if not text.strip()]
+    if empty_pages:
+        pages.update(_pdfplumber_fallback(path, empty_pages, deadline))
+    return join_pages(pages)
+
+
+def _pdfplumber_fallback(path: str, page_numbers: List[int], deadline: float) -> Dict[int, str]:
+    try:
+        return extract_pages_with_pdfplumber(path, page_numbers, deadline)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"pdfplumber failed: {e}")
+        return {}
+
+
+async def extract_text_parallel(
+    path: str,
+    run_cpu: Callable[..., Awaitable],
+    parallelism: int,
+    max_pages: int = PDF_MAX_PAGES,
+    time_budget: float = PDF_TIME_BUDGET_SECONDS
+) -> str:
+    """Extract a spooled PDF with page ranges spread across CPU workers.
+
+    PDFs of more than max_pages pages are rejected with 413, and with 422 when
+    extraction runs past the time budget, so a syllabus is never analyzed
+    from part of its text. Pages PyMuPDF returns no text for are retried with
+    pdfplumber, as are the pages of a range after PyMuPDF fails on it, and
+    the page texts are joined once at the end.
+    """
+    deadline = time.time() + time_budget
+    page_count = await run_cpu(count_pages, path)
+    if page_count == 0:
+        return await run_cpu(extract_all_with_pdfplumber, path, max_pages, deadline)
+    check_page_count(page_count, max_pages)
+
+    results = await asyncio.gather(*(
+        run_cpu(extract_page_range, path, start, stop, deadline)
+        for start, stop in page_ranges(page_count, parallelism)
+    ))
+    pages = {number: text for result in results for number, text in result}
+
+    empty_pages = [number for number, text in sorted(pages.items()) if not text.strip()]
+    if empty_pages:
+        pages.update(await run_cpu(_pdfplumber_fallback, path, empty_pages, deadline))
+
+    return join_pages(pages)
+
+
+def extract_text_from_pdf_bytes(file_content: bytes, max_pages: int = PDF_MAX_PAGES) -> str:
+    """Extract text from an in-memory PDF by spooling it to a temporary file"""
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="syllabus-")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            spool.write(file_content)
+        return extract_text_from_pdf_file(path, max_pages)
+    finally:
+        os.unlink(path)
@@ -0,0 +1,148 @@
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from catalog import IndustrySkills
+
+
+class SkillIndex:
+    """Append-only mapping of lowercase skill names to matrix columns, shared by every field"""
+
+    def __init__(self):
+        self._columns: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def get(self, name: str) -> Optional[int]:
+        return self._columns.get(name.lower())
+
+    def name(self, column: int) -> str:
+        """Spelling of a column's skill as first seen"""
+        return self._names[column]
+
+    def column(self, name: str) -> int:
+        """Column of a skill, adding it to the index when it is new"""
+        key = name.lower()
+        column = self._columns.get(key)
+        if column is None:
+            with self._lock:
+                column = self._columns.get(key)
+                if column is None:
+                    column = self._columns[key] = len(self._names)
+                    self._names.append(name)
+        return column
+
+    def columns(self, names: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.column(name) for name in names), dtype=np.int64)
+
+
+skill_index = SkillIndex()
+
+
+class CatalogVector:
+    """A field's industry skills as importance weights over the skill index, with their categories.
+
+    columns, weights and category_ids follow the order of the IndustrySkills
+    snapshot they are built from; category_weights sums the weights per
+    category.
+    """
+
+    __slots__ = ("columns", "weights", "categories", "category_ids", "total_weight", "category_weights")
+
+    def __init__(self, industry: IndustrySkills, index: SkillIndex = skill_index):
+        self.categories = tuple(dict.fromkeys(industry.categories))
+        category_id = {category: position for position, category in enumerate(self.categories)}
+
+        self.columns = index.columns(industry.skills)
+        self.weights = np.fromiter(
+            (industry.weights[key] for key in industry.keys), dtype=np.float64, count=len(industry)
+        )
+        self.category_ids = np.fromiter(
+            (category_id[category] for category in industry.categories), dtype=np.int64, count=len(industry)
+        )
+        self.total_weight = float(self.weights.sum())
+        self.category_weights = np.bincount(self.category_ids, weights=self.weights, minlength=len(self.categories))
+
+    def category_matrix(self, columns: int) -> sparse.csr_matrix:
+        """(columns x categories) matrix holding each catalog skill's weight in its category's column"""
+        return sparse.csr_matrix(
+            (self.weights, (self.columns, self.category_ids)), shape=(columns, len(self.categories))
+        )
+
+
+@lru_cache(maxsize=128)
+def catalog_vector(industry: IndustrySkills) -> CatalogVector:
+    """Vector of an industry skills snapshot, built once per snapshot"""
+    return CatalogVector(industry)
+
+
+def _percentages(covered: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """covered / total as percentages rounded to 2 decimals, 0 where total is 0"""
+    covered = np.asarray(covered, dtype=np.float64) * 100
+    return np.round(np.divide(covered, total, out=np.zeros_like(covered), where=total > 0), 2)
+
+
+def score_skills(covered_skills: Iterable[str], industry: IndustrySkills) -> Dict[str, Any]:
+    """Importance-weighted comparison of one analysis' covered skills with a field's industry skills.
+
+    Returns the missing skills ranked by importance, the weighted coverage
+    percentage and the weighted coverage of each skill category.
+    """
+    vector = catalog_vector(industry)
+    covered_set = frozenset(skill.lower() for skill in covered_skills)
+    covered = np.fromiter((key in covered_set for key in industry.keys), dtype=bool, count=len(industry))
+
+    covered_weights = np.where(covered, vector.weights, 0.0)
+    category_covered = np.bincount(vector.category_ids, weights=covered_weights, minlength=len(vector.categories))
+    missing = np.flatnonzero(~covered)
+    ranked = missing[np.argsort(-vector.weights[missing], kind="stable")]
+
+    return {
+        "missing_skills": [industry.skills[position] for position in ranked],
+        "weighted_coverage_percentage": float(
+            _percentages(np.array([covered_weights.sum()]), np.array([vector.total_weight]))[0]
+        ),
+        "category_coverage": dict(zip(
+            vector.categories, _percentages(category_covered, vector.category_weights).tolist()
+        ))
+    }
+
+
+def covered_matrix(covered_lists: Sequence[Iterable[str]], index: SkillIndex = skill_index) -> sparse.csr_matrix:
+    """Binary (analyses x skill index) matrix of the skills each analysis covers"""
+    indptr = [0]
+    indices: List[int] = []
+    for skills in covered_lists:
+        columns = sorted({index.column(skill) for skill in skills})
+        indices.extend(columns)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(covered_lists), len(index))
+    )
+
+
+def score_matrix(matrix: sparse.csr_matrix, industry: IndustrySkills) -> Dict[str, Any]:
+    """Weighted coverage of every row of a covered_matrix against one catalog, in one sparse product.
+
+    Returns weighted_coverage (one percentage per row) and category_coverage
+    ((rows x categories) percentages, columns named by categories).
+    """
+    vector = catalog_vector(industry)
+    columns = max(matrix.shape[1], len(skill_index))
+    if matrix.shape[1] < columns:
+        # Skills indexed after the matrix was built are not covered by any of its rows
+        matrix = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], columns))
+
+    covered = (matrix @ vector.category_matrix(columns)).toarray()
+    return {
+        "weighted_coverage": _percentages(covered.sum(axis=1), np.full(matrix.shape[0], vector.total_weight)),
+        "categories": vector.categories,
+        "category_coverage": _percentages(covered, np.broadcast_to(vector.category_weights, covered.shape))
+    }
@@ -0,0 +1,182 @@
+"""Pre-fork server: load shared state once, then fork uvicorn workers on one socket.
+
+    python serve.py [--host 0.0.0.0] [--port 8000] [--workers N]
+
+The master process applies migrations and loads the skill registry (with
+every field's matcher) and the spaCy model before forking, so workers share
+those pages copy-on-write instead of each loading its own copy. The master
+then only supervises: it restarts workers that die, forwards SIGINT/SIGTERM,
+and on SIGHUP reloads the registry and replaces the workers one at a time.
+"""
+import os
+import gc
+import sys
+import time
+import signal
+import socket
+import argparse
+from typing import Dict, Optional
+
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+BACKLOG = int(os.getenv("WEB_BACKLOG", "2048"))
+
+
+def memory_usage(pid: int) -> Optional[Dict[str, float]]:
+    """RSS, PSS and private memory of a process in MB, from /proc (Linux only)"""
+    fields = {"Rss": "rss", "Pss": "pss", "Private_Clean": "private", "Private_Dirty": "private"}
+    usage = {"rss": 0.0, "pss": 0.0, "private": 0.0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            for line in rollup:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    usage[fields[name]] += int(value.split()[0]) / 1024
+    except OSError:
+        return None
+    return {name: round(value, 1) for name, value in usage.items()}
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Master process that forks and supervises uvicorn workers sharing one listening socket"""
+
+    def __init__(self, host: str, port: int, workers: int):
+        self.host = host
+        self.port = port
+        self.workers = max(workers, 1)
+        self.children: Dict[int, int] = {}
+        self.stopping = False
+        self.reload_requested = False
+        self.sock: Optional[socket.socket] = None
+
+    def preload(self):
+        import main
+
+        started = time.perf_counter()
+        main.preload_shared_state()
+        print(f"Preloaded shared state in {time.perf_counter() - started:.2f}s")
+        usage = memory_usage(os.getpid())
+        if usage:
+            print(f"Master memory: {usage['rss']} MB RSS")
+        # Keep the preloaded objects out of future collections so the cyclic GC
+        # does not write to (and unshare) their pages in every worker
+        gc.freeze()
+
+    def spawn(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            self.run_worker()
+            os._exit(0)
+        self.children[pid] = slot
+
+    def run_worker(self):
+        import uvicorn
+        import main
+
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        config = uvicorn.Config(main.app, log_level=os.getenv("LOG_LEVEL", "info"))
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def report_memory(self):
+        for pid in sorted(self.children):
+            usage = memory_usage(pid)
+            if usage:
+                print(
+                    f"Worker {pid}: {usage['rss']} MB RSS, {usage['pss']} MB PSS, "
+                    f"{usage['private']} MB private"
+                )
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def handle_reload(self, signum, frame):
+        self.reload_requested = True
+
+    def reload(self):
+        """Reload the registry in the master, then replace workers one at a time"""
+        import main
+
+        self.reload_requested = False
+        try:
+            gc.unfreeze()
+            main.load_registry_from_env().build_matchers()
+            main.db_pool.close_all()
+            gc.freeze()
+        except (ValueError, OSError) as e:
+            print(f"Registry reload failed, keeping current workers: {e}")
+            return
+
+        for pid, slot in list(self.children.items()):
+            if self.stopping:
+                return
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+            del self.children[pid]
+            self.spawn(slot)
+        print("Reloaded the skill registry in all workers")
+
+    def run(self):
+        self.preload()
+        self.sock = bind_socket(self.host, self.port)
+        print(f"Listening on {self.host}:{self.port} with {self.workers} worker(s)")
+
+        for slot in range(self.workers):
+            self.spawn(slot)
+
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+
+        time.sleep(2)
+        self.report_memory()
+
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload()
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid and pid in self.children:
+                slot = self.children.pop(pid)
+                if not self.stopping:
+                    print(f"Worker {pid} exited with status {status}, restarting")
+                    self.spawn(slot)
+                continue
+            time.sleep(0.5)
+
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+        for pid in list(self.children):
+            os.waitpid(pid, 0)
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked workers sharing loaded models")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_WORKERS)
+    args = parser.parse_args()
+
+    if args.workers > 1 and "ANALYSIS_WORKERS" not in os.environ:
+        # Split the cores between the server workers' analysis pools
+        os.environ["ANALYSIS_WORKERS"] = str(max(1, (os.cpu_count() or 1) // args.workers))
+
+    PreforkServer(args.host, args.port, args.workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+import string
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import Levenshtein
+import numpy as np
+from fuzzywuzzy import fuzz, utils
+from rapidfuzz import fuzz as batch_fuzz, process as batch_process
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+PatternTerms = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def indel_distance(s1: str, s2: str) -> int:
+    """Insert/delete edit distance, the metric behind fuzz.ratio"""
+    return Levenshtein.distance(s1, s2, weights=(1, 1, 2))
+
+
+def max_indel_distance(length: int, threshold: int) -> int:
+    """Largest indel distance that can still score above threshold for strings of total length"""
+    return int((100 - threshold) / 100 * length) + 1
+
+
+class BKTree:
+    """Burkhard-Keller tree over indel distance for bounded fuzzy lookups"""
+
+    def __init__(self, words: Sequence[str] = ()):
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        """Insert a word, ignoring duplicates"""
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+
+        node = self.root
+        while True:
+            distance = indel_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """Return (word, distance) for every indexed word within max_distance"""
+        if self.root is None:
+            return []
+
+        results = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = indel_distance(word, node_word)
+            if distance <= max_distance:
+                results.append((node_word, distance))
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return results
+
+
+# Rounding slack between rapidfuzz's float scores and fuzzywuzzy's rounded intermediate scores
+BOUND_MARGIN = 3
+
+# (scorer, weight) pairs whose maximum bounds fuzzywuzzy's WRatio from above: each scorer is at least its
+# fuzzywuzzy counterpart (rapidfuzz's partial ratios search every alignment fuzzywuzzy's heuristic picks
+# from), and each weight is the largest WRatio applies to that counterpart
+_WRATIO_BOUND_SCORERS = (
+    (batch_fuzz.ratio, 1.0),
+    (batch_fuzz.token_sort_ratio, 0.95),
+    (batch_fuzz.token_set_ratio, 0.95),
+    (batch_fuzz.partial_ratio, 0.9),
+    (batch_fuzz.partial_token_sort_ratio, 0.95 * 0.9),
+    (batch_fuzz.partial_token_set_ratio, 0.95 * 0.9)
+)
+
+
+def wratio_upper_bounds(queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+    """(queries x choices) upper bounds on fuzzywuzzy's WRatio of already processed strings"""
+    bounds = np.zeros((len(queries), len(choices)))
+    for scorer, weight in _WRATIO_BOUND_SCORERS:
+        np.maximum(bounds, weight * batch_process.cdist(queries, choices, scorer=scorer), out=bounds)
+    return bounds
+
+
+def expand_pattern_term(term: str) -> List[str]:
+    """Literal variants of a pattern term, where each space stands for optional whitespace (regex \\s?)"""
+    if " " not in term:
+        return [term]
+    return [term.replace(" ", separator) for separator in ("",) + tuple(string.whitespace)]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def at_word_boundary(text: str, index: int) -> bool:
+    """Equivalent of the regex \\b assertion at a position of text"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class _PythonAutomaton:
+    """Pure-Python Aho-Corasick automaton used when pyahocorasick is not installed"""
+
+    def __init__(self, phrases: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, phrase in enumerate(phrases):
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._out[state] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield end, index
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over a fixed set of lowercase phrases"""
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases = tuple(dict.fromkeys(phrase for phrase in phrases if phrase))
+        self.index = {phrase: i for i, phrase in enumerate(self.phrases)}
+
+        if not self.phrases:
+            self._automaton = None
+        elif ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for i, phrase in enumerate(self.phrases):
+                self._automaton.add_word(phrase, i)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = _PythonAutomaton(self.phrases)
+
+    def scan(self, text: str) -> "TextScan":
+        """Find every occurrence of every phrase in a single pass over text"""
+        offsets: List[List[int]] = [[] for _ in self.phrases]
+        counts = [0] * len(self.phrases)
+        next_free = [0] * len(self.phrases)
+
+        if self._automaton is not None:
+            lengths = [len(phrase) for phrase in self.phrases]
+            for end, i in self._automaton.iter(text):
+                start = end - lengths[i] + 1
+                offsets[i].append(start)
+                if start >= next_free[i]:
+                    counts[i] += 1
+                    next_free[i] = end + 1
+
+        return TextScan(text, self, offsets, counts)
+
+
+class TextScan:
+    """Occurrences of every automaton phrase in one (lowercase) text.
+
+    counts follow str.count semantics (non-overlapping, leftmost first) so they
+    can replace repeated text.count() calls; phrases unknown to the automaton
+    fall back to scanning the text directly.
+    """
+
+    def __init__(self, text: str, automaton: PhraseAutomaton, offsets: List[List[int]], counts: List[int]):
+        self.text = text
+        self._automaton = automaton
+        self._offsets = offsets
+        self._counts = counts
+        self._words = None
+
+    @property
+    def words(self) -> set:
+        """Whitespace-separated tokens of the text"""
+        if self._words is None:
+            self._words = set(self.text.split())
+        return self._words
+
+    def count(self, phrase: str) -> int:
+        i = self._automaton.index.get(phrase)
+        if i is None:
+            return self.text.count(phrase)
+        return self._counts[i]
+
+    def contains(self, phrase: str) -> bool:
+        i = self._automaton.index.get(phrase)
+        if i is None:
+            return phrase in self.text
+        return self._counts[i] > 0
+
+    def offsets(self, phrase: str) -> List[int]:
+        """Start offsets of every (possibly overlapping) occurrence of phrase"""
+        i = self._automaton.index.get(phrase)
+        if i is None:
+            return []
+        return self._offsets[i]
+
+    def word_matches(self, phrase: str) -> List[int]:
+        """Start offsets of occurrences delimited by word boundaries on both sides"""
+        return [
+            start for start in self.offsets(phrase)
+            if at_word_boundary(self.text, start) and at_word_boundary(self.text, start + len(phrase))
+        ]
+
+
+class SkillMatcher:
+    """Precompiled keyword matcher for one field's skill vocabulary.
+
+    Reproduces the semantics of the original per-skill scan: a skill matches when
+    it occurs as a substring of the text, when every word of a multi-word skill
+    is a token of the text, or when a single-word skill scores above
+    fuzzy_threshold against any token with fuzz.ratio. Token lookups go through
+    an exact hash set first and a BK-tree bounded by the threshold second.
+    """
+
+    def __init__(self, skills: Sequence[str], pattern_terms: PatternTerms = (), fuzzy_threshold: int = 85):
+        self.skills = tuple(skills)
+        self.pattern_terms = tuple(
+            (category, tuple(variant for term in terms for variant in expand_pattern_term(term)))
+            for category, terms in pattern_terms
+        )
+        self.fuzzy_threshold = fuzzy_threshold
+
+        self._entries = []
+        self.canonical: Dict[str, str] = {}
+        single_keys = set()
+        for skill in self.skills:
+            skill_lower = skill.lower()
+            self.canonical.setdefault(skill_lower, skill)
+            skill_words = tuple(skill_lower.split())
+            if len(skill_words) == 1:
+                key = utils.full_process(skill_lower)
+                if key:
+                    single_keys.add(key)
+                self._entries.append((skill, skill_lower, key, None))
+            else:
+                self._entries.append((skill, skill_lower, None, skill_words))
+
+        self.skills_lower = list(self.canonical)
+        self._processed_skills = [utils.full_process(skill, force_ascii=True) for skill in self.skills_lower]
+        self._exact = frozenset(single_keys)
+        self._fuzzy = BKTree(sorted(single_keys))
+        self._max_key_length = max((len(key) for key in single_keys), default=0)
+
+        self.automaton = PhraseAutomaton(
+            [entry[1] for entry in self._entries]
+            + [variant for _, variants in self.pattern_terms for variant in variants]
+        )
+
+    def scan(self, text: str) -> TextScan:
+        """Lowercase text once and locate every skill phrase and pattern term in it"""
+        return self.automaton.scan(text.lower())
+
+    def _fuzzy_hits(self, text_words: set) -> set:
+        """Processed single-word skills that match any token exactly or fuzzily"""
+        hits = set()
+        remaining = len(self._exact)
+        for word in text_words:
+            if remaining == len(hits):
+                break
+
+            processed = utils.full_process(word)
+            if not processed:
+                continue
+
+            if processed in self._exact:
+                hits.add(processed)
+
+            radius = max_indel_distance(len(processed) + self._max_key_length, self.fuzzy_threshold)
+            if len(processed) - self._max_key_length > radius:
+                continue
+
+            for key, _ in self._fuzzy.search(processed, radius):
+                if key not in hits and fuzz.ratio(processed, key) > self.fuzzy_threshold:
+                    hits.add(key)
+        return hits
+
+    def match(self, text: str, scan: Optional[TextScan] = None) -> List[str]:
+        """Return skills found in text, in vocabulary order"""
+        scan = scan or self.scan(text)
+        fuzzy_hits = self._fuzzy_hits(scan.words)
+
+        found_skills = []
+        for skill, skill_lower, key, skill_words in self._entries:
+            if scan.contains(skill_lower):
+                found_skills.append(skill)
+            elif skill_words is None:
+                if key in fuzzy_hits:
+                    found_skills.append(skill)
+            elif all(word in scan.words for word in skill_words):
+                found_skills.append(skill)
+        return found_skills
+
+    def best_matches(self, candidates: Sequence[str], threshold: int) -> List[str]:
+        """Canonical skill closest to each candidate phrase, for candidates scoring above threshold.
+
+        Same result as process.extractOne(candidate, skills) per candidate,
+        i.e. fuzzywuzzy's WRatio with ties going to the earliest skill.
+        rapidfuzz scores every candidate against every skill as one matrix of
+        upper bounds on WRatio; only skills whose bound comes within
+        BOUND_MARGIN of threshold are scored exactly with fuzzywuzzy.
+        Duplicate candidates are scored once.
+        """
+        unique_candidates = list(dict.fromkeys(candidate.lower() for candidate in candidates))
+        if not unique_candidates or not self.skills_lower:
+            return []
+
+        processed = [utils.full_process(candidate, force_ascii=True) for candidate in unique_candidates]
+        bounds = wratio_upper_bounds(processed, self._processed_skills)
+        best_by_candidate = {}
+        for candidate, query, row in zip(unique_candidates, processed, bounds):
+            if not query:
+                continue
+            best, best_score = None, threshold
+            for j in np.flatnonzero(row >= threshold - BOUND_MARGIN):
+                score = fuzz.WRatio(query, self._processed_skills[j], full_process=False)
+                if score > best_score:
+                    best, best_score = j, score
+            if best is not None:
+                best_by_candidate[candidate] = self.canonical[self.skills_lower[best]]
+        return [
+            best_by_candidate[candidate.lower()] for candidate in candidates
+            if candidate.lower() in best_by_candidate
+        ]
+
+    def match_patterns(self, scan: TextScan) -> List[str]:
+        """Return pattern-table terms that occur as whole words, title-cased"""
+        found_skills = []
+        for _, variants in self.pattern_terms:
+            for variant in variants:
+                if scan.word_matches(variant):
+                    skill = variant.replace('_', ' ').title()
+                    if skill not in found_skills:
+                        found_skills.append(skill)
+        return found_skills
+
+
+@lru_cache(maxsize=64)
+def get_skill_matcher(skills: Tuple[str, ...], pattern_terms: PatternTerms = ()) -> SkillMatcher:
+    """Build (once per vocabulary) the matcher for a tuple of skills and pattern terms"""
+    return SkillMatcher(skills, pattern_terms)
@@ -0,0 +1,223 @@
+import sqlite3
+import threading
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from scoring import SkillIndex, skill_index
+
+SELECT_NEW_ANALYSES = """
+    SELECT a.rowid, a.id, a.university, a.field, a.created_at, s.name
+    FROM analyses a
+    LEFT JOIN analysis_skills x ON x.analysis_id = a.id AND x.status = 1
+    LEFT JOIN skills s ON s.id = x.skill_id
+    WHERE a.rowid > ?
+    ORDER BY a.rowid
+"""
+
+METRICS = ("jaccard", "cosine")
+
+# Above this many distinct covered skills similarity_matrix keeps to a sparse product
+DENSE_PRODUCT_COLUMNS = 2048
+
+
+class SkillMatrix:
+    """Covered skills of every stored analysis as a sparse (analyses x skill index) matrix.
+
+    Covered skills never change once an analysis is stored (recomputation
+    only replaces the industry comparison), so refresh appends the analyses
+    inserted since the last call, found by rowid, and never rebuilds rows.
+    Each server process keeps its own copy.
+    """
+
+    def __init__(self, index: SkillIndex = skill_index):
+        self.index = index
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.analysis_ids: List[str] = []
+        self.universities: List[str] = []
+        self.fields: List[str] = []
+        self.created_at: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._indices = array("q")
+        self._indptr = array("q", [0])
+        self._last_rowid = 0
+        self._csr: Optional[sparse.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self.analysis_ids)
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """Append the analyses stored since the last refresh; returns how many were added"""
+        with self._lock:
+            last_rowid = conn.execute("SELECT coalesce(max(rowid), 0) FROM analyses").fetchone()[0]
+            if last_rowid < self._last_rowid:
+                # Rowids were renumbered (e.g. by VACUUM); start over
+                self._reset()
+            if last_rowid == self._last_rowid:
+                return 0
+
+            added = 0
+            rows = conn.execute(SELECT_NEW_ANALYSES, (self._last_rowid,))
+            for (rowid, analysis_id, university, field, created_at), skills in groupby(rows, itemgetter(0, 1, 2, 3, 4)):
+                self._last_rowid = rowid
+                if analysis_id in self._rows:
+                    continue
+                self._rows[analysis_id] = len(self.analysis_ids)
+                self.analysis_ids.append(analysis_id)
+                self.universities.append(university)
+                self.fields.append(field)
+                self.created_at.append(str(created_at))
+                self._indices.extend(sorted({self.index.column(row[5]) for row in skills if row[5] is not None}))
+                self._indptr.append(len(self._indices))
+                added += 1
+
+            if added:
+                self._csr = None
+            return added
+
+    def matrix(self) -> sparse.csr_matrix:
+        """Binary (analyses x skill index) matrix of everything loaded so far"""
+        with self._lock:
+            if self._csr is None or self._csr.shape[1] < len(self.index):
+                indices = np.array(self._indices, dtype=np.int64)
+                self._csr = sparse.csr_matrix(
+                    (np.ones(len(indices)), indices, np.array(self._indptr, dtype=np.int64)),
+                    shape=(len(self.analysis_ids), len(self.index))
+                )
+            return self._csr
+
+    def select(
+        self,
+        field: Optional[str] = None,
+        universities: Sequence[str] = (),
+        analysis_ids: Sequence[str] = (),
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """Row numbers of the matching analyses, newest first"""
+        if analysis_ids:
+            rows = [self._rows[analysis_id] for analysis_id in dict.fromkeys(analysis_ids) if analysis_id in self._rows]
+        else:
+            rows = range(len(self.analysis_ids))
+        wanted = set(universities)
+        rows = [
+            row for row in rows
+            if (field is None or self.fields[row] == field) and (not wanted or self.universities[row] in wanted)
+        ]
+        rows.sort(key=lambda row: (self.created_at[row], self.analysis_ids[row]), reverse=True)
+        return np.array(rows[:limit] if limit else rows, dtype=np.int64)
+
+
+def similarity_matrix(vectors: sparse.csr_matrix, metric: str) -> np.ndarray:
+    """Pairwise Jaccard or cosine similarity of the rows of a binary matrix, from one matrix product"""
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+    used = np.unique(vectors.indices)
+    if len(used) <= DENSE_PRODUCT_COLUMNS:
+        # Few distinct skills: a dense BLAS product beats a sparse one whose result is dense anyway
+        dense = vectors[:, used].toarray().astype(np.float32)
+        shared = dense @ dense.T
+    else:
+        shared = (vectors @ vectors.T).toarray().astype(np.float32)
+    sizes = shared.diagonal().copy()
+    if metric == "jaccard":
+        denominator = sizes[:, None] + sizes[None, :] - shared
+    else:
+        denominator = np.sqrt(np.outer(sizes, sizes))
+    similarity = np.divide(shared, denominator, out=np.zeros_like(shared), where=denominator > 0)
+    np.fill_diagonal(similarity, 1.0)
+    return similarity
+
+
+def most_similar_pairs(similarity: np.ndarray, keys: Sequence[str], count: int) -> List[Dict[str, Any]]:
+    """The count most similar distinct pairs, most similar first"""
+    size = len(keys)
+    count = min(count, size * (size - 1) // 2)
+    if count <= 0:
+        return []
+    # Only pairs above the diagonal are candidates; similarities are never negative
+    candidates = np.where(np.tri(size, dtype=bool), np.float32(-1), similarity).ravel()
+    top = np.argpartition(-candidates, count - 1)[:count]
+    top = top[np.lexsort((top, -candidates[top]))]
+    return [
+        {"a": keys[pair // size], "b": keys[pair % size], "similarity": round(float(candidates[pair]), 4)}
+        for pair in top
+    ]
+
+
+def most_covered_skills(skill_matrix: SkillMatrix, rows: np.ndarray, count: int) -> List[str]:
+    """The count skills covered by most of the selected analyses"""
+    totals = np.asarray(skill_matrix.matrix()[rows].sum(axis=0)).ravel()
+    top = np.argsort(-totals, kind="stable")[:count]
+    return [skill_matrix.index.name(column) for column in top if totals[column] > 0]
+
+
+def compare_rows(
+    skill_matrix: SkillMatrix,
+    rows: np.ndarray,
+    skills: Sequence[str],
+    metric: str = "jaccard",
+    by: str = "analysis",
+    pairs: int = 20,
+    matrix_rows: int = 200
+) -> Dict[str, Any]:
+    """Coverage heatmap and pairwise similarity of selected analyses, or of the universities they belong to.
+
+    Grouped by university, a university covers a skill when any of its
+    selected analyses does; the heatmap then holds the share of its analyses
+    that cover it. The full similarity matrix is included up to matrix_rows
+    rows; the most similar pairs always are.
+    """
+    vectors = skill_matrix.matrix()[rows]
+    if by == "university":
+        keys = list(dict.fromkeys(skill_matrix.universities[row] for row in rows))
+        group = {university: position for position, university in enumerate(keys)}
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows)), ([group[skill_matrix.universities[row]] for row in rows], np.arange(len(rows)))),
+            shape=(len(keys), len(rows))
+        )
+        counts = np.asarray(membership.sum(axis=1)).ravel()
+        covered_counts = (membership @ vectors).tocsr()
+        vectors = (covered_counts > 0).astype(np.float64)
+        labels = [{"university": university, "analyses": int(count)} for university, count in zip(keys, counts)]
+    else:
+        keys = [skill_matrix.analysis_ids[row] for row in rows]
+        covered_counts = vectors
+        counts = np.ones(len(rows))
+        labels = [
+            {
+                "analysis_id": skill_matrix.analysis_ids[row],
+                "university": skill_matrix.universities[row],
+                "created_at": skill_matrix.created_at[row]
+            }
+            for row in rows
+        ]
+
+    columns = [skill_matrix.index.get(skill) for skill in skills]
+    known = [
+        position for position, column in enumerate(columns) if column is not None and column < vectors.shape[1]
+    ]
+    heatmap = np.zeros((len(keys), len(skills)))
+    if known and len(keys):
+        selected = covered_counts[:, [columns[position] for position in known]].toarray()
+        heatmap[:, known] = selected / counts[:, None]
+
+    similarity = similarity_matrix(vectors, metric) if len(keys) else np.zeros((0, 0))
+    return {
+        "by": by,
+        "metric": metric,
+        "rows": labels,
+        "skills": list(skills),
+        "heatmap": np.round(heatmap, 4).tolist(),
+        "skill_coverage": dict(zip(skills, np.round(
+            (heatmap > 0).mean(axis=0) if len(keys) else np.zeros(len(skills)), 4
+        ).tolist())),
+        "similarity": np.round(similarity.astype(np.float64), 4).tolist() if len(keys) <= matrix_rows else None,
+        "most_similar": most_similar_pairs(similarity, keys, pairs)
+    }
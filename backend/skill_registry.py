@@ -0,0 +1,413 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from db import get_connection
+from skill_matcher import SkillMatcher, get_skill_matcher
+
+DEFAULT_FIELD = "Computer Science"
+
+BUILTIN_SKILL_DATABASE = {
+    "Computer Science": [
+        "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "Go", "Rust", "Swift", "Kotlin",
+        "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express", "Django", "Flask", "Spring",
+        "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis", "Elasticsearch",
+        "Git", "GitHub", "GitLab", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "DevOps", "CI/CD",
+        "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch", "Scikit-learn",
+        "Data Structures", "Algorithms", "Object Oriented Programming", "Functional Programming",
+        "API Development", "RESTful APIs", "GraphQL", "Microservices", "System Design", "Software Architecture",
+        "Testing", "Unit Testing", "Integration Testing", "Agile", "Scrum", "Linux", "Unix", "Shell Scripting",
+        "Web Development", "Frontend Development", "Backend Development", "Full Stack Development",
+        "Database Design", "Data Modeling", "Cybersecurity", "Network Security", "Encryption"
+    ],
+    "Engineering": [
+        "MATLAB", "Simulink", "AutoCAD", "SolidWorks", "CATIA", "Inventor", "Fusion 360",
+        "CAD", "CAM", "CAE", "FEA", "CFD", "Finite Element Analysis", "Computational Fluid Dynamics",
+        "Project Management", "Lean Manufacturing", "Six Sigma", "Quality Control", "Quality Assurance",
+        "Statistics", "Linear Algebra", "Calculus", "Differential Equations", "Physics", "Thermodynamics",
+        "Materials Science", "Mechanical Design", "Electrical Engineering", "Control Systems",
+        "PLC Programming", "SCADA", "HMI", "Industrial Automation", "Robotics", "Mechatronics",
+        "3D Modeling", "3D Printing", "Additive Manufacturing", "Manufacturing Processes",
+        "Technical Drawing", "Blueprint Reading", "GD&T", "Tolerance Analysis", "Stress Analysis"
+    ],
+    "Information Technology": [
+        "Network Administration", "System Administration", "Cloud Computing", "Virtualization",
+        "Windows Server", "Linux Administration", "Active Directory", "LDAP", "DNS", "DHCP",
+        "TCP/IP", "Networking", "Routing", "Switching", "Firewalls", "VPN", "VLAN",
+        "Cybersecurity", "Information Security", "Risk Assessment", "Compliance", "ITIL", "ITSM",
+        "Help Desk", "Technical Support", "Troubleshooting", "Hardware", "Software Installation",
+        "Backup and Recovery", "Disaster Recovery", "Business Continuity", "Monitoring", "Performance Tuning",
+        "Database Administration", "SQL Server", "Oracle", "MySQL", "PostgreSQL", "MongoDB",
+        "PowerShell", "Bash", "Python", "Scripting", "Automation", "Configuration Management"
+    ],
+    "Electronics": [
+        "Circuit Design", "PCB Design", "Analog Electronics", "Digital Electronics", "Power Electronics",
+        "Microcontrollers", "Microprocessors", "Embedded Systems", "FPGA", "VHDL", "Verilog",
+        "Signal Processing", "Digital Signal Processing", "Image Processing", "Communication Systems",
+        "RF Design", "Antenna Design", "Wireless Communication", "Bluetooth", "WiFi", "5G",
+        "Arduino", "Raspberry Pi", "PIC", "ARM", "AVR", "STM32", "ESP32",
+        "VLSI Design", "ASIC Design", "Semiconductor Physics", "Electronic Measurements",
+        "Oscilloscope", "Multimeter", "Function Generator", "Logic Analyzer", "Spectrum Analyzer",
+        "Soldering", "PCB Layout", "Schematic Design", "SPICE Simulation", "MATLAB", "LabVIEW"
+    ],
+    "Artificial Intelligence and Data Science": [
+        "Python", "R", "SQL", "Scala", "Julia", "Java", "C++",
+        "Machine Learning", "Deep Learning", "Neural Networks", "Artificial Intelligence",
+        "Statistics", "Probability", "Linear Algebra", "Calculus", "Statistical Analysis",
+        "Data Science", "Data Analysis", "Data Mining", "Data Visualization", "Exploratory Data Analysis",
+        "Pandas", "NumPy", "SciPy", "Matplotlib", "Seaborn", "Plotly", "Bokeh",
+        "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "XGBoost", "LightGBM", "CatBoost",
+        "Natural Language Processing", "Computer Vision", "Time Series Analysis", "Forecasting",
+        "Big Data", "Apache Spark", "Hadoop", "MapReduce", "Hive", "Pig", "Apache Kafka",
+        "Tableau", "Power BI", "Jupyter Notebook", "Google Colab", "Apache Airflow",
+        "Feature Engineering", "Model Selection", "Cross Validation", "Hyperparameter Tuning",
+        "A/B Testing", "Experimental Design", "Causal Inference", "Bayesian Statistics"
+    ],
+    "Artificial Intelligence and Machine Learning": [
+        "Python", "R", "MATLAB", "C++", "Java", "Scala",
+        "Machine Learning", "Deep Learning", "Neural Networks", "Artificial Intelligence",
+        "Supervised Learning", "Unsupervised Learning", "Reinforcement Learning", "Transfer Learning",
+        "Convolutional Neural Networks", "Recurrent Neural Networks", "LSTM", "GRU", "Transformers",
+        "Computer Vision", "Natural Language Processing", "Speech Recognition", "Robotics",
+        "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "OpenCV", "NLTK", "spaCy", "Hugging Face",
+        "Linear Algebra", "Calculus", "Statistics", "Probability", "Optimization", "Information Theory",
+        "Feature Engineering", "Dimensionality Reduction", "PCA", "t-SNE", "UMAP",
+        "Model Evaluation", "Cross Validation", "Bias-Variance Tradeoff", "Regularization",
+        "Ensemble Methods", "Random Forest", "Gradient Boosting", "XGBoost", "AdaBoost",
+        "Neural Architecture Search", "AutoML", "MLOps", "Model Deployment", "Edge AI",
+        "Ethics in AI", "Fairness", "Interpretability", "Explainable AI", "Adversarial Examples"
+    ]
+}
+
+BUILTIN_DEFAULT_INDUSTRY_SKILLS = {
+    "Computer Science": [
+        "Python", "Java", "C++", "JavaScript", "SQL", "Data Structures", "Algorithms",
+        "Machine Learning", "Web Development", "Database Management", "Git", "Linux",
+        "Cloud Computing", "Docker", "API Development", "System Design", "DevOps",
+        "React", "Node.js", "MongoDB", "PostgreSQL", "AWS", "Kubernetes"
+    ],
+    "Engineering": [
+        "MATLAB", "AutoCAD", "SolidWorks", "Project Management", "Statistics",
+        "Linear Algebra", "Calculus", "Physics", "Python", "R", "Data Analysis",
+        "Quality Control", "Lean Manufacturing", "Six Sigma", "CAD", "FEA"
+    ],
+    "Information Technology": [
+        "Network Administration", "Cybersecurity", "Cloud Computing", "System Administration",
+        "Help Desk Support", "Database Administration", "Windows Server", "Linux Administration",
+        "Virtualization", "Backup and Recovery", "IT Support", "Network Security"
+    ],
+    "Electronics": [
+        "Circuit Design", "VLSI Design", "Embedded Systems", "Microcontrollers", "PCB Design",
+        "Signal Processing", "FPGA Programming", "Arduino", "Raspberry Pi", "Electronics Design",
+        "Digital Signal Processing", "Analog Electronics", "Power Electronics"
+    ],
+    "Artificial Intelligence and Data Science": [
+        "Python", "Machine Learning", "Deep Learning", "Data Science", "Statistics", "R",
+        "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "SQL", "Data Visualization",
+        "Natural Language Processing", "Computer Vision", "Big Data", "Apache Spark", "Hadoop",
+        "Tableau", "Power BI", "Statistical Analysis", "Neural Networks"
+    ],
+    "Artificial Intelligence and Machine Learning": [
+        "Python", "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch",
+        "Scikit-learn", "Computer Vision", "Natural Language Processing", "Reinforcement Learning",
+        "Statistics", "Linear Algebra", "Calculus", "Data Preprocessing", "Model Evaluation",
+        "Feature Engineering", "Hyperparameter Tuning", "MLOps", "AI Ethics", "Keras", "OpenCV"
+    ]
+}
+
+BUILTIN_COMMON_SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "SQL", "HTML", "CSS", "React", "Angular",
+    "Machine Learning", "Data Science", "Statistics", "Linear Algebra", "Calculus",
+    "Data Structures", "Algorithms", "Database Management", "Web Development",
+    "Software Engineering", "Object Oriented Programming", "Git", "Linux",
+    "Cloud Computing", "Docker", "Kubernetes", "AWS", "MongoDB", "PostgreSQL"
+]
+
+BUILTIN_TEXT_REPLACEMENTS = {
+    'javascript': 'JavaScript',
+    'typescript': 'TypeScript',
+    'c++': 'C++',
+    'c#': 'C#',
+    'node.js': 'Node.js',
+    'vue.js': 'Vue.js',
+    'asp.net': 'ASP.NET',
+    'sql server': 'SQL Server',
+    'mysql': 'MySQL',
+    'postgresql': 'PostgreSQL',
+    'mongodb': 'MongoDB'
+}
+
+# Literal equivalents of the technical-term regexes, matched on word boundaries;
+# a space inside a term stands for optional whitespace.
+BUILTIN_PATTERN_TERMS = (
+    ('Programming Languages', (
+        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'swift',
+        'kotlin', 'php', 'ruby', 'scala', 'r',
+        'html', 'css', 'sql', 'nosql', 'xml', 'json', 'yaml'
+    )),
+    ('Frameworks and Libraries', (
+        'react', 'angular', 'vue.js', 'vuejs', 'node.js', 'nodejs', 'express', 'django', 'flask',
+        'spring', 'laravel',
+        'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'pandas', 'numpy', 'opencv'
+    )),
+    ('Tools and Platforms', (
+        'git', 'github', 'gitlab', 'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'jenkins',
+        'matlab', 'autocad', 'solidworks', 'tableau', 'power bi'
+    )),
+    ('Databases', (
+        'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle', 'sql server'
+    )),
+    ('Concepts', (
+        'machine learning', 'deep learning', 'neural networks', 'api', 'microservices',
+        'devops', 'agile', 'scrum', 'ci/cd', 'version control'
+    ))
+)
+
+BUILTIN_CONTEXT_PATTERNS = [
+    r'(?:learn|study|course|subject|module|lab|practical|theory|programming|development|design|analysis|using|with|in)\s+([A-Za-z\+\#\.]+)',
+    r'([A-Za-z\+\#\.]+)\s+(?:programming|language|framework|library|tool|software|platform|database|system)',
+    r'(?:introduction to|fundamentals of|advanced|basic)\s+([A-Za-z\+\#\.]+)',
+    r'([A-Za-z\+\#\.]+)\s+(?:concepts|principles|methodology|techniques|algorithms)'
+]
+
+BUILTIN_LEARNING_PLATFORMS = {
+    "Python": {
+        "title": "Python Programming Complete Course",
+        "platform": "Coursera",
+        "url": "https://coursera.org/learn/python",
+        "description": "Learn Python from basics to advanced concepts"
+    },
+    "Machine Learning": {
+        "title": "Machine Learning Specialization",
+        "platform": "Coursera",
+        "url": "https://coursera.org/specializations/machine-learning",
+        "description": "Comprehensive ML course by Andrew Ng"
+    },
+    "JavaScript": {
+        "title": "The Complete JavaScript Course",
+        "platform": "Udemy",
+        "url": "https://udemy.com/course/the-complete-javascript-course",
+        "description": "Master JavaScript with projects and real-world applications"
+    },
+    "React": {
+        "title": "React - The Complete Guide",
+        "platform": "Udemy",
+        "url": "https://udemy.com/course/react-the-complete-guide",
+        "description": "Learn React.js from scratch with hooks and modern patterns"
+    },
+    "SQL": {
+        "title": "SQL for Data Science",
+        "platform": "Coursera",
+        "url": "https://coursera.org/learn/sql-for-data-science",
+        "description": "Master SQL for data analysis and database management"
+    }
+}
+
+
+def _unique(skills: Iterable[str]) -> Tuple[str, ...]:
+    """Deduplicate skills case-insensitively, keeping the first spelling"""
+    seen = set()
+    unique = []
+    for skill in skills:
+        skill = skill.strip()
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            unique.append(skill)
+    return tuple(unique)
+
+
+def _freeze_field_map(field_map: Mapping[str, Iterable[str]]) -> Mapping[str, Tuple[str, ...]]:
+    return MappingProxyType({field: _unique(skills) for field, skills in field_map.items()})
+
+
+class SkillRegistry:
+    """Immutable snapshot of the skill vocabularies, pattern tables and recommendation catalog.
+
+    A registry is built once and never mutated; reloading swaps in a new
+    instance, so a request that grabbed a registry sees one consistent version.
+    """
+
+    __slots__ = (
+        "skill_database", "default_industry_skills", "common_skills", "text_replacements",
+        "pattern_terms", "context_patterns", "learning_platforms", "canonical_names",
+        "source", "version"
+    )
+
+    def __init__(
+        self,
+        skill_database: Mapping[str, Iterable[str]],
+        default_industry_skills: Mapping[str, Iterable[str]],
+        common_skills: Iterable[str],
+        text_replacements: Mapping[str, str],
+        pattern_terms: Iterable[Tuple[str, Iterable[str]]],
+        context_patterns: Iterable[str],
+        learning_platforms: Mapping[str, Mapping[str, str]],
+        source: str = "builtin"
+    ):
+        set_attr = super().__setattr__
+        set_attr("skill_database", _freeze_field_map(skill_database))
+        set_attr("default_industry_skills", _freeze_field_map(default_industry_skills))
+        set_attr("common_skills", tuple(common_skills))
+        set_attr("text_replacements", MappingProxyType(dict(text_replacements)))
+        set_attr("pattern_terms", tuple(
+            (category, tuple(term.lower() for term in terms)) for category, terms in pattern_terms
+        ))
+        set_attr("context_patterns", tuple(re.compile(pattern, re.IGNORECASE) for pattern in context_patterns))
+        set_attr("learning_platforms", MappingProxyType({
+            skill: MappingProxyType(dict(course)) for skill, course in learning_platforms.items()
+        }))
+
+        canonical_names = {}
+        for skills in list(self.skill_database.values()) + list(self.default_industry_skills.values()):
+            for skill in skills:
+                canonical_names.setdefault(skill.lower(), skill)
+        set_attr("canonical_names", MappingProxyType(canonical_names))
+        set_attr("source", source)
+        set_attr("version", self._fingerprint())
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("SkillRegistry is immutable; use reload_registry() to replace it")
+
+    def _fingerprint(self) -> str:
+        """Content hash identifying this registry across processes and restarts"""
+        payload = json.dumps({
+            "skill_database": dict(self.skill_database),
+            "default_industry_skills": dict(self.default_industry_skills),
+            "common_skills": self.common_skills,
+            "text_replacements": dict(self.text_replacements),
+            "pattern_terms": self.pattern_terms,
+            "context_patterns": [pattern.pattern for pattern in self.context_patterns]
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def skills_for_field(self, field: str) -> Tuple[str, ...]:
+        """Extraction vocabulary for a field, defaulting to Computer Science"""
+        return self.skill_database.get(field) or self.skill_database.get(DEFAULT_FIELD, ())
+
+    def default_industry_skills_for_field(self, field: str) -> List[str]:
+        """Fallback industry skills used when the database has none for a field"""
+        return list(self.default_industry_skills.get(field) or self.default_industry_skills.get(DEFAULT_FIELD, ()))
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical spelling of a skill name, if the registry knows it"""
+        return self.canonical_names.get(name.lower())
+
+    def matcher(self, skills: Iterable[str] = ()) -> SkillMatcher:
+        """Precompiled matcher for a vocabulary and this registry's pattern table"""
+        return get_skill_matcher(tuple(skills), self.pattern_terms)
+
+    def build_matchers(self):
+        """Build the matcher of every field up front, e.g. before forking server workers"""
+        self.matcher()
+        for field in self.skill_database:
+            self.matcher(self.skills_for_field(field))
+
+    def summary(self) -> Dict[str, Any]:
+        """Version and size information for monitoring"""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "fields": {field: len(skills) for field, skills in self.skill_database.items()},
+            "learning_platforms": len(self.learning_platforms)
+        }
+
+
+def build_builtin_registry() -> SkillRegistry:
+    """Registry made of the vocabularies shipped with the application"""
+    return SkillRegistry(
+        skill_database=BUILTIN_SKILL_DATABASE,
+        default_industry_skills=BUILTIN_DEFAULT_INDUSTRY_SKILLS,
+        common_skills=BUILTIN_COMMON_SKILLS,
+        text_replacements=BUILTIN_TEXT_REPLACEMENTS,
+        pattern_terms=BUILTIN_PATTERN_TERMS,
+        context_patterns=BUILTIN_CONTEXT_PATTERNS,
+        learning_platforms=BUILTIN_LEARNING_PLATFORMS
+    )
+
+
+def load_registry_from_file(path: Path) -> SkillRegistry:
+    """Load a registry from a JSON file; missing sections fall back to the builtin data"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    pattern_terms = data.get("pattern_terms")
+    if isinstance(pattern_terms, dict):
+        pattern_terms = list(pattern_terms.items())
+
+    return SkillRegistry(
+        skill_database=data.get("skill_database", BUILTIN_SKILL_DATABASE),
+        default_industry_skills=data.get("default_industry_skills", BUILTIN_DEFAULT_INDUSTRY_SKILLS),
+        common_skills=data.get("common_skills", BUILTIN_COMMON_SKILLS),
+        text_replacements=data.get("text_replacements", BUILTIN_TEXT_REPLACEMENTS),
+        pattern_terms=pattern_terms or BUILTIN_PATTERN_TERMS,
+        context_patterns=data.get("context_patterns", BUILTIN_CONTEXT_PATTERNS),
+        learning_platforms=data.get("learning_platforms", BUILTIN_LEARNING_PLATFORMS),
+        source=f"file:{path}"
+    )
+
+
+def load_registry_from_database() -> SkillRegistry:
+    """Extend the builtin vocabularies with the skills stored in industry_skills"""
+    results = get_connection().execute("""
+        SELECT field, skill_name FROM industry_skills
+        WHERE field != 'General'
+        ORDER BY field, importance_level DESC
+    """).fetchall()
+
+    stored: Dict[str, List[str]] = {}
+    for field, skill_name in results:
+        stored.setdefault(field, []).append(skill_name)
+
+    skill_database = {field: list(skills) for field, skills in BUILTIN_SKILL_DATABASE.items()}
+    for field, skills in stored.items():
+        skill_database[field] = skill_database.get(field, []) + skills
+
+    return SkillRegistry(
+        skill_database=skill_database,
+        default_industry_skills=BUILTIN_DEFAULT_INDUSTRY_SKILLS,
+        common_skills=BUILTIN_COMMON_SKILLS,
+        text_replacements=BUILTIN_TEXT_REPLACEMENTS,
+        pattern_terms=BUILTIN_PATTERN_TERMS,
+        context_patterns=BUILTIN_CONTEXT_PATTERNS,
+        learning_platforms=BUILTIN_LEARNING_PLATFORMS,
+        source="database"
+    )
+
+
+_registry = build_builtin_registry()
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SkillRegistry:
+    """Current registry; callers should hold on to it for the duration of a request"""
+    return _registry
+
+
+def reload_registry(source: str = "builtin", file_path: Optional[Path] = None) -> SkillRegistry:
+    """Build a new registry from 'builtin', 'database' or 'file' and swap it in atomically"""
+    global _registry
+
+    if source == "builtin":
+        registry = build_builtin_registry()
+    elif source == "database":
+        registry = load_registry_from_database()
+    elif source == "file":
+        if file_path is None:
+            raise ValueError("A registry file path is required to reload from a file")
+        registry = load_registry_from_file(Path(file_path))
+    else:
+        raise ValueError(f"Unknown registry source '{source}'")
+
+    with _registry_lock:
+        _registry = registry
+    return registry
+
+
+def load_registry_from_env() -> SkillRegistry:
+    """Load the registry named by SKILL_REGISTRY_SOURCE and SKILL_REGISTRY_FILE"""
+    return reload_registry(os.getenv("SKILL_REGISTRY_SOURCE", "builtin"), os.getenv("SKILL_REGISTRY_FILE"))
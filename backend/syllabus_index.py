@@ -0,0 +1,221 @@
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analysis_store import STORED_TEXT_CHARS
+
+SHINGLE_WORDS = 4
+NUM_PERMUTATIONS = 128
+
+SELECT_NEW_SYLLABI = """
+    SELECT a.rowid, a.id, a.university, a.field, a.created_at, s.signature, a.syllabus_text
+    FROM analyses a
+    LEFT JOIN syllabus_signatures s ON s.analysis_id = a.id
+    WHERE a.rowid > ?
+    ORDER BY a.rowid
+"""
+
+_WORD = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+# Fixed seed: signatures are stored, so every process must draw the same permutations
+_rng = np.random.default_rng(20240611)
+_PERMUTATION_A = _rng.integers(1, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERMUTATION_B = _rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+_CHUNK = 4096
+_BAND_MULTIPLIERS = np.random.default_rng(1).integers(1, 1 << 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """Distinct 32-bit hashes of the size-word shingles of a text, case-insensitive"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = {word: zlib.crc32(word.encode()) for word in set(words)}
+    tokens = np.fromiter((word_hashes[word] for word in words), dtype=np.uint64, count=len(words))
+
+    size = min(size, len(tokens))
+    hashes = tokens[:len(tokens) - size + 1].copy()
+    for offset in range(1, size):
+        # Wrapping uint64 arithmetic is intended here
+        hashes = hashes * _SHINGLE_MULTIPLIER + tokens[offset:len(tokens) - size + 1 + offset]
+    return np.unique((hashes >> np.uint64(32)) ^ (hashes & _MAX_HASH))
+
+
+def syllabus_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature (NUM_PERMUTATIONS uint32 values) of a text's shingles, None for a text without words.
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the two texts' shingle sets.
+    """
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    signature = np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(hashes), _CHUNK):
+        chunk = hashes[start:start + _CHUNK, None]
+        permuted = ((chunk * _PERMUTATION_A + _PERMUTATION_B) % _MERSENNE_PRIME) & _MAX_HASH
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def syllabus_signatures(texts: Sequence[str]) -> List[Optional[bytes]]:
+    """Stored form of the signatures of several texts, e.g. for one CPU worker call"""
+    signatures = (syllabus_signature(text) for text in texts)
+    return [None if signature is None else signature.tobytes() for signature in signatures]
+
+
+class SyllabusIndex:
+    """MinHash LSH index over the syllabus signatures of every stored analysis.
+
+    Signatures are split into bands; two syllabi become candidates when any
+    band matches exactly, so a lookup touches only the buckets of its own
+    bands instead of every analysis. Candidates are then ranked by their
+    estimated Jaccard similarity. Like SkillMatrix, refresh appends the
+    analyses inserted since the last call, found by rowid, and each server
+    process keeps its own copy.
+    """
+
+    def __init__(self, bands: int = 32):
+        if NUM_PERMUTATIONS % bands:
+            raise ValueError(f"bands must divide {NUM_PERMUTATIONS}")
+        self.bands = bands
+        self.band_size = NUM_PERMUTATIONS // bands
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.analysis_ids: List[str] = []
+        self.universities: List[str] = []
+        self.fields: List[str] = []
+        self.created_at: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._signatures = np.empty((1024, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._last_rowid = 0
+
+    def __len__(self) -> int:
+        return len(self.analysis_ids)
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return analysis_id in self._rows
+
+    def _band_keys(self, signatures: np.ndarray) -> List[List[int]]:
+        """One 64-bit hash of each signature per band (bands x signatures); collisions only add candidates"""
+        # Wrapping uint64 arithmetic is intended here
+        hashed = signatures.astype(np.uint64) * _BAND_MULTIPLIERS
+        return hashed.reshape(len(signatures), self.bands, self.band_size).sum(axis=2).T.tolist()
+
+    def _add(self, analyses: List[Tuple[str, str, str, str]], signatures: np.ndarray):
+        """Index (analysis_id, university, field, created_at) rows with their signatures"""
+        first = len(self.analysis_ids)
+        needed = first + len(analyses)
+        if needed > len(self._signatures):
+            grown = np.empty((max(needed, 2 * len(self._signatures)), NUM_PERMUTATIONS), dtype=np.uint32)
+            grown[:first] = self._signatures[:first]
+            self._signatures = grown
+        self._signatures[first:needed] = signatures
+
+        for buckets, keys in zip(self._buckets, self._band_keys(signatures)):
+            for row, key in enumerate(keys, first):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [row]
+                else:
+                    bucket.append(row)
+        for row, (analysis_id, university, field, created_at) in enumerate(analyses, first):
+            self._rows[analysis_id] = row
+            self.analysis_ids.append(analysis_id)
+            self.universities.append(university)
+            self.fields.append(field)
+            self.created_at.append(created_at)
+
+    def refresh(self, conn: sqlite3.Connection) -> List[Tuple[str, bytes]]:
+        """Index the analyses stored since the last refresh.
+
+        Analyses stored without a signature (before migration 11, or
+        imported) get one from their stored text when that text is complete;
+        these (analysis_id, signature) pairs are returned so the caller can
+        persist them. Analyses whose stored text was truncated, or has no
+        words, are not indexed: a signature of the first STORED_TEXT_CHARS
+        characters would make syllabi differing after them look identical.
+        """
+        with self._lock:
+            last_rowid = conn.execute("SELECT coalesce(max(rowid), 0) FROM analyses").fetchone()[0]
+            if last_rowid < self._last_rowid:
+                # Rowids were renumbered (e.g. by VACUUM); start over
+                self._reset()
+            if last_rowid == self._last_rowid:
+                return []
+
+            analyses = []
+            signatures = []
+            computed = []
+            for rowid, analysis_id, university, field, created_at, stored, text in conn.execute(
+                SELECT_NEW_SYLLABI, (self._last_rowid,)
+            ):
+                self._last_rowid = rowid
+                if analysis_id in self._rows:
+                    continue
+                if stored is None:
+                    if not text or len(text) >= STORED_TEXT_CHARS:
+                        continue
+                    signature = syllabus_signature(text)
+                    if signature is None:
+                        continue
+                    stored = signature.tobytes()
+                    computed.append((analysis_id, stored))
+                analyses.append((analysis_id, university, field, str(created_at)))
+                signatures.append(stored)
+
+            if analyses:
+                self._add(analyses, np.frombuffer(b"".join(signatures), dtype=np.uint32).reshape(-1, NUM_PERMUTATIONS))
+            return computed
+
+    def signature(self, analysis_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(analysis_id)
+        return None if row is None else self._signatures[row].copy()
+
+    def query(
+        self,
+        signature: np.ndarray,
+        field: Optional[str] = None,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+        exclude: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Indexed syllabi sharing a band with signature, most similar (then newest) first"""
+        with self._lock:
+            candidates = set()
+            for buckets, (key,) in zip(self._buckets, self._band_keys(signature[None, :])):
+                candidates.update(buckets.get(key, ()))
+            candidates.discard(self._rows.get(exclude))
+            rows = np.fromiter(
+                (row for row in candidates if field is None or self.fields[row] == field), dtype=np.int64
+            )
+            if not len(rows):
+                return []
+
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            keep = similarity >= min_similarity
+            rows, similarity = rows[keep], similarity[keep]
+            ranked = sorted(
+                zip(similarity.tolist(), rows.tolist()),
+                key=lambda match: (match[0], self.created_at[match[1]]),
+                reverse=True
+            )[:limit]
+            return [
+                {
+                    "analysis_id": self.analysis_ids[row],
+                    "university": self.universities[row],
+                    "field": self.fields[row],
+                    "created_at": self.created_at[row],
+                    "similarity": round(value, 4)
+                }
+                for value, row in ranked
+            ]
@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Read at import by db and main: keep the API tests off the real database and out of worker processes
+os.environ["DATABASE_PATH"] = str(Path(tempfile.mkdtemp(prefix="skill-gap-tests-")) / "api.db")
+os.environ["ANALYSIS_EXECUTION_MODE"] = "inline"
+os.environ["NLP_WARM_UP"] = "false"
+os.environ["CATALOG_CHECK_INTERVAL"] = "0"
+os.environ["JOB_POLL_INTERVAL"] = "0.05"
+
+from db import ConnectionPool  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+
+
+@pytest.fixture
+def db_pool(tmp_path):
+    """A migrated database of its own"""
+    pool = ConnectionPool(tmp_path / "test.db")
+    run_migrations(pool)
+    yield pool
+    pool.close_all()
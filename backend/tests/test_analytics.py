@@ -0,0 +1,117 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import analytics
+from analysis_store import insert_analyses, load_analyses, replace_comparisons
+
+SKILLS = ["Python", "SQL", "Docker", "Git", "Java", "AWS", "React", "Statistics"]
+FIELDS = ["Computer Science", "Data Science"]
+UNIVERSITIES = ["North University", "South University", "East University"]
+
+RECOUNT_COVERAGE = """
+    WITH scopes (by_field, by_university, by_day) AS (
+        VALUES (1, 1, 1), (1, 0, 1), (0, 1, 1), (0, 0, 1), (1, 1, 0), (1, 0, 0), (0, 1, 0), (0, 0, 0)
+    )
+    SELECT iif(by_field, a.field, '*'), iif(by_university, a.university, '*'),
+           iif(by_day, date(a.created_at), '*'), count(*), sum(a.skill_coverage_percentage)
+    FROM analyses a, scopes
+    GROUP BY 1, 2, 3
+"""
+
+RECOUNT_MISSING_SKILLS = """
+    WITH scopes (by_field, by_university) AS (VALUES (1, 1), (1, 0), (0, 1), (0, 0)),
+    missing AS (SELECT DISTINCT analysis_id, skill_id FROM analysis_skills WHERE status = 0)
+    SELECT iif(by_field, a.field, '*'), iif(by_university, a.university, '*'), m.skill_id, count(*)
+    FROM missing m JOIN analyses a ON a.id = m.analysis_id, scopes
+    GROUP BY 1, 2, 3
+"""
+
+
+def random_analysis(rng, number):
+    covered = rng.sample(SKILLS, rng.randint(0, 4))
+    missing = [skill for skill in SKILLS if skill not in covered][:rng.randint(0, 4)]
+    # A skill listed twice still counts once per analysis
+    if missing:
+        missing.append(missing[0])
+    return SimpleNamespace(
+        analysis_id=f"analysis-{number}",
+        university=rng.choice(UNIVERSITIES),
+        field=rng.choice(FIELDS),
+        covered_skills=covered,
+        missing_skills=missing,
+        skill_coverage_percentage=round(rng.uniform(0, 100), 2),
+        weighted_coverage_percentage=None,
+        recommendations=[{"title": f"Learn {skill}", "platform": "Udemy"} for skill in missing[:2]],
+        catalog_revision=0,
+        created_at=f"2024-05-{rng.randint(1, 4):02d} 12:00:{number % 60:02d}"
+    )
+
+
+def recomputed(stored, rng):
+    missing = rng.sample(SKILLS, rng.randint(0, 3))
+    return SimpleNamespace(
+        analysis_id=stored["analysis_id"],
+        university=stored["university"],
+        field=stored["field"],
+        covered_skills=stored["covered_skills"],
+        missing_skills=missing,
+        skill_coverage_percentage=round(rng.uniform(0, 100), 2),
+        weighted_coverage_percentage=round(rng.uniform(0, 100), 2),
+        recommendations=[],
+        catalog_revision=1,
+        created_at=stored["created_at"]
+    )
+
+
+def assert_summaries_match_recount(conn):
+    coverage = {row[:3]: row[3:] for row in conn.execute(
+        "SELECT field, university, day, analyses, coverage_sum FROM stats_coverage"
+    )}
+    expected_coverage = {row[:3]: row[3:] for row in conn.execute(RECOUNT_COVERAGE)}
+    assert coverage.keys() == expected_coverage.keys()
+    for key, (count, total) in expected_coverage.items():
+        assert coverage[key][0] == count, key
+        assert coverage[key][1] == pytest.approx(total), key
+
+    missing = set(conn.execute("SELECT field, university, skill_id, analyses FROM stats_missing_skills"))
+    assert missing == set(conn.execute(RECOUNT_MISSING_SKILLS))
+
+
+def test_summaries_follow_inserts_and_recomputations(db_pool):
+    rng = random.Random(7)
+    analyses = [random_analysis(rng, number) for number in range(60)]
+
+    with db_pool.transaction() as conn:
+        insert_analyses(conn, [(analysis, "text") for analysis in analyses[:40]], keep_created_at=True)
+    with db_pool.transaction() as conn:
+        insert_analyses(conn, [(analysis, "text") for analysis in analyses[40:]], keep_created_at=True)
+    assert_summaries_match_recount(db_pool.connection())
+
+    for _ in range(3):
+        with db_pool.transaction() as conn:
+            stored = load_analyses(conn, [analysis.analysis_id for analysis in rng.sample(analyses, 25)])
+            replace_comparisons(conn, [(analysis, recomputed(analysis, rng)) for analysis in stored.values()])
+        assert_summaries_match_recount(db_pool.connection())
+
+
+def test_stats_answers_come_from_the_summaries(db_pool):
+    rng = random.Random(11)
+    analyses = [random_analysis(rng, number) for number in range(30)]
+    with db_pool.transaction() as conn:
+        insert_analyses(conn, [(analysis, "text") for analysis in analyses], keep_created_at=True)
+
+    conn = db_pool.connection()
+    field = FIELDS[0]
+    in_field = [analysis for analysis in analyses if analysis.field == field]
+    counts = {}
+    for analysis in in_field:
+        for skill in set(analysis.missing_skills):
+            counts[skill] = counts.get(skill, 0) + 1
+
+    stats = analytics.missing_skills(conn, field, None, 50)
+    assert {entry["skill"]: entry["analyses"] for entry in stats["skills"]} == counts
+
+    fields = {entry["field"]: entry for entry in analytics.field_coverage(conn)}
+    assert fields[field]["analyses"] == len(in_field)
@@ -0,0 +1,311 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+FIELD = "Computer Science"
+
+SYLLABUS = " ".join(
+    f"Week {week}: programming in Python and Java, relational databases with SQL, "
+    f"version control with Git and containers with Docker, lecture {week} of the course."
+    for week in range(1, 13)
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """The API on the throwaway database configured in conftest, with startup and shutdown run"""
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+def analyze(client, university, text=SYLLABUS, field=FIELD):
+    response = client.post("/analyze", data={"university": university, "field": field, "text_content": text})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_ready(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+
+def test_analyze_and_fetch(client):
+    analysis = analyze(client, "Test University")
+    assert {"Python", "Java", "SQL", "Git", "Docker"} <= set(analysis["covered_skills"])
+    assert not set(analysis["covered_skills"]) & set(analysis["missing_skills"])
+
+    stored = client.get(f"/skills/{analysis['analysis_id']}").json()
+    assert stored["covered_skills"] == analysis["covered_skills"]
+    assert client.get("/skills/unknown").status_code == 404
+
+
+def test_async_job(client):
+    response = client.post(
+        "/analyze", data={"university": "Queued University", "field": FIELD, "text_content": SYLLABUS},
+        params={"async": "true"}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status_url"] == f"/jobs/{job['job_id']}"
+    deadline = time.time() + 30
+    while True:
+        status = client.get(f"/jobs/{job['job_id']}").json()
+        if status["status"] in ("succeeded", "failed") or time.time() > deadline:
+            break
+        time.sleep(0.05)
+    assert status["status"] == "succeeded", status
+    assert status["result"]["university"] == "Queued University"
+    assert "Python" in status["result"]["covered_skills"]
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_near_duplicate_and_similar(client):
+    original = analyze(client, "Original University")
+    copy = analyze(client, "Copy University", SYLLABUS + " Final week: a review of Kubernetes.")
+
+    assert copy["near_duplicate"]["similarity"] >= 0.8
+    assert "Kubernetes" in copy["near_duplicate"]["added_skills"]
+
+    similar = client.get(f"/similar/{copy['analysis_id']}").json()["similar"]
+    assert original["analysis_id"] in [match["analysis_id"] for match in similar]
+    assert copy["analysis_id"] not in [match["analysis_id"] for match in similar]
+    assert client.get("/similar/unknown").status_code == 404
+
+
+def test_compare(client):
+    first = analyze(client, "Compare A", "Python and SQL")
+    second = analyze(client, "Compare B", "Python and Docker")
+    response = client.get(
+        "/compare", params={"analysis_id": [first["analysis_id"], second["analysis_id"]], "skill": ["Python", "SQL"]}
+    )
+    assert response.status_code == 200
+    comparison = response.json()
+    heatmap = {row["university"]: coverage for row, coverage in zip(comparison["rows"], comparison["heatmap"])}
+    assert heatmap == {"Compare A": [1.0, 1.0], "Compare B": [1.0, 0.0]}
+    assert comparison["similarity"][0][1] == pytest.approx(1 / 3, abs=1e-4)
+
+    assert client.get("/compare").status_code == 400
+    assert client.get("/compare", params={"field": FIELD, "metric": "euclidean"}).status_code == 422
+
+
+def test_catalog_change_recompute_and_score(client):
+    analysis = analyze(client, "Catalog University")
+    revision = client.get("/catalog").json()["revision"]
+
+    skill = {"field": FIELD, "skill_name": "Docker", "category": "DevOps", "importance_level": 5, "source": "test"}
+    response = client.post(
+        "/import/industry_skills", files={"file": ("skills.ndjson", json.dumps(skill) + "\n")}
+    )
+    assert response.status_code == 200, response.text
+
+    catalog = client.get("/catalog").json()
+    assert catalog["revision"] > revision
+    assert catalog["stale_analyses"][FIELD] > 0
+
+    assert client.post("/catalog/recompute").json()["recomputed"] >= catalog["stale_analyses"][FIELD]
+    assert client.get("/catalog").json()["stale_analyses"] == {}
+    assert client.get(f"/skills/{analysis['analysis_id']}").json()["catalog_revision"] > revision
+
+    score = client.post("/catalog/score", json={"field": FIELD, "lowest": 2}).json()
+    assert score["analyses"] >= 1
+    assert len(score["lowest"]) == 2
+    assert sum(score["distribution"]) == score["analyses"]
+
+    proposed = client.post("/catalog/score", json={
+        "field": FIELD, "skills": [{"skill_name": "Python", "importance_level": 5, "category": "Programming"}]
+    }).json()
+    assert proposed["industry_skills"] == 1
+    assert client.post("/catalog/score", json={"field": FIELD, "skills": []}).status_code == 400
+
+
+def test_export_import_round_trip(client):
+    analysis = analyze(client, "Exported University")
+
+    response = client.get("/export/analyses")
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    exported = next(record for record in records if record["analysis_id"] == analysis["analysis_id"])
+    assert exported["covered_skills"] == analysis["covered_skills"]
+
+    csv_export = client.get("/export/analyses", params={"format": "csv"})
+    assert csv_export.status_code == 200
+    assert csv_export.text.splitlines()[0].startswith("analysis_id,")
+
+    reimported = client.post("/import/analyses", files={"file": ("analyses.ndjson", response.content)}).json()
+    assert reimported["inserted"] == 0
+    assert reimported["unchanged"] == len(records)
+
+    as_json = client.post(
+        "/import/analyses", files={"file": ("analyses.json", json.dumps(records))}
+    ).json()
+    assert as_json["inserted"] == 0
+
+    assert client.get("/export/unknown").status_code == 404
+    assert client.post("/import/analyses", files={"file": ("bad.ndjson", "{not json\n")}).status_code == 400
+
+
+def stored_analysis_ids(client, university):
+    response = client.get("/analyses", params={"university": university, "limit": 100})
+    assert response.status_code == 200
+    return {row["analysis_id"] for row in response.json()["analyses"]}
+
+
+def syllabus_pdf(text):
+    import fitz
+
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), text)
+        return doc.tobytes()
+
+
+def test_batch_reports_each_item_and_stores_only_the_successes(client):
+    university = "Batch University"
+    items = [
+        {"university": university, "field": FIELD, "text_content": "Python and SQL"},
+        {"university": university, "field": FIELD},
+        {"university": university, "field": FIELD, "file": "missing.pdf"},
+        "not an object",
+        {"university": university, "field": FIELD, "file": "syllabus.pdf"},
+        {"university": university, "field": FIELD, "text_content": "   "},
+        {"university": university},
+        {"university": university, "field": FIELD, "file": "broken.pdf"},
+        {"university": university, "field": "Data Science", "text_content": "Python and SQL"},
+    ]
+    files = [
+        ("files", ("syllabus.pdf", syllabus_pdf("Docker and Git in practice"), "application/pdf")),
+        ("files", ("broken.pdf", b"not a pdf", "application/pdf")),
+    ]
+    response = client.post("/analyze/batch", data={"items": json.dumps(items)}, files=files)
+    assert response.status_code == 200, response.text
+    batch = response.json()
+
+    results = batch["results"]
+    assert [result["index"] for result in results] == list(range(len(items)))
+    assert [result["status"] for result in results] == ["ok", "error", "error", "error", "ok", "error", "error",
+                                                         "error", "ok"]
+    assert [result["status_code"] for result in results if result["status"] == "error"] == [400, 400, 422, 400,
+                                                                                             422, 400]
+    assert (batch["succeeded"], batch["failed"]) == (3, 6)
+
+    assert results[0]["analysis"]["covered_skills"] == analyze(client, "Single University", "Python and SQL")[
+        "covered_skills"]
+    assert {"Docker", "Git"} <= set(results[4]["analysis"]["covered_skills"])
+    assert results[8]["analysis"]["field"] == "Data Science"
+
+    succeeded = {result["analysis"]["analysis_id"] for result in results if result["status"] == "ok"}
+    assert stored_analysis_ids(client, university) == succeeded
+    for analysis_id in succeeded:
+        assert client.get(f"/skills/{analysis_id}").status_code == 200
+
+
+def test_batch_reuses_cached_skills(client):
+    text = "A batch syllabus about Kubernetes, Docker and Python"
+    items = [{"university": "Cached University", "field": FIELD, "text_content": text}] * 2
+
+    first = client.post("/analyze/batch", data={"items": json.dumps(items)}).json()
+    hits = client.get("/cache/stats").json()["covered_skills"]["hits"]
+    second = client.post("/analyze/batch", data={"items": json.dumps(items)}).json()
+
+    assert client.get("/cache/stats").json()["covered_skills"]["hits"] == hits + 2
+    skills = [result["analysis"]["covered_skills"] for result in first["results"] + second["results"]]
+    assert all(covered == skills[0] for covered in skills)
+    # Every item is stored as its own analysis, cached or not
+    assert len(stored_analysis_ids(client, "Cached University")) == 4
+
+
+def test_batch_rejects_invalid_requests_without_storing(client):
+    university = "Rejected University"
+    items = [{"university": university, "field": FIELD, "file": "a.pdf"}]
+    pdf = syllabus_pdf("Python")
+    response = client.post("/analyze/batch", data={"items": json.dumps(items)}, files=[
+        ("files", ("a.pdf", pdf, "application/pdf")), ("files", ("a.pdf", pdf, "application/pdf"))
+    ])
+    assert response.status_code == 400
+    assert "Duplicate file name" in response.json()["detail"]
+
+    assert client.post("/analyze/batch", data={"items": "[]"}).status_code == 400
+    assert client.post("/analyze/batch", data={"items": "{not json"}).status_code == 400
+    assert stored_analysis_ids(client, university) == set()
+
+
+def test_analyses_pages_and_ndjson_cover_every_match_once(client):
+    university = "Paged University"
+    created = set()
+    for number in range(13):
+        items = [{"university": university, "field": FIELD, "text_content": f"Python course {number}"}]
+        batch = client.post("/analyze/batch", data={"items": json.dumps(items)}).json()
+        created.add(batch["results"][0]["analysis"]["analysis_id"])
+
+    seen, cursor = [], None
+    while True:
+        params = {"university": university, "limit": 4, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/analyses", params=params).json()
+        assert len(page["analyses"]) <= 4
+        seen.extend(row["analysis_id"] for row in page["analyses"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 13
+    assert set(seen) == created
+
+    response = client.get("/analyses", params={"university": university, "format": "ndjson"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["analysis_id"] for line in response.text.splitlines()] == seen
+
+    limited = client.get("/analyses", params={"university": university, "format": "ndjson", "limit": 5})
+    assert [json.loads(line)["analysis_id"] for line in limited.text.splitlines()] == seen[:5]
+
+
+def test_analyses_rejects_bad_cursors_and_limits(client):
+    import main
+
+    assert client.get("/analyses", params={"cursor": "tampered!"}).status_code == 400
+    assert client.get("/analyses", params={"cursor": "WzEsIDJd"}).status_code == 400
+    assert client.get("/analyses", params={"limit": main.ANALYSES_MAX_PAGE_SIZE + 1}).status_code == 400
+    assert client.get("/analyses", params={"limit": 0}).status_code == 422
+    assert client.get("/analyses", params={"format": "xml"}).status_code == 422
+
+
+def test_health_answers_while_the_database_threads_are_busy(client):
+    import threading
+
+    import main
+
+    release = threading.Event()
+    blocked = [main.analysis_pool._db_executor.submit(release.wait) for _ in range(main.analysis_pool.db_workers)]
+    try:
+        started = time.perf_counter()
+        response = client.get("/health")
+        assert time.perf_counter() - started < 1
+    finally:
+        release.set()
+        for future in blocked:
+            future.result()
+
+    assert response.status_code == 200
+    workers = response.json()["workers"]
+    assert {"pending", "cpu_in_flight", "db_in_flight"} <= set(workers)
+    assert "jobs" not in response.json()
+
+    counts = client.get("/jobs").json()["jobs"]
+    assert all(isinstance(count, int) for count in counts.values())
+
+
+def test_weighted_coverage_of_older_analyses_is_derived_on_read(client):
+    import main
+
+    analysis = analyze(client, "Older University")
+    # As migration 10 leaves analyses stored before it
+    with main.transaction() as conn:
+        conn.execute(
+            "UPDATE analyses SET weighted_coverage_percentage = NULL WHERE id = ?", (analysis["analysis_id"],)
+        )
+
+    stored = client.get(f"/skills/{analysis['analysis_id']}").json()
+    assert stored["weighted_coverage_percentage"] == analysis["weighted_coverage_percentage"]
+    assert stored["missing_skills"] == analysis["missing_skills"]
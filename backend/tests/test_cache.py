@@ -0,0 +1,45 @@
+import cache
+from cache import ResultCache
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def persisted_keys(result_cache):
+    rows = result_cache._pool.connection().execute("SELECT key FROM cache_entries ORDER BY key")
+    return [key for key, in rows]
+
+
+def test_expired_rows_are_purged_every_n_writes(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    result_cache = ResultCache("test", ttl_seconds=10, persist_path=tmp_path / "cache.db", purge_every=3)
+
+    result_cache.set("a", 1)
+    clock.now += 60
+    result_cache.set("b", 2)
+    result_cache.set("c", 3)
+    # "a" expired, but the next purge is due only on the third write after the first
+    assert persisted_keys(result_cache) == ["a", "b", "c"]
+    assert result_cache.get("a") is None
+
+    result_cache.set_many({"d": 4})
+    assert persisted_keys(result_cache) == ["b", "c", "d"]
+
+
+def test_purge_uses_the_created_at_index(tmp_path):
+    result_cache = ResultCache("test", persist_path=tmp_path / "cache.db")
+    plan = result_cache._pool.connection().execute(
+        "EXPLAIN QUERY PLAN DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?", ("test", 0)
+    ).fetchall()
+    assert any("idx_cache_entries_namespace_created_at" in row[-1] for row in plan)
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    ResultCache("test", persist_path=tmp_path / "cache.db").set("key", {"skills": ["Python"]})
+    assert ResultCache("test", persist_path=tmp_path / "cache.db").get("key") == {"skills": ["Python"]}
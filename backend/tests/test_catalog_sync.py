@@ -0,0 +1,110 @@
+import os
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from catalog import INDUSTRY_SKILL_COLUMNS, current_revision, field_revisions
+from transfer import sync_industry_skills
+
+POPULATE_SCRIPT = Path(__file__).resolve().parents[2] / "database" / "populate_skills.py"
+
+CATALOG = [
+    {"field": "Robotics", "skill_name": "ROS", "category": "Tools", "importance_level": 9, "source": "test"},
+    {"field": "Robotics", "skill_name": "Kinematics", "category": "Theory", "importance_level": 8, "source": "test"},
+    {"field": "Finance", "skill_name": "Excel", "category": "Tools", "importance_level": 7, "source": "test"},
+]
+
+
+def industry_skills(pool):
+    return pool.connection().execute(
+        f"SELECT {', '.join(INDUSTRY_SKILL_COLUMNS)} FROM industry_skills ORDER BY field, skill_name"
+    ).fetchall()
+
+
+def test_second_sync_changes_nothing(db_pool):
+    first = sync_industry_skills(CATALOG, pool=db_pool)
+    assert first == {"inserted": 3, "updated": 0, "deleted": 0, "unchanged": 0}
+    revisions = field_revisions(db_pool.connection())
+    rows = industry_skills(db_pool)
+
+    second = sync_industry_skills(CATALOG, pool=db_pool)
+    assert second == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+    assert field_revisions(db_pool.connection()) == revisions
+    assert industry_skills(db_pool) == rows
+
+
+def test_changed_skill_moves_only_its_field(db_pool):
+    sync_industry_skills(CATALOG, pool=db_pool)
+    revisions = field_revisions(db_pool.connection())
+
+    changed = [dict(CATALOG[0], importance_level=10)] + CATALOG[1:]
+    assert sync_industry_skills(changed, pool=db_pool)["updated"] == 1
+    after = field_revisions(db_pool.connection())
+    assert after["Robotics"] > revisions["Robotics"]
+    assert after["Finance"] == revisions["Finance"]
+
+
+def test_missing_skills_are_pruned_unless_kept(db_pool):
+    sync_industry_skills(CATALOG, pool=db_pool)
+
+    kept = sync_industry_skills(CATALOG[1:], pool=db_pool, prune=False)
+    assert kept == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+    assert len(industry_skills(db_pool)) == 3
+
+    pruned = sync_industry_skills(CATALOG[1:], pool=db_pool)
+    assert pruned["deleted"] == 1
+    assert [row[1] for row in industry_skills(db_pool)] == ["Excel", "Kinematics"]
+
+
+def test_empty_catalog_is_refused(db_pool):
+    sync_industry_skills(CATALOG, pool=db_pool)
+    revision = current_revision(db_pool.connection())
+
+    with pytest.raises(ValueError):
+        sync_industry_skills([], pool=db_pool)
+    assert len(industry_skills(db_pool)) == 3
+    assert current_revision(db_pool.connection()) == revision
+
+    assert sync_industry_skills([], pool=db_pool, prune=False)["deleted"] == 0
+
+
+def test_invalid_record_rolls_back_the_whole_sync(db_pool):
+    sync_industry_skills(CATALOG, pool=db_pool)
+    with pytest.raises(ValueError):
+        sync_industry_skills([dict(CATALOG[0], importance_level=1), {"field": "Robotics"}], pool=db_pool)
+    assert len(industry_skills(db_pool)) == 3
+
+
+def run_populate(tmp_path, *args):
+    env = dict(os.environ, DATABASE_PATH=str(tmp_path / "catalog.db"))
+    return subprocess.run(
+        [sys.executable, str(POPULATE_SCRIPT), *args], env=env, capture_output=True, text=True
+    )
+
+
+def test_populate_script(tmp_path):
+    first = run_populate(tmp_path)
+    assert first.returncode == 0, first.stderr
+    assert " 0 removed" in first.stdout
+
+    second = run_populate(tmp_path)
+    assert second.returncode == 0, second.stderr
+    assert "0 added, 0 updated, 0 removed" in second.stdout
+    revision = first.stdout.split("catalog revision ")[1].split(")")[0]
+    assert f"(catalog revision {revision})" in second.stdout
+
+    extra = tmp_path / "extra.json"
+    extra.write_text(json.dumps(CATALOG[:1]))
+    kept = run_populate(tmp_path, str(extra), "--keep-missing")
+    assert kept.returncode == 0, kept.stderr
+    assert "1 added, 0 updated, 0 removed" in kept.stdout
+
+    empty = tmp_path / "empty.json"
+    empty.write_text("[]")
+    refused = run_populate(tmp_path, str(empty))
+    assert refused.returncode == 1
+    assert "refusing" in refused.stderr
+    assert "0 added, 0 updated, 0 removed" in run_populate(tmp_path, str(extra), "--keep-missing").stdout
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from jobs import JobQueue, JobRunner
+
+
+def age_job(pool, job_id, seconds):
+    updated_at = (datetime.now() - timedelta(seconds=seconds)).isoformat()
+    with pool.transaction() as conn:
+        conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (updated_at, job_id))
+
+
+def test_claim_requeues_running_job_with_expired_lease(db_pool):
+    queue = JobQueue(db_pool, lease_seconds=60)
+    job_id = queue.enqueue("U", "Computer Science", "python")
+    assert queue.claim()["id"] == job_id
+    assert queue.claim() is None
+
+    age_job(db_pool, job_id, 30)
+    assert queue.claim() is None
+
+    age_job(db_pool, job_id, 120)
+    job = queue.claim()
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+
+
+def test_heartbeat_renews_lease(db_pool):
+    queue = JobQueue(db_pool, lease_seconds=60)
+    job_id = queue.enqueue("U", "Computer Science", "python")
+    queue.claim()
+    age_job(db_pool, job_id, 120)
+    queue.heartbeat(job_id)
+    assert queue.claim() is None
+
+
+def test_expired_job_out_of_attempts_fails(db_pool):
+    queue = JobQueue(db_pool, max_attempts=1, lease_seconds=60)
+    job_id = queue.enqueue("U", "Computer Science", "python")
+    queue.claim()
+    age_job(db_pool, job_id, 120)
+    assert queue.claim() is None
+    assert queue.get(job_id)["status"] == "failed"
+
+
+def test_worker_survives_database_errors(db_pool):
+    queue = JobQueue(db_pool)
+    failures = {"claim": 1}
+    handled = []
+
+    class FlakyQueue:
+        def __getattr__(self, name):
+            return getattr(queue, name)
+
+        def claim(self):
+            if failures["claim"]:
+                failures["claim"] -= 1
+                raise RuntimeError("database is locked")
+            return queue.claim()
+
+    async def handler(job, set_stage):
+        await set_stage("nlp")
+        handled.append(job["id"])
+        queue.complete(job["id"], "analysis")
+
+    async def run_db(fn, *args):
+        return fn(*args)
+
+    async def scenario():
+        runner = JobRunner(FlakyQueue(), handler, run_db, workers=1, poll_interval=0.01)
+        runner.start(requeue=False)
+        job_id = queue.enqueue("U", "Computer Science", "python")
+        runner.notify()
+        for _ in range(200):
+            if handled:
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+        return job_id
+
+    job_id = asyncio.run(scenario())
+    assert handled == [job_id]
+    assert queue.get(job_id)["status"] == "succeeded"
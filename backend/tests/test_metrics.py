@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from metrics import Counter, Histogram, Metric, MetricsRegistry, collect, replay
+
+
+def test_metric_subclasses_must_implement_record_and_render():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Missing _record and render", registry=MetricsRegistry())
+
+
+def test_samples_carry_the_process_pid():
+    registry = MetricsRegistry()
+    counter = Counter("pages_total", "Pages", ["source"], registry=registry)
+    histogram = Histogram("stage_seconds", "Stage time", ["stage"], buckets=(0.1, 1.0), registry=registry)
+    counter.inc(3, source="pdf")
+    histogram.observe(0.5, stage="nlp")
+
+    pid = os.getpid()
+    lines = registry.render().splitlines()
+    assert f'pages_total{{pid="{pid}",source="pdf"}} 3.0' in lines
+    assert f'stage_seconds_bucket{{pid="{pid}",stage="nlp",le="0.1"}} 0' in lines
+    assert f'stage_seconds_bucket{{pid="{pid}",stage="nlp",le="+Inf"}} 1' in lines
+    assert f'stage_seconds_count{{pid="{pid}",stage="nlp"}} 1' in lines
+    assert all(f'pid="{pid}"' in line for line in lines if not line.startswith("#"))
+
+
+def test_collected_events_are_applied_by_replay():
+    from metrics import PDF_PAGES
+
+    before = PDF_PAGES.value()
+    with collect() as events:
+        PDF_PAGES.inc(5)
+    assert PDF_PAGES.value() == before
+    replay(events)
+    assert PDF_PAGES.value() == before + 5
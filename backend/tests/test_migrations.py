@@ -0,0 +1,124 @@
+import json
+
+from analysis_store import load_analysis
+from catalog import stale_counts
+from db import ConnectionPool
+from migrations import MIGRATIONS, get_schema_version, run_migrations
+
+# Rows as the JSON-column schema (version 4) stored them
+V4_ANALYSES = [
+    {
+        "id": "a1",
+        "university": "Old University",
+        "field": "Computer Science",
+        "covered_skills": ["Python", "SQL", "Git", "Python"],
+        "missing_skills": ["Docker", "Machine Learning", "C++"],
+        "skill_coverage_percentage": 57.14,
+        "recommendations": [
+            {"title": "Learn Docker", "platform": "Udemy", "url": "https://udemy.com/docker", "description": "Containers"},
+            {"title": "Machine Learning Specialization", "platform": "Coursera",
+             "url": "https://coursera.org/ml", "description": "Comprehensive ML course"},
+            {"title": "Learn C++", "platform": "Search Multiple Platforms", "url": "https://example.com/c++"}
+        ],
+        "created_at": "2024-03-01 10:00:00"
+    },
+    {
+        "id": "a2",
+        "university": "Other University",
+        "field": "Data Science",
+        "covered_skills": ["Statistics", "Python", "Café Analytics"],
+        "missing_skills": ["SQL"],
+        "skill_coverage_percentage": 75.0,
+        "recommendations": [
+            {"title": "Learn Docker", "platform": "Udemy", "url": "https://udemy.com/docker", "description": "Containers"}
+        ],
+        "created_at": "2024-03-02 11:30:00"
+    },
+    {
+        "id": "a3",
+        "university": "Empty University",
+        "field": "Business",
+        "covered_skills": [],
+        "missing_skills": [],
+        "skill_coverage_percentage": 0.0,
+        "recommendations": [],
+        "created_at": "2024-03-03 09:15:00"
+    }
+]
+
+
+def build_v4_database(path) -> ConnectionPool:
+    pool = ConnectionPool(path)
+    with pool.transaction() as conn:
+        for version, _, statements in MIGRATIONS:
+            if version > 4:
+                break
+            for statement in statements:
+                conn.execute(statement)
+        conn.execute("PRAGMA user_version = 4")
+        conn.executemany(
+            """
+            INSERT INTO analyses (id, university, field, covered_skills, missing_skills, skill_coverage_percentage,
+                                  recommendations, syllabus_text, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'text', ?)
+            """,
+            [
+                (row["id"], row["university"], row["field"], json.dumps(row["covered_skills"]),
+                 json.dumps(row["missing_skills"]), row["skill_coverage_percentage"],
+                 json.dumps(row["recommendations"]), row["created_at"])
+                for row in V4_ANALYSES
+            ]
+        )
+        conn.execute(
+            "INSERT INTO industry_skills (field, skill_name, category, importance_level, source) "
+            "VALUES ('Computer Science', 'Python', 'Programming', 10, 'test')"
+        )
+    return pool
+
+
+def test_upgrade_from_json_columns_keeps_every_analysis(tmp_path):
+    pool = build_v4_database(tmp_path / "v4.db")
+    try:
+        assert run_migrations(pool) == MIGRATIONS[-1][0]
+        conn = pool.connection()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(analyses)")}
+        assert not columns & {"covered_skills", "missing_skills", "recommendations"}
+
+        for original in V4_ANALYSES:
+            stored = load_analysis(conn, original["id"])
+            assert stored["university"] == original["university"]
+            assert stored["field"] == original["field"]
+            assert stored["covered_skills"] == original["covered_skills"]
+            assert stored["missing_skills"] == original["missing_skills"]
+            assert stored["recommendations"] == original["recommendations"]
+            assert stored["skill_coverage_percentage"] == original["skill_coverage_percentage"]
+            assert str(stored["created_at"]) == original["created_at"]
+
+        # Recommendations and skills shared between analyses are stored once
+        assert conn.execute("SELECT count(*) FROM recommendations").fetchone()[0] == 3
+        assert conn.execute("SELECT count(*) FROM skills WHERE name = 'Python'").fetchone()[0] == 1
+    finally:
+        pool.close_all()
+
+
+def test_migrations_are_applied_once(tmp_path):
+    pool = build_v4_database(tmp_path / "v4.db")
+    try:
+        version = run_migrations(pool)
+        assert run_migrations(pool) == version == get_schema_version(pool)
+        assert load_analysis(pool.connection(), "a1")["covered_skills"] == V4_ANALYSES[0]["covered_skills"]
+    finally:
+        pool.close_all()
+
+
+def test_upgrade_does_not_mark_existing_analyses_stale(tmp_path):
+    pool = build_v4_database(tmp_path / "v4.db")
+    try:
+        run_migrations(pool)
+        conn = pool.connection()
+        assert stale_counts(conn) == {}
+        assert conn.execute(
+            "SELECT count(*) FROM analyses WHERE catalog_revision != 0 OR weighted_coverage_percentage IS NOT NULL"
+        ).fetchone()[0] == 0
+    finally:
+        pool.close_all()
@@ -0,0 +1,86 @@
+import base64
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from analysis_store import decode_cursor, encode_cursor, insert_analyses, list_analyses
+
+UNIVERSITIES = ["North University", "South University"]
+FIELDS = ["Computer Science", "Data Science"]
+
+
+@pytest.fixture
+def conn(db_pool):
+    """40 analyses over 4 timestamps, so most of them tie on created_at"""
+    analyses = [
+        SimpleNamespace(
+            analysis_id=f"analysis-{number:02d}",
+            university=UNIVERSITIES[number % 2],
+            field=FIELDS[number // 2 % 2],
+            covered_skills=[],
+            missing_skills=[],
+            skill_coverage_percentage=float(number * 2.5),
+            weighted_coverage_percentage=None,
+            recommendations=[],
+            catalog_revision=0,
+            created_at=f"2024-06-0{1 + number % 4} 08:00:00"
+        )
+        for number in range(40)
+    ]
+    with db_pool.transaction() as conn:
+        insert_analyses(conn, [(analysis, "") for analysis in analyses], keep_created_at=True)
+    return db_pool.connection()
+
+
+def walk(conn, page_size, **filters):
+    """Every row, following cursors page by page"""
+    rows, after = [], None
+    while True:
+        page = list_analyses(conn, page_size, after, **filters)
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        after = decode_cursor(encode_cursor(page[-1]))
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 10, 40, 100])
+@pytest.mark.parametrize("filters", [
+    {},
+    {"university": "North University"},
+    {"field": "Data Science", "min_coverage": 20.0},
+    {"university": "South University", "field": "Computer Science", "max_coverage": 60.0},
+    {"min_coverage": 30.0, "max_coverage": 70.0},
+])
+def test_walking_every_page_has_no_gaps_or_duplicates(conn, page_size, filters):
+    expected = conn.execute("""
+        SELECT id FROM analyses
+        WHERE university = coalesce(?, university) AND field = coalesce(?, field)
+          AND skill_coverage_percentage >= coalesce(?, 0) AND skill_coverage_percentage <= coalesce(?, 100)
+        ORDER BY created_at DESC, id DESC
+    """, (filters.get("university"), filters.get("field"), filters.get("min_coverage"),
+          filters.get("max_coverage"))).fetchall()
+
+    rows = walk(conn, page_size, **filters)
+    assert [row[0] for row in rows] == [row[0] for row in expected]
+    assert len({row[0] for row in rows}) == len(rows)
+
+
+def test_pages_are_ordered_newest_first_with_ties_broken_by_id(conn):
+    keys = [(row[4], row[0]) for row in walk(conn, 7)]
+    assert keys == sorted(keys, reverse=True)
+    assert max(len(list(group)) for _, group in itertools.groupby(keys, key=lambda key: key[0])) == 10
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'["2024-06-01 08:00:00"]').decode(),
+    base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    base64.urlsafe_b64encode(b'{"created_at": 1}').decode(),
+    base64.urlsafe_b64encode(b"5").decode(),
+    "é",
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,66 @@
+import asyncio
+
+import fitz
+import pytest
+from fastapi import HTTPException
+
+import pdf_extraction
+from pdf_extraction import extract_page_range, extract_text_from_pdf_file, extract_text_parallel
+
+
+async def run_inline(function, *args):
+    return function(*args)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """A 12-page PDF whose page i reads "Page i python"""
+    path = tmp_path / "syllabus.pdf"
+    with fitz.open() as doc:
+        for number in range(12):
+            doc.new_page().insert_text((72, 72), f"Page {number} python")
+        doc.save(str(path))
+    return str(path)
+
+
+def test_parallel_extraction_keeps_page_order(pdf_path):
+    text = asyncio.run(extract_text_parallel(pdf_path, run_inline, 4))
+    assert [line for line in text.splitlines() if line] == [f"Page {number} python" for number in range(12)]
+    assert text == extract_text_from_pdf_file(pdf_path)
+
+
+def test_pdf_over_page_limit_is_rejected(pdf_path):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(extract_text_parallel(pdf_path, run_inline, 4, max_pages=10))
+    assert error.value.status_code == 413
+    assert "12 pages" in error.value.detail
+
+    with pytest.raises(HTTPException) as error:
+        extract_text_from_pdf_file(pdf_path, max_pages=10)
+    assert error.value.status_code == 413
+
+
+def test_pdf_over_time_budget_is_rejected(pdf_path):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(extract_text_parallel(pdf_path, run_inline, 4, time_budget=-1))
+    assert error.value.status_code == 422
+
+
+def test_range_falls_back_to_pdfplumber_when_pymupdf_fails(pdf_path, monkeypatch):
+    expected = extract_page_range(pdf_path, 3, 6, float("inf"))
+
+    def broken_open(*args, **kwargs):
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(pdf_extraction.fitz, "open", broken_open)
+    pages = extract_page_range(pdf_path, 3, 6, float("inf"))
+    assert [number for number, _ in pages] == [3, 4, 5]
+    assert [text.strip() for _, text in pages] == [text.strip() for _, text in expected]
+
+
+def test_unreadable_range_is_rejected(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+    with pytest.raises(HTTPException) as error:
+        extract_page_range(str(path), 0, 2, float("inf"))
+    assert error.value.status_code == 400
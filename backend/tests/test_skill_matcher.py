@@ -0,0 +1,116 @@
+import random
+import re
+
+import pytest
+from fuzzywuzzy import fuzz, process
+
+from skill_registry import get_registry
+
+FIELDS = ["Computer Science", "Engineering", "Data Science", "Business"]
+
+NOISE = (
+    "switching swimming c++ c# c cpp java javascript jav pyhton python3 sqlite nosql react.js node.js go golang "
+    "r rust rusty kotlin scalable matlab auto cad docker dockers kubernetes k8s aws azure gcp linux unix "
+    "networking networks statistics statistic algorithms data machine learning deep neural excel tableau "
+    "power bi git github swift swiftui"
+).split()
+
+
+# The regexes the pattern-table scan replaces
+PATTERNS = [
+    r'\b(python|java|javascript|typescript|c\+\+|c#|go|rust|swift|kotlin|php|ruby|scala|r\b)\b',
+    r'\b(html|css|sql|nosql|xml|json|yaml)\b',
+    r'\b(react|angular|vue\.?js|node\.?js|express|django|flask|spring|laravel)\b',
+    r'\b(tensorflow|pytorch|keras|scikit-learn|pandas|numpy|opencv)\b',
+    r'\b(git|github|gitlab|docker|kubernetes|aws|azure|gcp|jenkins)\b',
+    r'\b(matlab|autocad|solidworks|tableau|power\s?bi)\b',
+    r'\b(mysql|postgresql|mongodb|redis|elasticsearch|oracle|sql\s?server)\b',
+    r'\b(machine\s?learning|deep\s?learning|neural\s?networks|api|microservices)\b',
+    r'\b(devops|agile|scrum|ci/cd|version\s?control)\b'
+]
+
+TEXT_WORDS = NOISE + "power bi powerbi sql server machine learning version control vue.js vuejs nodejs ci/cd".split()
+
+
+def random_texts(seed, count=200):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(TEXT_WORDS) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+
+def keyword_scan(text, skills):
+    """The original per-skill scan that SkillMatcher.match replaces"""
+    found_skills = []
+    text_words = set(text.lower().split())
+    for skill in skills:
+        skill_lower = skill.lower()
+        if skill_lower in text.lower():
+            found_skills.append(skill)
+        elif len(skill_lower.split()) == 1:
+            match = process.extractOne(skill_lower, text_words, scorer=fuzz.ratio)
+            if match and match[1] > 85:
+                found_skills.append(skill)
+        elif all(word in text_words for word in skill_lower.split()):
+            found_skills.append(skill)
+    return found_skills
+
+
+def pattern_scan(text):
+    """The original regex scan that SkillMatcher.match_patterns replaces"""
+    return {match.replace('_', ' ').title() for pattern in PATTERNS for match in re.findall(pattern, text.lower())}
+
+
+def extract_one(candidate, skills, threshold):
+    """The original per-candidate lookup that best_matches replaces"""
+    match = process.extractOne(candidate.lower(), [skill.lower() for skill in skills])
+    if match and match[1] > threshold:
+        return [next(skill for skill in skills if skill.lower() == match[0])]
+    return []
+
+
+@pytest.mark.parametrize("field, candidate, expected", [
+    ("Computer Science", "c++", ["C++"]),
+    ("Computer Science", "c", ["C++"]),
+    ("Computer Science", "cpp", ["C++"]),
+    ("Computer Science", "swift", ["Swift"]),
+    # fuzzywuzzy scores these 72 and 60; rapidfuzz's WRatio alone would match "switching" to Swift
+    ("Computer Science", "switching", []),
+    ("Computer Science", "swimming", []),
+    ("Engineering", "c++", ["AutoCAD"]),
+    ("Engineering", "c++ programming", ["PLC Programming"]),
+])
+def test_best_matches_pinned(field, candidate, expected):
+    skills = list(get_registry().skills_for_field(field))
+    assert get_registry().matcher(skills).best_matches([candidate], threshold=75) == expected
+
+
+@pytest.mark.parametrize("field", FIELDS)
+@pytest.mark.parametrize("threshold", [75, 80])
+def test_best_matches_equals_extract_one(field, threshold):
+    rng = random.Random(field)
+    skills = list(get_registry().skills_for_field(field))
+    candidates = NOISE + [" ".join(rng.sample(NOISE, 2)) for _ in range(150)]
+    matcher = get_registry().matcher(skills)
+
+    for candidate in candidates:
+        assert matcher.best_matches([candidate], threshold) == extract_one(candidate, skills, threshold), candidate
+
+
+def test_best_matches_keeps_candidate_order_and_duplicates():
+    skills = list(get_registry().skills_for_field("Computer Science"))
+    matches = get_registry().matcher(skills).best_matches(["Python", "switching", "Swift", "python"], threshold=80)
+    assert matches == ["Python", "Swift", "Python"]
+
+
+@pytest.mark.parametrize("field", FIELDS)
+def test_match_equals_keyword_scan(field):
+    skills = list(get_registry().skills_for_field(field))
+    matcher = get_registry().matcher(skills)
+    for text in random_texts(field):
+        assert matcher.match(text) == keyword_scan(text, skills), text
+
+
+def test_match_patterns_finds_the_regex_matches():
+    # The caller merges pattern matches into a set, so only the set has to agree
+    matcher = get_registry().matcher()
+    for text in random_texts("patterns", 400):
+        assert set(matcher.match_patterns(matcher.scan(text))) == pattern_scan(text), text
@@ -0,0 +1,7 @@
+from check_import_time import IMPORT_TIME_BUDGET, LAZY_MODULES, measure_import
+
+
+def test_import_is_fast_and_loads_nlp_lazily():
+    elapsed, loaded, _ = measure_import()
+    assert loaded == [], f"imported at startup instead of lazily: {loaded} (must stay lazy: {LAZY_MODULES})"
+    assert elapsed <= IMPORT_TIME_BUDGET, f"import took {elapsed:.3f}s, over the {IMPORT_TIME_BUDGET:.3f}s budget"
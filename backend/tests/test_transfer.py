@@ -0,0 +1,68 @@
+import os
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from analysis_store import list_analyses
+from transfer import import_records
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SKILL = {"field": "Robotics", "skill_name": "ROS", "category": "Tools", "importance_level": 4, "source": "test"}
+
+
+def run_cli(tmp_path, *args):
+    env = dict(os.environ, DATABASE_PATH=str(tmp_path / "cli.db"))
+    return subprocess.run(
+        [sys.executable, "transfer.py", *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+
+
+@pytest.mark.parametrize("name, content, extra", [
+    ("skills.json", json.dumps([SKILL]), ()),
+    ("skills.txt", json.dumps([SKILL]), ("--format", "json")),
+    ("skills.txt", json.dumps(SKILL) + "\n", ("--format", "ndjson")),
+])
+def test_cli_import_accepts_the_endpoint_formats(tmp_path, name, content, extra):
+    path = tmp_path / name
+    path.write_text(content)
+
+    result = run_cli(tmp_path, "import", "industry_skills", str(path), *extra)
+    assert result.returncode == 0, result.stderr
+    assert "industry_skills: 1 inserted" in result.stdout
+
+    exported = run_cli(tmp_path, "export", "industry_skills", "--format", "ndjson")
+    assert {"field": "Robotics", "skill_name": "ROS"}.items() <= json.loads(
+        next(line for line in exported.stdout.splitlines() if '"Robotics"' in line)
+    ).items()
+
+
+def analysis_record(analysis_id, created_at):
+    return {
+        "analysis_id": analysis_id, "university": "Import University", "field": "Robotics",
+        "covered_skills": ["ROS"], "missing_skills": [], "skill_coverage_percentage": 100.0,
+        "created_at": created_at
+    }
+
+
+def test_imported_timestamps_share_one_form(db_pool):
+    import_records("analyses", [
+        analysis_record("space", "2024-05-01 10:00:00"),
+        analysis_record("separator", "2024-05-01T09:00:00"),
+        analysis_record("offset", "2024-05-01T12:30:00+02:00"),
+        analysis_record("date", "2024-05-02"),
+    ], pool=db_pool)
+
+    rows = list_analyses(db_pool.connection(), 10)
+    assert [(row[0], row[4]) for row in rows] == [
+        ("date", "2024-05-02 00:00:00"),
+        ("offset", "2024-05-01 10:30:00"),
+        ("space", "2024-05-01 10:00:00"),
+        ("separator", "2024-05-01 09:00:00"),
+    ]
+
+    with pytest.raises(ValueError, match="Record 1 is invalid"):
+        import_records("analyses", [analysis_record("bad", "yesterday")], pool=db_pool)
@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+import pytest
+
+from workers import AnalysisPool
+
+
+@pytest.mark.parametrize("start_method", [None, "spawn"])
+def test_restart_cpu_workers_swaps_pool_without_blocking_loop(start_method):
+    pool = AnalysisPool(mode="process", cpu_workers=2, start_method=start_method)
+
+    async def scenario():
+        before = await pool.run_cpu(os.getpid)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        await pool.restart_cpu_workers()
+        task.cancel()
+        after = await pool.run_cpu(os.getpid)
+        return before, after, ticks
+
+    try:
+        pool.start()
+        before, after, ticks = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert before != after
+    # The event loop kept running while the new workers started
+    assert ticks > 1
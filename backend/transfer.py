@@ -0,0 +1,480 @@
+"""Export and import the analyses and industry_skills tables as NDJSON, CSV or Parquet.
+
+Run from the backend directory:
+
+    python transfer.py export analyses --output analyses.ndjson
+    python transfer.py export industry_skills --format csv > catalog.csv
+    python transfer.py import analyses analyses.parquet
+
+Exports read one consistent snapshot of the database in chunks with
+fetchmany, so memory use does not grow with the table. Imports run in
+batched transactions: analyses that already exist are skipped, and industry
+skills are updated by (field, skill_name). Imports also accept a JSON array
+of records. Parquet needs pyarrow.
+"""
+import io
+import os
+import csv
+import sys
+import json
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from analysis_store import insert_analyses, load_analyses
+from catalog import apply_staged_industry_skills, stage_industry_skills
+from db import ConnectionPool, pool as default_pool
+
+TRANSFER_CHUNK_SIZE = int(os.getenv("TRANSFER_CHUNK_SIZE", "500"))
+PARQUET_BLOCK_BYTES = 1024 * 1024
+
+JSON_READ_CHARS = 64 * 1024
+
+FORMATS = ("ndjson", "csv", "parquet")
+INPUT_FORMATS = FORMATS + ("json",)
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+EXTENSIONS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet", ".json": "json"}
+
+TABLE_COLUMNS = {
+    "analyses": (
+        "analysis_id", "university", "field", "covered_skills", "missing_skills", "skill_coverage_percentage",
+        "recommendations", "weighted_coverage_percentage", "catalog_revision", "created_at", "syllabus_text"
+    ),
+    "industry_skills": ("field", "skill_name", "category", "importance_level", "source")
+}
+TABLES = tuple(TABLE_COLUMNS)
+REQUIRED_COLUMNS = {
+    "analyses": ("analysis_id", "university", "field", "covered_skills", "missing_skills", "skill_coverage_percentage"),
+    "industry_skills": ("field", "skill_name", "category", "importance_level", "source")
+}
+
+# Columns holding lists, written as JSON text in CSV cells
+JSON_COLUMNS = {"covered_skills", "missing_skills", "recommendations"}
+INTEGER_COLUMNS = {"catalog_revision", "importance_level"}
+FLOAT_COLUMNS = {"skill_coverage_percentage", "weighted_coverage_percentage"}
+
+SELECT_INDUSTRY_SKILLS = """
+    SELECT field, skill_name, category, importance_level, source FROM industry_skills
+    ORDER BY field, importance_level DESC, skill_name
+"""
+
+
+def check_table(table: str):
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table '{table}', expected one of {TABLES}")
+
+
+def format_from_filename(filename: Optional[str], default: str = "ndjson") -> str:
+    """Format implied by a file extension"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    return EXTENSIONS.get(extension, default)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet support requires pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def parquet_available() -> bool:
+    try:
+        _pyarrow()
+    except ValueError:
+        return False
+    return True
+
+
+def parquet_schema(table: str):
+    pa, _ = _pyarrow()
+    if table == "industry_skills":
+        return pa.schema([
+            ("field", pa.string()), ("skill_name", pa.string()), ("category", pa.string()),
+            ("importance_level", pa.int64()), ("source", pa.string())
+        ])
+    recommendation = pa.struct([(name, pa.string()) for name in ("title", "platform", "url", "description")])
+    return pa.schema([
+        ("analysis_id", pa.string()), ("university", pa.string()), ("field", pa.string()),
+        ("covered_skills", pa.list_(pa.string())), ("missing_skills", pa.list_(pa.string())),
+        ("skill_coverage_percentage", pa.float64()), ("recommendations", pa.list_(recommendation)),
+        ("weighted_coverage_percentage", pa.float64()),
+        ("catalog_revision", pa.int64()), ("created_at", pa.string()), ("syllabus_text", pa.string())
+    ])
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_records(
+    table: str, chunk_size: int = TRANSFER_CHUNK_SIZE, pool: ConnectionPool = default_pool
+) -> Iterator[Dict[str, Any]]:
+    """Rows of a table as dicts, read chunk by chunk from one snapshot of the database.
+
+    Uses its own connection, so the generator can be advanced from any thread.
+    """
+    check_table(table)
+    conn = sqlite3.connect(pool.path, isolation_level=None, check_same_thread=False)
+    try:
+        conn.execute("BEGIN")
+        if table == "industry_skills":
+            cursor = conn.execute(SELECT_INDUSTRY_SKILLS)
+            while rows := cursor.fetchmany(chunk_size):
+                for row in rows:
+                    yield dict(zip(TABLE_COLUMNS[table], row))
+        else:
+            cursor = conn.execute("SELECT id, syllabus_text FROM analyses ORDER BY created_at, id")
+            while rows := cursor.fetchmany(chunk_size):
+                stored = load_analyses(conn, [analysis_id for analysis_id, _ in rows])
+                for analysis_id, syllabus_text in rows:
+                    yield {**stored[analysis_id], "syllabus_text": syllabus_text}
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def ndjson_chunks(records: Iterable[Dict[str, Any]], chunk_size: int = TRANSFER_CHUNK_SIZE) -> Iterator[str]:
+    for batch in _batches(records, chunk_size):
+        yield "".join(json.dumps(record) + "\n" for record in batch)
+
+
+def csv_chunks(
+    records: Iterable[Dict[str, Any]], columns: Tuple[str, ...], chunk_size: int = TRANSFER_CHUNK_SIZE
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in _batches(records, chunk_size):
+        for record in batch:
+            writer.writerow([
+                json.dumps(record.get(column)) if column in JSON_COLUMNS else record.get(column)
+                for column in columns
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_parquet(
+    records: Iterable[Dict[str, Any]], table: str, sink: Union[str, BinaryIO], chunk_size: int = TRANSFER_CHUNK_SIZE
+):
+    """Write records as Parquet, one row group per chunk"""
+    pa, pq = _pyarrow()
+    schema = parquet_schema(table)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in _batches(records, chunk_size):
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+
+def parquet_chunks(
+    records: Iterable[Dict[str, Any]], table: str, chunk_size: int = TRANSFER_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Parquet file contents in blocks; the footer comes last, so the file is spooled to disk first"""
+    with tempfile.TemporaryFile() as spool:
+        write_parquet(records, table, spool, chunk_size)
+        spool.seek(0)
+        while block := spool.read(PARQUET_BLOCK_BYTES):
+            yield block
+
+
+def export_chunks(
+    table: str, fmt: str, chunk_size: int = TRANSFER_CHUNK_SIZE, pool: ConnectionPool = default_pool
+) -> Iterator[Union[str, bytes]]:
+    """Serialized export of a table, chunk by chunk"""
+    check_table(table)
+    records = iter_records(table, chunk_size, pool)
+    if fmt == "ndjson":
+        return ndjson_chunks(records, chunk_size)
+    if fmt == "csv":
+        return csv_chunks(records, TABLE_COLUMNS[table], chunk_size)
+    if fmt == "parquet":
+        _pyarrow()
+        return parquet_chunks(records, table, chunk_size)
+    raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+
+
+def _csv_value(column: str, value: str) -> Any:
+    if value == "":
+        return None
+    if column in JSON_COLUMNS:
+        return json.loads(value)
+    if column in INTEGER_COLUMNS:
+        return int(value)
+    if column in FLOAT_COLUMNS:
+        return float(value)
+    return value
+
+
+def _json_array_records(text: io.TextIOBase) -> Iterator[Any]:
+    """Elements of a top-level JSON array, decoded one at a time from reads of JSON_READ_CHARS characters"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    expect = "["
+    while True:
+        # Skip whitespace and the expected separator, reading more when the buffer runs out
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                break
+            buffer, position = text.read(JSON_READ_CHARS), 0
+            if not buffer:
+                raise ValueError("JSON input ended before the closing ]")
+
+        character = buffer[position]
+        if expect == "[":
+            if character != "[":
+                raise ValueError("JSON input must be an array of records")
+            position += 1
+            expect = "first"
+            continue
+        if character == "]" and expect != "value":
+            return
+        if expect == ",":
+            if character != ",":
+                raise ValueError(f"Expected , or ] in JSON input, found {character!r}")
+            position += 1
+            expect = "value"
+            continue
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next read
+                if end < len(buffer):
+                    break
+            except ValueError:
+                element = None
+            more = text.read(JSON_READ_CHARS)
+            if not more:
+                if element is None:
+                    raise ValueError("JSON input is not a valid array of records")
+                break
+            buffer = buffer[position:] + more
+            position = 0
+        position = end
+        expect = ","
+        yield element
+
+
+def read_records(stream: BinaryIO, fmt: str, chunk_size: int = TRANSFER_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Records of an NDJSON, JSON, CSV or Parquet file, read incrementally"""
+    if fmt == "parquet":
+        _, pq = _pyarrow()
+        for batch in pq.ParquetFile(stream).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+        return
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {INPUT_FORMATS}")
+
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="" if fmt == "csv" else None)
+    try:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(text), 1):
+                try:
+                    yield {column: _csv_value(column, value) for column, value in row.items() if column}
+                except ValueError as e:
+                    raise ValueError(f"Row {number} is invalid: {e}")
+        elif fmt == "json":
+            for number, record in enumerate(_json_array_records(text), 1):
+                if not isinstance(record, dict):
+                    raise ValueError(f"Element {number} is not a JSON object")
+                yield record
+        else:
+            for number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Line {number} is not valid JSON: {e}")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {number} is not a JSON object")
+                yield record
+    finally:
+        # Leave the caller's stream open
+        text.detach()
+
+
+def _validate(table: str, record: Dict[str, Any], number: int):
+    missing = [column for column in REQUIRED_COLUMNS[table] if record.get(column) is None]
+    if missing:
+        raise ValueError(f"Record {number} lacks {', '.join(missing)}")
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _timestamp(value: Any) -> str:
+    """An ISO 8601 timestamp in the UTC 'YYYY-MM-DD HH:MM:SS' form SQLite's CURRENT_TIMESTAMP stores,
+    so imported analyses sort among the others whichever separator or offset they were exported with"""
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat(sep=" ")
+
+
+def _analysis_from_record(record: Dict[str, Any], now: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        analysis_id=str(record["analysis_id"]),
+        university=str(record["university"]),
+        field=str(record["field"]),
+        covered_skills=[str(skill) for skill in record["covered_skills"]],
+        missing_skills=[str(skill) for skill in record["missing_skills"]],
+        skill_coverage_percentage=float(record["skill_coverage_percentage"]),
+        recommendations=[
+            {name: value for name, value in dict(recommendation).items() if value}
+            for recommendation in record.get("recommendations") or []
+        ],
+        weighted_coverage_percentage=_optional_float(record.get("weighted_coverage_percentage")),
+        # Revisions are local to a database: compare imported analyses with this catalog again
+        catalog_revision=-1,
+        created_at=_timestamp(record["created_at"]) if record.get("created_at") else now
+    )
+
+
+def _import_analyses(conn: sqlite3.Connection, batch: List[Tuple[int, Dict[str, Any]]], counts: Dict[str, int]):
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    analyses = {}
+    for number, record in batch:
+        try:
+            analysis = _analysis_from_record(record, now)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Record {number} is invalid: {e}")
+        analyses.setdefault(analysis.analysis_id, (analysis, str(record.get("syllabus_text") or "")))
+
+    placeholders = ", ".join("?" * len(analyses))
+    existing = {
+        row[0] for row in conn.execute(f"SELECT id FROM analyses WHERE id IN ({placeholders})", list(analyses))
+    }
+    new = [pair for analysis_id, pair in analyses.items() if analysis_id not in existing]
+    if new:
+        insert_analyses(conn, new, keep_created_at=True)
+    counts["inserted"] += len(new)
+    counts["unchanged"] += len(batch) - len(new)
+
+
+def _import_industry_skills(
+    conn: sqlite3.Connection, batch: List[Tuple[int, Dict[str, Any]]], counts: Dict[str, int]
+):
+    stage_industry_skills(conn, [record for _, record in batch], first=batch[0][0])
+    diff = apply_staged_industry_skills(conn)
+    for name in counts:
+        counts[name] += diff[name]
+
+
+def import_records(
+    table: str,
+    records: Iterable[Dict[str, Any]],
+    batch_size: int = TRANSFER_CHUNK_SIZE,
+    pool: ConnectionPool = default_pool
+) -> Dict[str, int]:
+    """Import records in transactions of batch_size; returns inserted/updated/unchanged counts.
+
+    Each committed batch stays committed if a later record is invalid.
+    """
+    check_table(table)
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    import_batch = _import_analyses if table == "analyses" else _import_industry_skills
+
+    for batch in _batches(enumerate(records, 1), batch_size):
+        for number, record in batch:
+            _validate(table, record, number)
+        with pool.transaction() as conn:
+            import_batch(conn, batch, counts)
+    return counts
+
+
+def sync_industry_skills(
+    records: Iterable[Dict[str, Any]],
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    pool: ConnectionPool = default_pool,
+    prune: bool = True
+) -> Dict[str, int]:
+    """Make industry_skills equal to a catalog in one transaction; returns inserted/updated/deleted/unchanged counts.
+
+    Records are staged chunk by chunk and only the difference is written, so
+    readers see either the old or the new catalog, never an empty table, and
+    fields whose skills did not change keep their catalog revision. Without
+    prune, skills missing from the catalog are kept.
+    """
+    with pool.transaction() as conn:
+        staged = 0
+        for batch in _batches(enumerate(records, 1), chunk_size):
+            staged += stage_industry_skills(conn, [record for _, record in batch], first=batch[0][0])
+        if not staged and prune:
+            raise ValueError("The catalog has no records; refusing to delete every industry skill")
+        return apply_staged_industry_skills(conn, prune)
+
+
+def import_stream(
+    table: str, stream: BinaryIO, fmt: str, batch_size: int = TRANSFER_CHUNK_SIZE, pool: ConnectionPool = default_pool
+) -> Dict[str, int]:
+    """Import an NDJSON, CSV or Parquet file object into a table"""
+    check_table(table)
+    return import_records(table, read_records(stream, fmt, batch_size), batch_size, pool)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import analyses and industry skills")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="write a table to a file or stdout")
+    export_parser.add_argument("table", choices=TABLES)
+    export_parser.add_argument("--output", "-o", help="file to write (default: stdout)")
+    export_parser.add_argument("--format", "-f", choices=FORMATS, help="default: from the output extension, else ndjson")
+
+    import_parser = commands.add_parser("import", help="load a file into a table")
+    import_parser.add_argument("table", choices=TABLES)
+    import_parser.add_argument("input")
+    import_parser.add_argument("--format", "-f", choices=INPUT_FORMATS, help="default: from the input extension")
+
+    for command_parser in (export_parser, import_parser):
+        command_parser.add_argument("--chunk-size", type=int, default=TRANSFER_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from migrations import run_migrations
+    run_migrations()
+
+    try:
+        if args.command == "export":
+            fmt = args.format or format_from_filename(args.output)
+            output = open(args.output, "wb") if args.output else sys.stdout.buffer
+            try:
+                for chunk in export_chunks(args.table, fmt, args.chunk_size):
+                    output.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+            finally:
+                if args.output:
+                    output.close()
+        else:
+            fmt = args.format or format_from_filename(args.input, default="")
+            if not fmt:
+                parser.error("cannot tell the format from the file name, pass --format")
+            with open(args.input, "rb") as stream:
+                counts = import_stream(args.table, stream, fmt, args.chunk_size)
+            print(f"{args.table}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                  f"{counts['unchanged']} unchanged")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
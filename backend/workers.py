@@ -0,0 +1,195 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+
+import metrics
+
+EXECUTION_MODES = ("process", "thread", "inline")
+
+
+def _invoke(fn: Callable, args: Tuple) -> Tuple[bool, Any, list]:
+    """Run fn inside a worker, turning HTTPExceptions into picklable tuples.
+
+    Metrics recorded by fn are returned alongside the result so the server
+    process can apply them, wherever fn ran.
+    """
+    with metrics.collect() as events:
+        try:
+            return True, fn(*args), events
+        except HTTPException as e:
+            return False, (e.status_code, e.detail), events
+
+
+def _warm_up() -> int:
+    """No-op task used to fork the process workers at startup"""
+    return os.getpid()
+
+
+class AnalysisPool:
+    """Executes the CPU-bound and blocking stages of an analysis off the event loop.
+
+    CPU stages (PDF extraction, NLP) run in a process pool, thread pool or inline
+    depending on the execution mode; database I/O always runs in a thread pool.
+    Admission is bounded: once max_pending analyses are in flight, new requests
+    are rejected with 503 so that clients back off instead of piling up.
+
+    start_method picks how process workers are created. The platform default
+    (fork on Linux) lets workers share models loaded in the server process
+    copy-on-write; forkserver or spawn avoid forking a process that already
+    runs threads, at the cost of each worker loading models itself.
+    """
+
+    def __init__(
+        self,
+        mode: str = "process",
+        cpu_workers: Optional[int] = None,
+        db_workers: int = 4,
+        max_pending: Optional[int] = None,
+        retry_after: int = 5,
+        start_method: Optional[str] = None
+    ):
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}', expected one of {EXECUTION_MODES}")
+
+        self.mode = mode
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.db_workers = db_workers
+        self.max_pending = max_pending or self.cpu_workers * 4
+        self.retry_after = retry_after
+        self.pending = 0
+        # Calls awaiting or running in each executor; only touched on the event loop
+        self.cpu_in_flight = 0
+        self.db_in_flight = 0
+        self._mp_context = multiprocessing.get_context(start_method)
+        self._cpu_executor = None
+        self._db_executor = None
+        self._restart_lock = asyncio.Lock()
+
+    def _create_process_executor(self) -> ProcessPoolExecutor:
+        """A process pool whose workers have all been started"""
+        executor = ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=self._mp_context)
+        for future in [executor.submit(_warm_up) for _ in range(self.cpu_workers)]:
+            future.result()
+        return executor
+
+    def start(self):
+        """Create the executors and fork process workers before any threads start"""
+        if self.mode == "process" and self._cpu_executor is None:
+            self._cpu_executor = self._create_process_executor()
+        elif self.mode == "thread" and self._cpu_executor is None:
+            self._cpu_executor = ThreadPoolExecutor(
+                max_workers=self.cpu_workers, thread_name_prefix="analysis-cpu"
+            )
+
+        if self._db_executor is None:
+            self._db_executor = ThreadPoolExecutor(
+                max_workers=self.db_workers, thread_name_prefix="analysis-db"
+            )
+
+    async def restart_cpu_workers(self):
+        """Replace the process workers so they start from the parent's current state.
+
+        The new workers are started and warmed up in a thread, off the event
+        loop; the old pool keeps serving until the new one is swapped in, and
+        finishes the tasks it already has.
+        """
+        if self.mode != "process" or self._cpu_executor is None:
+            return
+
+        async with self._restart_lock:
+            new_executor = await asyncio.to_thread(self._create_process_executor)
+            old_executor, self._cpu_executor = self._cpu_executor, new_executor
+            old_executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop all executors, waiting for running tasks to finish"""
+        for executor in (self._cpu_executor, self._db_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._cpu_executor = None
+        self._db_executor = None
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_pending
+
+    @asynccontextmanager
+    async def admit(self):
+        """Reserve a slot for one analysis or reject the request with 503"""
+        if self.saturated:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy analyzing other syllabi, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def run_cpu(self, fn: Callable, *args) -> Any:
+        """Run a CPU-bound function according to the execution mode"""
+        if self.mode == "inline":
+            ok, result, events = _invoke(fn, args)
+        else:
+            if self._cpu_executor is None:
+                self.start()
+
+            loop = asyncio.get_running_loop()
+            self.cpu_in_flight += 1
+            try:
+                ok, result, events = await loop.run_in_executor(self._cpu_executor, _invoke, fn, args)
+            finally:
+                self.cpu_in_flight -= 1
+
+        metrics.replay(events)
+        if not ok:
+            status_code, detail = result
+            raise HTTPException(status_code=status_code, detail=detail)
+        return result
+
+    async def run_db(self, fn: Callable, *args) -> Any:
+        """Run a blocking database function in the I/O thread pool"""
+        if self._db_executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        self.db_in_flight += 1
+        try:
+            return await loop.run_in_executor(self._db_executor, fn, *args)
+        finally:
+            self.db_in_flight -= 1
+
+    def stats(self) -> dict:
+        """Current pool configuration and load"""
+        return {
+            "mode": self.mode,
+            "cpu_workers": self.cpu_workers,
+            "db_workers": self.db_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "cpu_in_flight": self.cpu_in_flight,
+            "db_in_flight": self.db_in_flight
+        }
+
+
+def create_pool_from_env() -> AnalysisPool:
+    """Build the analysis pool from ANALYSIS_* environment variables"""
+    cpu_workers = os.getenv("ANALYSIS_WORKERS")
+    max_pending = os.getenv("ANALYSIS_MAX_PENDING")
+
+    return AnalysisPool(
+        mode=os.getenv("ANALYSIS_EXECUTION_MODE", "process").lower(),
+        cpu_workers=int(cpu_workers) if cpu_workers else None,
+        db_workers=int(os.getenv("ANALYSIS_DB_WORKERS", "4")),
+        max_pending=int(max_pending) if max_pending else None,
+        retry_after=int(os.getenv("ANALYSIS_RETRY_AFTER", "5")),
+        start_method=os.getenv("ANALYSIS_START_METHOD") or None
+    )
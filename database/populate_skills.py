@@ -1,8 +1,30 @@
-import sqlite3
-import json
+"""Load the industry skill catalog into the backend database.
+
+    python populate_skills.py                      # the builtin catalog below
+    python populate_skills.py catalog.csv          # an external CSV, NDJSON, JSON or Parquet catalog
+    python populate_skills.py extra.json --keep-missing
+
+Catalog files hold field, skill_name, category, importance_level and source
+for every skill. The database is the backend's DATABASE_PATH. The load is an
+upsert keyed on (field, skill_name) inside one transaction: only skills that
+differ are written, skills missing from the catalog are deleted unless
+--keep-missing is given, and running it twice changes nothing. Fields whose
+skills changed move to a new catalog revision, which the API picks up to
+recompute the analyses of those fields.
+"""
+import sys
+import argparse
 from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from catalog import INDUSTRY_SKILL_COLUMNS, current_revision
+from db import DATABASE_PATH, ConnectionPool
+from migrations import run_migrations
+from transfer import INPUT_FORMATS, TRANSFER_CHUNK_SIZE, format_from_filename, read_records, sync_industry_skills
 
-DATABASE_PATH = Path(__file__).parent.parent / "backend" / "database" / "skill_predictor.db"
 DATABASE_PATH.parent.mkdir(exist_ok=True)
 
 def create_comprehensive_skills_data():
@@ -160,58 +182,67 @@ def create_comprehensive_skills_data():
     
     return skills_data
 
-def populate_industry_skills():
-    """Populate the database with comprehensive industry skills"""
+def populate_industry_skills(
+    catalog_path: Optional[str] = None,
+    fmt: Optional[str] = None,
+    prune: bool = True,
+    chunk_size: int = TRANSFER_CHUNK_SIZE
+):
+    """Bring the industry_skills table in line with the builtin catalog or a catalog file"""
+    pool = ConnectionPool(DATABASE_PATH)
+    run_migrations(pool)
 
-    DATABASE_PATH.parent.mkdir(exist_ok=True)
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS industry_skills (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            field TEXT NOT NULL,
-            skill_name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            importance_level INTEGER NOT NULL,
-            source TEXT NOT NULL
-        )
-    """)
- 
-    cursor.execute("DELETE FROM industry_skills")
-
-    skills_data = create_comprehensive_skills_data()
-    cursor.executemany(
-        "INSERT INTO industry_skills (field, skill_name, category, importance_level, source) VALUES (?, ?, ?, ?, ?)",
-        skills_data
-    )
-    
-    conn.commit()
+    try:
+        if catalog_path:
+            with open(catalog_path, "rb") as stream:
+                records = read_records(stream, fmt or format_from_filename(catalog_path), chunk_size)
+                counts = sync_industry_skills(records, chunk_size, pool, prune)
+        else:
+            records = (dict(zip(INDUSTRY_SKILL_COLUMNS, row)) for row in create_comprehensive_skills_data())
+            counts = sync_industry_skills(records, chunk_size, pool, prune)
+
+        conn = pool.connection()
+        print("Industry skills database updated successfully!")
+        print(f"  {counts['inserted']} added, {counts['updated']} updated, {counts['deleted']} removed, "
+              f"{counts['unchanged']} unchanged (catalog revision {current_revision(conn)})")
+
+        field_stats = conn.execute(
+            "SELECT field, COUNT(*) FROM industry_skills GROUP BY field ORDER BY COUNT(*) DESC"
+        ).fetchall()
+        print("\n Skills by field:")
+        for field, count in field_stats:
+            print(f"  • {field}: {count} skills")
+
+        top_skills = conn.execute("""
+            SELECT skill_name, field, importance_level 
+            FROM industry_skills 
+            WHERE importance_level >= 9 
+            ORDER BY importance_level DESC, field, skill_name
+            LIMIT 20
+        """).fetchall()
+
+        print(f"\nTop {len(top_skills)} most important skills:")
+        for skill, field, importance in top_skills:
+            print(f"  • {skill} ({field}) - Importance: {importance}/10")
+    finally:
+        pool.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the industry skill catalog")
+    parser.add_argument("catalog", nargs="?", help="CSV, NDJSON, JSON or Parquet catalog (default: builtin data)")
+    parser.add_argument("--format", "-f", choices=INPUT_FORMATS, help="default: from the file extension")
+    parser.add_argument("--keep-missing", action="store_true", help="keep skills the catalog does not list")
+    parser.add_argument("--chunk-size", type=int, default=TRANSFER_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        populate_industry_skills(args.catalog, args.format, not args.keep_missing, args.chunk_size)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
 
-    cursor.execute("SELECT field, COUNT(*) FROM industry_skills GROUP BY field ORDER BY COUNT(*) DESC")
-    field_stats = cursor.fetchall()
-    
-    print("Industry skills database populated successfully!")
-    print(f"Total skills added: {len(skills_data)}")
-    print("\n Skills by field:")
-    for field, count in field_stats:
-        print(f"  • {field}: {count} skills")
-
-    cursor.execute("""
-        SELECT skill_name, field, importance_level 
-        FROM industry_skills 
-        WHERE importance_level >= 9 
-        ORDER BY importance_level DESC, field, skill_name
-        LIMIT 20
-    """)
-    top_skills = cursor.fetchall()
-    
-    print(f"\nTop {len(top_skills)} most important skills:")
-    for skill, field, importance in top_skills:
-        print(f"  • {skill} ({field}) - Importance: {importance}/10")
-    
-    conn.close()
 
 if __name__ == "__main__":
-    populate_industry_skills()
+    sys.exit(main())
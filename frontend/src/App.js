@@ -9,6 +9,43 @@ import { GraduationCap, Github, Twitter, Mail } from 'lucide-react';
 axios.defaults.baseURL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 axios.defaults.timeout = 120000;
 
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_TIMEOUT_MS = 10 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// The Error component shadows the built-in, so build errors from window.Error
+const jobError = (message) => {
+  const error = new window.Error(message);
+  error.response = { data: { detail: message } };
+  return error;
+};
+
+// Queue the analysis and poll the job, so long PDFs never hit the request timeout
+const runAnalysisJob = async (formData) => {
+  const { data: job } = await axios.post('/analyze?async=true', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const { data: status } = await axios.get(job.status_url);
+
+    if (status.status === 'succeeded') {
+      return status.result;
+    }
+    if (status.status === 'failed') {
+      throw jobError(status.error || 'Analysis failed');
+    }
+
+    await sleep(JOB_POLL_INTERVAL_MS);
+  }
+
+  throw jobError('The analysis is taking too long. Please try again later.');
+};
+
 function App() {
   const [currentState, setCurrentState] = useState('upload');
   const [analysis, setAnalysis] = useState(null);
@@ -21,13 +58,9 @@ function App() {
     setError(null);
 
     try {
-      const response = await axios.post('/analyze', formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      });
+      const result = await runAnalysisJob(formData);
 
-      setAnalysis(response.data);
+      setAnalysis(result);
       setCurrentState('results');
     } catch (err) {
       console.error('Analysis error:', err);